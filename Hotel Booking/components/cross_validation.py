@@ -0,0 +1,217 @@
+"""Leakage-free k-fold cross-validation over a shared, memory-mapped base matrix."""
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import StratifiedKFold
+from components.preprocessor import BookingPreprocessor
+from components.trainer import lasso_feature_selection, make_classifier
+from logger.log_config import get_logger
+from exception.custom_exception import CustomException
+
+logger = get_logger("cross_validation")
+
+# how each base-matrix column becomes a feature inside a fold
+CATEGORY, CATEGORY_MODE_FILL, LOG, PLAIN = "category", "category_mode_fill", "log", "plain"
+
+
+@dataclass
+class BaseMatrix:
+    """
+    Raw, unfitted features: category codes (-1 for null) for encoded columns,
+    untransformed values for log columns, final values for everything else.
+    Only what a fold must learn from its training rows is left undone.
+    """
+    X: np.ndarray
+    y: np.ndarray
+    columns: List[str]
+    kinds: List[str]
+
+
+@dataclass
+class CVResult:
+    scores: np.ndarray
+    fit_seconds: np.ndarray
+    cpu_seconds: np.ndarray
+    n_selected: List[int]
+    wall_seconds: float
+    workers: int
+    selected: List[List[str]] = field(default_factory=list)
+
+    @property
+    def serial_seconds(self) -> float:
+        """Sum of per-fold CPU times, an estimate of running the same folds one after another.
+
+        CPU rather than wall time, since concurrent folds stretch each other's wall time.
+        """
+        return float(self.cpu_seconds.sum())
+
+    @property
+    def speedup(self) -> float:
+        return self.serial_seconds / self.wall_seconds if self.wall_seconds > 0 else 1.0
+
+
+def build_base_matrix(df: pd.DataFrame, preprocessor: BookingPreprocessor) -> BaseMatrix:
+    """
+    Base matrix for the raw bookings `df`, laid out like `preprocessor.feature_columns`.
+
+    The preprocessor only supplies the column layout (which columns are
+    target-encoded or log-shifted); none of its fitted statistics are used.
+    Zero-guest rows are dropped as in basic_cleaning.
+    """
+    try:
+        numeric = BookingPreprocessor._numeric
+        guests = np.column_stack([numeric(df, c) for c in ('adults', 'children', 'babies')])
+        keep = (guests != 0).any(axis=1)
+        data = df[keep] if not keep.all() else df
+
+        columns = list(preprocessor.feature_columns)
+        X = np.empty((len(data), len(columns)), dtype=np.float64)
+        kinds = []
+        for j, col in enumerate(columns):
+            if col in preprocessor.encodings:
+                series = data[col]
+                if isinstance(series.dtype, pd.CategoricalDtype):
+                    X[:, j] = series.cat.codes.to_numpy()
+                else:
+                    X[:, j] = pd.factorize(series)[0]
+                kinds.append(CATEGORY_MODE_FILL if col == 'country' else CATEGORY)
+            elif col in preprocessor.log_shifts:
+                X[:, j] = numeric(data, col)
+                kinds.append(LOG)
+            else:
+                X[:, j] = preprocessor._column(data, col)
+                kinds.append(PLAIN)
+        y = data[preprocessor.target].to_numpy(dtype=np.float64)
+        return BaseMatrix(X=X, y=y, columns=columns, kinds=kinds)
+    except Exception as e:
+        raise CustomException("Error building cross-validation base matrix", e)
+
+
+def _encode_fold(X: np.ndarray, y: np.ndarray, kinds: List[str], train: np.ndarray,
+                 test: np.ndarray):
+    """Fit encodings and log shifts on the training rows and apply them to both splits."""
+    y_train = y[train]
+    prior = y_train.mean()
+    X_train = np.empty((len(train), X.shape[1]), dtype=np.float64)
+    X_test = np.empty((len(test), X.shape[1]), dtype=np.float64)
+    for j, kind in enumerate(kinds):
+        col_train, col_test = X[train, j], X[test, j]
+        if kind in (CATEGORY, CATEGORY_MODE_FILL):
+            codes_train = col_train.astype(np.int64)
+            n_codes = int(max(codes_train.max(), col_test.max())) + 2
+            # null (-1) is the last slot
+            codes_train = np.where(codes_train < 0, n_codes - 1, codes_train)
+            codes_test = col_test.astype(np.int64)
+            codes_test = np.where(codes_test < 0, n_codes - 1, codes_test)
+            counts = np.bincount(codes_train, minlength=n_codes)
+            sums = np.bincount(codes_train, weights=y_train, minlength=n_codes)
+            means = np.full(n_codes, prior)
+            seen = counts > 0
+            means[seen] = sums[seen] / counts[seen]
+            if kind == CATEGORY_MODE_FILL and counts[:-1].any():
+                means[-1] = means[np.argmax(counts[:-1])]
+            X_train[:, j] = means[codes_train]
+            X_test[:, j] = means[codes_test]
+        elif kind == LOG:
+            floor = col_train.min()
+            shift = abs(floor) + 1 if floor <= -1 else 0.0
+            X_train[:, j] = np.log1p(np.maximum(col_train, floor) + shift)
+            X_test[:, j] = np.log1p(np.maximum(col_test, floor) + shift)
+        else:
+            X_train[:, j] = col_train
+            X_test[:, j] = col_test
+    return X_train, X_test
+
+
+def _fold_indices(y: np.ndarray, n_splits: int, fold: int):
+    # the same folds cross_val_score(cv=n_splits) uses for a classifier
+    splits = StratifiedKFold(n_splits=n_splits).split(np.zeros(len(y)), y)
+    for i, (train, test) in enumerate(splits):
+        if i == fold:
+            return train, test
+    raise IndexError(f"Fold {fold} out of range for {n_splits} splits")
+
+
+def run_fold(X: np.ndarray, y: np.ndarray, columns: List[str], kinds: List[str], n_splits: int,
+             fold: int, alpha: float = 0.005, model_params: Optional[dict] = None) -> dict:
+    """Encode, select features and fit the logistic model on one training split, score its test split."""
+    start, cpu_start = time.perf_counter(), time.process_time()
+    train, test = _fold_indices(y, n_splits, fold)
+    X_train, X_test = _encode_fold(X, y, kinds, train, test)
+    y_train, y_test = y[train], y[test]
+    try:
+        selected = lasso_feature_selection(pd.DataFrame(X_train, columns=columns), y_train, alpha=alpha)
+    except Exception:
+        selected = list(columns)
+    if not selected:
+        selected = list(columns)
+    idx = [columns.index(c) for c in selected]
+    model = make_classifier(**(model_params or {}))
+    model.fit(X_train[:, idx], y_train)
+    score = float((model.predict(X_test[:, idx]) == y_test).mean())
+    return {"fold": fold, "score": score, "seconds": time.perf_counter() - start,
+            "cpu_seconds": time.process_time() - cpu_start, "selected": selected}
+
+
+_worker_base: Optional[tuple] = None
+
+
+def _init_worker(x_path: str, y_path: str, columns: List[str], kinds: List[str]) -> None:
+    global _worker_base
+    _worker_base = (np.load(x_path, mmap_mode='r'), np.load(y_path, mmap_mode='r'), columns, kinds)
+
+
+def _run_worker_fold(n_splits: int, fold: int, alpha: float, model_params: Optional[dict]) -> dict:
+    X, y, columns, kinds = _worker_base
+    return run_fold(X, y, columns, kinds, n_splits, fold, alpha, model_params)
+
+
+def cross_validate(base: BaseMatrix, n_splits: int = 10, workers: int = 1, alpha: float = 0.005,
+                   model_params: Optional[dict] = None) -> CVResult:
+    """
+    Run `n_splits` leakage-free folds, in a process pool when workers > 1.
+
+    The base matrix is written once to .npy files and memory-mapped by every
+    worker, so folds share one copy of the data instead of pickling it per task.
+    """
+    try:
+        start = time.perf_counter()
+        if workers <= 1:
+            results = [run_fold(base.X, base.y, base.columns, base.kinds, n_splits, fold, alpha, model_params)
+                       for fold in range(n_splits)]
+        else:
+            tmp_dir = tempfile.mkdtemp(prefix="cv_base_")
+            try:
+                x_path, y_path = os.path.join(tmp_dir, "X.npy"), os.path.join(tmp_dir, "y.npy")
+                np.save(x_path, base.X)
+                np.save(y_path, base.y)
+                with ProcessPoolExecutor(max_workers=min(workers, n_splits), initializer=_init_worker,
+                                         initargs=(x_path, y_path, base.columns, base.kinds)) as pool:
+                    futures = [pool.submit(_run_worker_fold, n_splits, fold, alpha, model_params)
+                               for fold in range(n_splits)]
+                    results = [f.result() for f in futures]
+            finally:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        wall = time.perf_counter() - start
+
+        result = CVResult(
+            scores=np.array([r["score"] for r in results]),
+            fit_seconds=np.array([r["seconds"] for r in results]),
+            cpu_seconds=np.array([r["cpu_seconds"] for r in results]),
+            n_selected=[len(r["selected"]) for r in results],
+            wall_seconds=wall,
+            workers=workers,
+            selected=[r["selected"] for r in results],
+        )
+        logger.info(f"{n_splits}-fold CV in {wall:.2f}s with {workers} worker(s): "
+                    f"mean accuracy {result.scores.mean():.4f}, speedup {result.speedup:.2f}x over serial")
+        return result
+    except Exception as e:
+        raise CustomException("Error during cross-validation", e)
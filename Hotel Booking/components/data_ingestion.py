@@ -1,29 +1,132 @@
 import os
+import time
+import numpy as np
 import pandas as pd
-from typing import Optional
+from typing import Iterator, Optional
 from entity.config_entity import DataIngestionConfig
+from constants import schema
+from utils.data_cache import DatasetCache
+from utils.instrumentation import instrument
 from logger.log_config import get_logger
 from exception.custom_exception import CustomException
 
 logger = get_logger("data_ingestion")
 
 
+def _csv_engine() -> Optional[str]:
+    """Use the pyarrow CSV engine when it is installed."""
+    try:
+        import pyarrow  # noqa: F401
+        return "pyarrow"
+    except ImportError:
+        return None
+
+
+def _narrow_numeric(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast numeric columns to the schema dtypes, keeping any column whose values don't fit."""
+    for col, dtype in schema.NUMERIC_DTYPES.items():
+        if col not in df.columns or not pd.api.types.is_numeric_dtype(df[col]):
+            continue
+        target = np.dtype(dtype)
+        values = df[col]
+        if target.kind == 'i':
+            if values.isna().any():
+                logger.warning(f"Column {col} has nulls, keeping {values.dtype}")
+                continue
+            info = np.iinfo(target)
+            if len(values) and (values.min() < info.min or values.max() > info.max):
+                logger.warning(f"Column {col} does not fit {target}, keeping {values.dtype}")
+                continue
+        df[col] = values.astype(target)
+    return df
+
+
 class DataIngestion:
     def __init__(self, config: DataIngestionConfig):
         self.config = config
 
+    def read_typed(self, path: str) -> pd.DataFrame:
+        """Read the bookings CSV with the declared schema (categories, dates, narrow numerics)."""
+        header = pd.read_csv(path, nrows=0).columns
+        kwargs = {
+            "dtype": {c: t for c, t in schema.READ_DTYPES.items() if c in header},
+            "parse_dates": [c for c in schema.DATE_COLUMNS if c in header],
+        }
+        engine = _csv_engine()
+        if engine:
+            kwargs["engine"] = engine
+        logger.info(f"Reading with schema (engine={engine or 'c'})")
+        df = pd.read_csv(path, **kwargs)
+        return _narrow_numeric(df)
+
+    def iter_chunks(self, chunk_rows: int) -> Iterator[pd.DataFrame]:
+        """
+        Stream the bookings CSV in frames of at most `chunk_rows` rows, typed
+        like `read_typed` when the schema is enabled. Each chunk carries its own
+        category levels. Memory is bounded by the chunk size, whatever the file size.
+        """
+        path = self.config.data_path
+        if not os.path.exists(path):
+            raise CustomException("Failed during data ingestion", FileNotFoundError(f"Data file not found at {path}"))
+        kwargs = {"chunksize": chunk_rows}
+        if self.config.use_schema:
+            header = pd.read_csv(path, nrows=0).columns
+            kwargs["dtype"] = {c: t for c, t in schema.READ_DTYPES.items() if c in header}
+            kwargs["parse_dates"] = [c for c in schema.DATE_COLUMNS if c in header]
+        logger.info(f"Streaming {path} in chunks of {chunk_rows:,} rows")
+        try:
+            with pd.read_csv(path, **kwargs) as reader:
+                for chunk in reader:
+                    yield _narrow_numeric(chunk) if self.config.use_schema else chunk
+        except Exception as e:
+            raise CustomException(f"Failed while streaming {path}", e)
+
+    def _cache_variant(self) -> str:
+        return f"schema{schema.SCHEMA_VERSION}" if self.config.use_schema else "raw"
+
+    def _parse(self, path: str) -> pd.DataFrame:
+        if self.config.use_schema:
+            return self.read_typed(path)
+        return pd.read_csv(path)
+
+    def _load_cached(self, path: str) -> pd.DataFrame:
+        """Load from the dataset cache, parsing the CSV and filling the cache on a miss."""
+        cache = DatasetCache(self.config.cache_dir)
+        variant = self._cache_variant()
+        try:
+            df = cache.load(path, variant)
+        except Exception as e:
+            logger.warning(f"Could not read dataset cache, parsing CSV instead: {e}")
+            df = None
+        if df is not None:
+            return df
+
+        start = time.perf_counter()
+        df = self._parse(path)
+        parse_seconds = time.perf_counter() - start
+        try:
+            cache.save(path, df, variant, parse_seconds)
+        except Exception as e:
+            logger.warning(f"Could not write dataset cache: {e}")
+        return df
+
+    @instrument()
     def load_data(self) -> pd.DataFrame:
         try:
             path = self.config.data_path
             logger.info(f"Loading data from: {path}")
             if not os.path.exists(path):
                 raise FileNotFoundError(f"Data file not found at {path}")
-            df = pd.read_csv(path)
+            if self.config.cache_dir:
+                df = self._load_cached(path)
+            else:
+                df = self._parse(path)
             logger.info(f"Loaded dataframe with shape {df.shape}")
             
             # Print loaded data information
-            from components.output_reports import print_dataframe_info
-            print_dataframe_info(df.copy(), stage="Raw Data Loaded")
+            from components.output_reports import print_dataframe_info, print_memory_footprint
+            print_dataframe_info(df, stage="Raw Data Loaded")
+            print_memory_footprint(df)
             
             return df
         except Exception as e:
@@ -0,0 +1,108 @@
+"""Single-pass DataFrame profiling shared by reports and plots."""
+import weakref
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+REPORT_LEVELS = ("off", "summary", "full")
+DESCRIBE_INDEX = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+
+_report_level = "full"
+_cache = {}
+
+
+def set_report_level(level: str) -> None:
+    """off: no data reports; summary: shape and null counts; full: everything (default)."""
+    global _report_level
+    if level not in REPORT_LEVELS:
+        raise ValueError(f"Unknown report level {level!r}, expected one of {REPORT_LEVELS}")
+    _report_level = level
+
+
+def get_report_level() -> str:
+    return _report_level
+
+
+@dataclass
+class DataProfile:
+    shape: tuple
+    dtypes: pd.Series
+    null_counts: pd.Series
+    head: pd.DataFrame
+    describe: Optional[pd.DataFrame] = None
+
+    @property
+    def total_nulls(self) -> int:
+        return int(self.null_counts.sum())
+
+    def summary(self) -> dict:
+        """Same keys as output_reports.frame_summary."""
+        return {"rows": self.shape[0], "columns": self.shape[1], "nulls": self.total_nulls}
+
+
+def _is_described(series: pd.Series) -> bool:
+    # DataFrame.describe() covers numeric, non-boolean columns
+    return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+
+
+def profile_frame(df: pd.DataFrame, full: bool = True) -> DataProfile:
+    """
+    Compute null counts and, when `full`, describe()-equivalent statistics
+    with one visit per column.
+    """
+    nulls = {}
+    stats = {}
+    for col in df.columns:
+        series = df[col]
+        if _is_described(series):
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            missing = np.isnan(values)
+            nulls[col] = int(missing.sum())
+            if full:
+                valid = values[~missing] if nulls[col] else values
+                if len(valid):
+                    q = np.percentile(valid, [0, 25, 50, 75, 100])
+                    std = valid.std(ddof=1) if len(valid) > 1 else np.nan
+                    stats[col] = [len(valid), valid.mean(), std, q[0], q[1], q[2], q[3], q[4]]
+                else:
+                    stats[col] = [0] + [np.nan] * 7
+        elif isinstance(series.dtype, pd.CategoricalDtype):
+            nulls[col] = int((series.cat.codes.to_numpy() < 0).sum())
+        else:
+            nulls[col] = int(series.isna().sum())
+
+    describe = pd.DataFrame(stats, index=DESCRIBE_INDEX) if full and stats else None
+    return DataProfile(
+        shape=df.shape,
+        dtypes=df.dtypes,
+        null_counts=pd.Series(nulls, index=df.columns, dtype='int64'),
+        head=df.head(),
+        describe=describe,
+    )
+
+
+def _signature(df: pd.DataFrame) -> tuple:
+    return df.shape, tuple(df.columns), tuple(str(t) for t in df.dtypes)
+
+
+def get_profile(df: pd.DataFrame, full: bool = True) -> DataProfile:
+    """
+    Profile `df`, reusing an earlier profile of the same frame object.
+
+    Cached profiles are dropped when the frame is garbage collected or its
+    shape/columns/dtypes change; call `invalidate(df)` after mutating values in place.
+    """
+    key = id(df)
+    entry = _cache.get(key)
+    if entry is not None:
+        ref, signature, profile = entry
+        if ref() is df and signature == _signature(df) and (profile.describe is not None or not full):
+            return profile
+    profile = profile_frame(df, full=full)
+    _cache[key] = (weakref.ref(df, lambda _, k=key: _cache.pop(k, None)), _signature(df), profile)
+    return profile
+
+
+def invalidate(df: pd.DataFrame) -> None:
+    _cache.pop(id(df), None)
@@ -0,0 +1,273 @@
+"""
+Successive-halving search over feature selection and logistic-model hyperparameters.
+
+A candidate combines a Lasso alpha (feature selection), C, penalty and class
+weights. All candidates are scored on the same fixed stratified folds that
+cross-validation uses. Each fold's encodings and log shifts are fitted once
+(see cross_validation._encode_fold) and written into one .npy array of
+shape (folds, rows, features). Pool workers memory-map it read-only, so no
+candidate re-encodes, copies or unpickles the data.
+
+Successive halving: every candidate is first trained on a small subsample of
+each fold's training rows. After each rung only the best 1/eta go on, with
+eta times as many rows. The last rung trains on the full training splits.
+
+A worker task is one fold of one rung. Within a task, fits are warm-started
+along the regularization paths: Lasso goes through the alphas from largest
+to smallest, and the logistic model through C from smallest to largest.
+liblinear, which the l1 penalty needs, ignores warm starts and refits.
+"""
+import itertools
+import math
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from components.cross_validation import BaseMatrix, _encode_fold, _fold_indices
+from components.trainer import make_classifier
+from utils.instrumentation import instrument
+from logger.log_config import get_logger
+from exception.custom_exception import CustomException
+
+logger = get_logger("hyperparameter_search")
+
+# SelectFromModel's default threshold for L1 models: |coef| >= 1e-5
+LASSO_THRESHOLD = 1e-5
+
+
+def _simplicity(params: dict) -> tuple:
+    """
+    Sort key ranking equally scored candidates: stronger regularization
+    (smaller C), l2, fewer features (larger Lasso alpha), unweighted classes.
+    """
+    return (params["C"], params["penalty"] != "l2", -params["lasso_alpha"], params["class_weight"] is not None)
+
+
+@dataclass
+class SearchSpace:
+    """Grid of candidate hyperparameters; keys match the TrainingConfig fields they set."""
+    lasso_alphas: Sequence[float] = (0.001, 0.0025, 0.005, 0.01, 0.02)
+    Cs: Sequence[float] = (0.01, 0.1, 1.0, 10.0)
+    penalties: Sequence[str] = ("l2", "l1")
+    class_weights: Sequence[Optional[str]] = (None, "balanced")
+
+    def candidates(self) -> List[dict]:
+        return [{"lasso_alpha": float(alpha), "C": float(C), "penalty": penalty, "class_weight": weight}
+                for alpha, penalty, weight, C in itertools.product(self.lasso_alphas, self.penalties,
+                                                                   self.class_weights, self.Cs)]
+
+
+@dataclass
+class SearchResult:
+    leaderboard: List[dict]
+    rungs: List[dict]
+    n_splits: int
+    workers: int
+    wall_seconds: float
+    columns: List[str] = field(default_factory=list)
+
+    @property
+    def best(self) -> dict:
+        """Hyperparameters of the top candidate."""
+        top = self.leaderboard[0]
+        return {k: top[k] for k in ("lasso_alpha", "C", "penalty", "class_weight")}
+
+    def summary(self, top: int = 10) -> dict:
+        """Compact form of the search stored in the registry metadata of the chosen model."""
+        return {"candidates": len(self.leaderboard), "n_splits": self.n_splits, "workers": self.workers,
+                "wall_seconds": round(self.wall_seconds, 3), "rungs": self.rungs,
+                "leaderboard": [{k: v for k, v in row.items() if k != "scores"} for row in self.leaderboard[:top]]}
+
+
+def encode_folds(base: BaseMatrix, n_splits: int, path: str) -> np.ndarray:
+    """
+    Write the fold-encoded matrices to `path` and return the fold id of every row.
+
+    Row i of fold f holds row i of the base matrix, encoded with the
+    statistics of fold f's training rows. Rows with fold id f are f's test split.
+    """
+    n_rows, n_cols = base.X.shape
+    encoded = np.lib.format.open_memmap(path, mode='w+', dtype=np.float64, shape=(n_splits, n_rows, n_cols))
+    fold_ids = np.empty(n_rows, dtype=np.int16)
+    for fold in range(n_splits):
+        train, test = _fold_indices(base.y, n_splits, fold)
+        X_train, X_test = _encode_fold(base.X, base.y, base.kinds, train, test)
+        encoded[fold, train] = X_train
+        encoded[fold, test] = X_test
+        fold_ids[test] = fold
+    encoded.flush()
+    del encoded
+    return fold_ids
+
+
+def _lasso_selections(X: np.ndarray, y: np.ndarray, alphas: Sequence[float]) -> Tuple[Dict[float, np.ndarray], float]:
+    """Columns `lasso_feature_selection` keeps for each alpha, warm-started from the largest alpha down."""
+    from sklearn.linear_model import Lasso
+
+    start = time.perf_counter()
+    lasso = Lasso(warm_start=True)
+    selections = {}
+    everything = np.arange(X.shape[1])
+    for alpha in sorted(set(alphas), reverse=True):
+        try:
+            lasso.set_params(alpha=alpha)
+            lasso.fit(X, y)
+            idx = np.flatnonzero(np.abs(lasso.coef_) >= LASSO_THRESHOLD)
+        except Exception:
+            # as in Trainer.select_features: keep everything if Lasso fails
+            idx = everything
+        selections[alpha] = idx if len(idx) else everything
+    return selections, time.perf_counter() - start
+
+
+def run_task(X_folds: np.ndarray, y: np.ndarray, fold_ids: np.ndarray, fold: int, n_rows: int,
+             candidates: List[Tuple[int, dict]], random_state: int = 42) -> dict:
+    """
+    Score `candidates` on one fold, training on (up to) `n_rows` of its training rows.
+
+    The subsample is a fixed random order of the fold's training rows cut at
+    `n_rows`, so each rung's rows contain the previous rung's.
+    """
+    start, cpu_start = time.perf_counter(), time.process_time()
+    train = np.flatnonzero(fold_ids != fold)
+    test = np.flatnonzero(fold_ids == fold)
+    if n_rows < len(train):
+        train = np.sort(np.random.default_rng([random_state, fold]).permutation(train)[:n_rows])
+    X = X_folds[fold]
+    X_train, y_train = np.asarray(X[train]), y[train]
+    X_test, y_test = np.asarray(X[test]), y[test]
+
+    selections, lasso_seconds = _lasso_selections(X_train, y_train, [c["lasso_alpha"] for _, c in candidates])
+    results = []
+    group_key = lambda item: (item[1]["lasso_alpha"], item[1]["penalty"], str(item[1]["class_weight"]))
+    for _, group in itertools.groupby(sorted(candidates, key=group_key), key=group_key):
+        group = sorted(group, key=lambda item: item[1]["C"])
+        idx = selections[group[0][1]["lasso_alpha"]]
+        model = None
+        for cid, params in group:
+            if model is None:
+                model = make_classifier(C=params["C"], penalty=params["penalty"],
+                                        class_weight=params["class_weight"], warm_start=True)
+            else:
+                model.set_params(C=params["C"])
+            fit_start = time.perf_counter()
+            model.fit(X_train[:, idx], y_train)
+            fit_seconds = time.perf_counter() - fit_start
+            score = float((model.predict(X_test[:, idx]) == y_test).mean())
+            results.append({"id": cid, "score": score, "fit_seconds": fit_seconds, "n_selected": len(idx)})
+    return {"fold": fold, "rows": len(train), "results": results, "lasso_seconds": lasso_seconds,
+            "seconds": time.perf_counter() - start, "cpu_seconds": time.process_time() - cpu_start}
+
+
+_worker_data: Optional[tuple] = None
+
+
+def _init_worker(x_path: str, y_path: str, folds_path: str) -> None:
+    global _worker_data
+    _worker_data = (np.load(x_path, mmap_mode='r'), np.load(y_path, mmap_mode='r'), np.load(folds_path))
+
+
+def _run_worker_task(fold: int, n_rows: int, candidates: List[Tuple[int, dict]], random_state: int) -> dict:
+    X_folds, y, fold_ids = _worker_data
+    return run_task(X_folds, y, fold_ids, fold, n_rows, candidates, random_state)
+
+
+def rung_rows(n_train: int, n_candidates: int, eta: int, min_rows: int) -> List[int]:
+    """Training rows per rung: the last rung uses all `n_train`, each earlier one 1/eta of the next."""
+    n_rungs = 1 + int(math.floor(math.log(max(n_candidates, 1)) / math.log(eta) + 1e-9))
+    while n_rungs > 1 and n_train / eta ** (n_rungs - 1) < min_rows:
+        n_rungs -= 1
+    return [n_train if r == n_rungs - 1 else int(n_train / eta ** (n_rungs - 1 - r)) for r in range(n_rungs)]
+
+
+@instrument("hyperparameter_search")
+def successive_halving(base: BaseMatrix, space: SearchSpace = None, n_splits: int = 5, workers: int = 1,
+                       eta: int = 3, min_rows: int = 2000, random_state: int = 42) -> SearchResult:
+    """
+    Search `space` by successive halving over the fixed `n_splits` folds of `base`.
+
+    Each rung runs one task per fold, in a process pool when workers > 1,
+    and keeps the best ceil(alive / eta) candidates by mean fold accuracy.
+    The leaderboard lists every candidate, sorted by the last rung it
+    reached and then by its score there. Equal scores are ranked by
+    `_simplicity` and then by position in the search space, so the result
+    does not depend on timings or on the number of workers.
+    """
+    try:
+        space = space or SearchSpace()
+        candidates = space.candidates()
+        if eta < 2:
+            raise ValueError("eta must be at least 2")
+        start = time.perf_counter()
+        tmp_dir = tempfile.mkdtemp(prefix="search_")
+        pool = None
+        try:
+            x_path, y_path = os.path.join(tmp_dir, "X_folds.npy"), os.path.join(tmp_dir, "y.npy")
+            folds_path = os.path.join(tmp_dir, "folds.npy")
+            fold_ids = encode_folds(base, n_splits, x_path)
+            np.save(y_path, base.y)
+            np.save(folds_path, fold_ids)
+            n_train = int(len(base.y) - np.bincount(fold_ids).max())
+            rows_per_rung = rung_rows(n_train, len(candidates), eta, min_rows)
+            logger.info(f"Searching {len(candidates)} candidates on {n_splits} folds: "
+                        f"{len(rows_per_rung)} rung(s) of {rows_per_rung} training rows, {workers} worker(s)")
+
+            if workers > 1:
+                pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                           initargs=(x_path, y_path, folds_path))
+                run = lambda tasks: [f.result() for f in [pool.submit(_run_worker_task, *t) for t in tasks]]
+            else:
+                local = (np.load(x_path, mmap_mode='r'), base.y, fold_ids)
+                run = lambda tasks: [run_task(*local, *t) for t in tasks]
+
+            board: Dict[int, dict] = {}
+            rungs = []
+            alive = list(range(len(candidates)))
+            for rung, n_rows in enumerate(rows_per_rung):
+                rung_start = time.perf_counter()
+                tasks = [(fold, n_rows, [(i, candidates[i]) for i in alive], random_state)
+                         for fold in range(n_splits)]
+                outputs = run(tasks)
+                per_candidate: Dict[int, List[dict]] = {i: [] for i in alive}
+                for output in outputs:
+                    for r in output["results"]:
+                        per_candidate[r["id"]].append(r)
+                for i, results in per_candidate.items():
+                    scores = [r["score"] for r in results]
+                    board[i] = dict(candidates[i], rung=rung, rows=n_rows, score=float(np.mean(scores)),
+                                    score_std=float(np.std(scores)),
+                                    fit_seconds=float(sum(r["fit_seconds"] for r in results)),
+                                    n_selected=float(np.mean([r["n_selected"] for r in results])),
+                                    scores=scores)
+                rungs.append({"rung": rung, "rows": n_rows, "candidates": len(alive),
+                              "wall_seconds": round(time.perf_counter() - rung_start, 3),
+                              "cpu_seconds": round(sum(o["cpu_seconds"] for o in outputs), 3),
+                              "lasso_seconds": round(sum(o["lasso_seconds"] for o in outputs), 3)})
+                logger.info(f"Rung {rung}: {len(alive)} candidates on {n_rows:,} rows in "
+                            f"{rungs[-1]['wall_seconds']:.2f}s, best {max(board[i]['score'] for i in alive):.4f}")
+                if rung < len(rows_per_rung) - 1:
+                    keep = max(1, math.ceil(len(alive) / eta))
+                    # ties (frequent with accuracy on a finite fold) go to the simpler candidate, then the
+                    # earlier one, never to timings, so serial and pooled runs keep the same candidates
+                    alive = sorted(alive, key=lambda i: (-board[i]["score"], _simplicity(candidates[i]), i))[:keep]
+        finally:
+            if pool is not None:
+                pool.shutdown()
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        leaderboard = [board[i] for i in sorted(board, key=lambda i: (-board[i]["rung"], -board[i]["score"],
+                                                                      _simplicity(candidates[i]), i))]
+        for rank, row in enumerate(leaderboard, 1):
+            row["rank"] = rank
+        result = SearchResult(leaderboard=leaderboard, rungs=rungs, n_splits=n_splits, workers=workers,
+                              wall_seconds=time.perf_counter() - start, columns=list(base.columns))
+        logger.info(f"Search finished in {result.wall_seconds:.2f}s: best {result.best} "
+                    f"with mean accuracy {leaderboard[0]['score']:.4f}")
+        return result
+    except Exception as e:
+        raise CustomException("Error during hyperparameter search", e)
@@ -0,0 +1,278 @@
+"""
+Incremental (daily) model updates from new bookings only.
+
+The update keeps two running summaries of the history next to the model:
+- the per-category target sums and counts behind the mean encodings
+  (`StreamingStats`, the same statistics the out-of-core pass uses);
+- the Hessian of the logistic loss over the history at the current
+  coefficients, per class, so that class weights (including "balanced",
+  which moves with the class counts) can be applied at each update.
+
+The model's own hyperparameters are honoured: the L2 penalty is 1/C, and
+rows are weighted by the model's class_weight, as LogisticRegression does.
+L1 models have no smooth penalty to take Newton steps on and are refused.
+
+A daily update adds the new rows to the encoding statistics, then
+warm-starts from the stored coefficients. It takes Newton steps on the new
+rows' loss plus the quadratic approximation of the history's loss given by
+the stored Hessian. This is a second-order approximation of refitting on
+history + delta, and its cost is proportional to the delta. `drift_report`
+measures how far it has drifted from a real full refit.
+"""
+import copy
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from components.out_of_core import StreamingStats, has_guests
+from components.preprocessor import BookingPreprocessor
+from components.trainer import fitted_params
+from utils.data_cache import content_hash
+from utils.helpers import load_model, save_model
+from utils.instrumentation import instrument
+from logger.log_config import get_logger
+from exception.custom_exception import CustomException
+
+logger = get_logger("incremental")
+
+STATE_FILE = "incremental_state.joblib"
+
+
+@dataclass
+class IncrementalState:
+    """Running history summaries for one model, plus a log of the updates applied to it."""
+    stats: StreamingStats
+    # unweighted loss Hessian of the history's negative (0) and positive (1) rows
+    class_hessians: np.ndarray
+    C: float = 1.0
+    model_fingerprint: str = ""
+    updates: List[dict] = field(default_factory=list)
+
+    def hessian(self, class_weights: np.ndarray) -> np.ndarray:
+        """Hessian of the history's regularized, class-weighted loss."""
+        return (_penalty(self.class_hessians.shape[-1], self.C)
+                + np.tensordot(class_weights, self.class_hessians, axes=1))
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -35.0, 35.0)))
+
+
+def _design(preprocessor: BookingPreprocessor, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """Feature matrix with an intercept column, and the target, for the bookings the pipeline trains on."""
+    df = df[has_guests(df)]
+    X = preprocessor.transform_array(df)
+    return np.hstack([X, np.ones((len(X), 1))]), df[preprocessor.target].to_numpy(dtype=np.float64)
+
+
+def _weights(model) -> np.ndarray:
+    return np.append(np.ravel(model.coef_), model.intercept_[0])
+
+
+def _loss_hessian(Xb: np.ndarray, w: np.ndarray) -> np.ndarray:
+    p = _sigmoid(Xb @ w)
+    return (Xb * (p * (1.0 - p))[:, None]).T @ Xb
+
+
+def _class_hessians(Xb: np.ndarray, y: np.ndarray, w: np.ndarray) -> np.ndarray:
+    return np.stack([_loss_hessian(Xb[y == label], w) for label in (0.0, 1.0)])
+
+
+def _check_supported(model) -> dict:
+    """The model's hyperparameters; raises for models the Newton update cannot reproduce."""
+    params = fitted_params(model)
+    if params["penalty"] != "l2":
+        raise ValueError(f"Incremental updates need an l2-penalized model, this one is {params['penalty']}; "
+                         f"retrain it instead")
+    return params
+
+
+def class_weights(class_weight, stats: StreamingStats) -> np.ndarray:
+    """
+    Row weight of the negative and positive class, as LogisticRegression
+    derives them from `class_weight`; "balanced" uses the history's class
+    counts in `stats`.
+    """
+    if class_weight is None:
+        return np.ones(2)
+    if class_weight == "balanced":
+        positives = stats.target_sum
+        negatives = stats.rows_kept - positives
+        if positives <= 0 or negatives <= 0:
+            return np.ones(2)
+        return stats.rows_kept / (2.0 * np.array([negatives, positives]))
+    return np.array([float(class_weight.get(label, 1.0)) for label in (0, 1)])
+
+
+def _penalty(n_weights: int, C: float) -> np.ndarray:
+    """Hessian of LogisticRegression's L2 penalty (the intercept is not penalized)."""
+    reg = np.eye(n_weights) / C
+    reg[-1, -1] = 0.0
+    return reg
+
+
+def build_state(chunks: Iterable[pd.DataFrame], preprocessor: BookingPreprocessor, model,
+                model_path: str = "") -> IncrementalState:
+    """
+    Summarize the history the model was trained on, in one streaming pass.
+
+    The encoding statistics of the history reproduce `preprocessor`'s
+    encodings exactly, so they can be updated in place of refitting it.
+    """
+    try:
+        params = _check_supported(model)
+        w = _weights(model)
+        stats = StreamingStats(preprocessor.target)
+        class_hessians = np.zeros((2, len(w), len(w)))
+        for chunk in chunks:
+            stats.update(chunk)
+            Xb, y = _design(preprocessor, chunk)
+            class_hessians += _class_hessians(Xb, y, w)
+        fingerprint = content_hash(model_path) if model_path else ""
+        logger.info(f"Built incremental state over {stats.rows:,} history rows")
+        return IncrementalState(stats=stats, class_hessians=class_hessians, C=params["C"],
+                                model_fingerprint=fingerprint)
+    except Exception as e:
+        raise CustomException("Error building incremental state", e)
+
+
+def warm_start_newton(Xb: np.ndarray, y: np.ndarray, w0: np.ndarray, prior: np.ndarray,
+                      sample_weight: Optional[np.ndarray] = None, max_iter: int = 25,
+                      tol: float = 1e-8) -> Tuple[np.ndarray, int]:
+    """
+    Minimize  logloss(Xb, y; w) + 0.5 (w - w0)' prior (w - w0)  by Newton's method, starting at `w0`.
+
+    `sample_weight` weights each row's loss. Returns the weights and the
+    number of Newton steps taken.
+    """
+    w = w0.copy()
+    s = np.ones(len(y)) if sample_weight is None else sample_weight
+    for iteration in range(1, max_iter + 1):
+        p = _sigmoid(Xb @ w)
+        gradient = Xb.T @ (s * (p - y)) + prior @ (w - w0)
+        hessian = (Xb * (s * p * (1.0 - p))[:, None]).T @ Xb + prior
+        step = np.linalg.solve(hessian, gradient)
+        w -= step
+        if np.max(np.abs(step)) < tol:
+            return w, iteration
+    return w, max_iter
+
+
+def load_state(model_dir: str, model_name: str) -> Optional[IncrementalState]:
+    """The stored state, or None if there is none or it belongs to a different model file."""
+    path = os.path.join(model_dir, STATE_FILE)
+    if not os.path.exists(path):
+        return None
+    state = load_model(path)
+    if not hasattr(state, "class_hessians"):
+        logger.warning("Incremental state predates per-class Hessians; it will be rebuilt from the history")
+        return None
+    if state.model_fingerprint != content_hash(os.path.join(model_dir, model_name)):
+        logger.warning("Incremental state was built for a different model (retrained since?); ignoring it")
+        return None
+    return state
+
+
+@instrument("incremental_update")
+def incremental_update(delta: pd.DataFrame, model_dir: str, model_name: str = "logistic_model.joblib",
+                       preprocessor_name: str = "preprocessor.joblib",
+                       history: Optional[Iterable[pd.DataFrame]] = None) -> dict:
+    """
+    Fold the new bookings in `delta` into the model saved in `model_dir`.
+
+    The encodings are updated from the running statistics, and the model is
+    warm-started from its stored coefficients. The new model, preprocessor
+    and state replace the old ones. If no state exists yet for this model,
+    `history` (chunks of the data it was trained on) must be given so the
+    state can be bootstrapped once.
+    """
+    try:
+        model_path = os.path.join(model_dir, model_name)
+        preprocessor_path = os.path.join(model_dir, preprocessor_name)
+        model = load_model(model_path)
+        preprocessor = load_model(preprocessor_path)
+        params = _check_supported(model)
+        state = load_state(model_dir, model_name)
+        if state is None:
+            if history is None:
+                raise ValueError("No incremental state for this model; pass the training history to bootstrap it")
+            state = build_state(history, preprocessor, model, model_path)
+
+        start = time.perf_counter()
+        state.stats.update(delta)
+        updated = state.stats.to_preprocessor()
+        updated.selected_features = preprocessor.selected_features
+
+        Xb, y = _design(updated, delta)
+        w0 = _weights(model)
+        # class weights from the counts including the delta, as a refit on history + delta would use
+        weights = class_weights(params["class_weight"], state.stats)
+        w, iterations = warm_start_newton(Xb, y, w0, state.hessian(weights),
+                                          sample_weight=weights[y.astype(np.int64)])
+        state.class_hessians = state.class_hessians + _class_hessians(Xb, y, w)
+
+        model = copy.deepcopy(model)
+        model.coef_ = w[:-1].reshape(1, -1)
+        model.intercept_ = np.array([w[-1]])
+        seconds = time.perf_counter() - start
+
+        save_model(model, model_path)
+        save_model(updated, preprocessor_path)
+        state.model_fingerprint = content_hash(model_path)
+        summary = {"rows": int(len(delta)), "rows_used": int(len(y)), "newton_steps": iterations,
+                   "seconds": round(seconds, 4), "coef_change": float(np.linalg.norm(w - w0)),
+                   "history_rows": state.stats.rows, "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        state.updates.append(summary)
+        save_model(state, os.path.join(model_dir, STATE_FILE))
+        logger.info(f"Incremental update with {len(delta):,} rows in {seconds:.3f}s "
+                    f"({iterations} Newton steps, |Δw|={summary['coef_change']:.4f})")
+        return summary
+    except Exception as e:
+        raise CustomException("Error during incremental update", e)
+
+
+@instrument("drift_report")
+def drift_report(history: pd.DataFrame, model_dir: str, model_name: str = "logistic_model.joblib",
+                 preprocessor_name: str = "preprocessor.joblib") -> dict:
+    """
+    Compare the incrementally updated model with a full refit on `history`
+    (every row so far, deltas included), with the model's own
+    hyperparameters: encodings, coefficients and predictions on the history.
+    """
+    from components.trainer import make_classifier
+
+    try:
+        model = load_model(os.path.join(model_dir, model_name))
+        preprocessor = load_model(os.path.join(model_dir, preprocessor_name))
+
+        refit_pre = BookingPreprocessor(preprocessor.target).fit(history)
+        refit_pre.selected_features = preprocessor.selected_features
+        X_full, y = _design(refit_pre, history)
+        refit = make_classifier(**fitted_params(model)).fit(X_full[:, :-1], y.astype(np.int64))
+
+        encoding_diff = max((abs(v - refit_pre.encodings[col].get(k, np.nan))
+                             for col, enc in preprocessor.encodings.items() for k, v in enc.items()
+                             if col in refit_pre.encodings), default=0.0)
+        X_inc, _ = _design(preprocessor, history)
+        p_inc = _sigmoid(X_inc @ _weights(model))
+        p_full = _sigmoid(X_full @ _weights(refit))
+        w_inc, w_full = _weights(model), _weights(refit)
+        report = {
+            "rows": int(len(y)),
+            "max_encoding_diff": float(encoding_diff),
+            "coef_max_abs_diff": float(np.max(np.abs(w_inc - w_full))),
+            "coef_relative_diff": float(np.linalg.norm(w_inc - w_full) / max(np.linalg.norm(w_full), 1e-12)),
+            "proba_mean_abs_diff": float(np.mean(np.abs(p_inc - p_full))),
+            "proba_max_abs_diff": float(np.max(np.abs(p_inc - p_full))),
+            "decision_agreement": float(np.mean((p_inc >= 0.5) == (p_full >= 0.5))),
+            "accuracy_incremental": float(np.mean((p_inc >= 0.5) == y)),
+            "accuracy_full_refit": float(np.mean((p_full >= 0.5) == y)),
+        }
+        logger.info(f"Drift vs full refit: decision agreement {report['decision_agreement']:.4f}, "
+                    f"mean |Δp| {report['proba_mean_abs_diff']:.5f}")
+        return report
+    except Exception as e:
+        raise CustomException("Error computing drift against a full refit", e)
@@ -0,0 +1,516 @@
+"""
+Streaming data monitoring: mergeable sketches of booking batches and drift scores.
+
+A `DataSketch` summarises a frame, or a stream of chunks, in memory that does
+not grow with the number of rows:
+    numeric columns      QuantileSketch: log-spaced buckets with 1% relative
+                         error on every quantile (DDSketch-style)
+    categorical columns  CountMinSketch: approximate count of any category
+                         HeavyHitters:   the most frequent categories (Misra-Gries)
+                         HyperLogLog:    approximate number of distinct categories
+All of them merge by addition (or max), so the sketch of a whole history is the
+merge of its batches' sketches and never needs the rows again.
+
+`drift_scores` compares a batch's sketch with the reference sketch stored
+with the model (see ModelRegistry.register): PSI over the reference deciles
+and the Kolmogorov-Smirnov distance for numeric columns, PSI over the
+reference's frequent categories (plus "other") for categorical ones.
+"""
+import base64
+import hashlib
+import json
+import math
+from typing import Dict, Iterable, Iterator, List, Optional
+import numpy as np
+import pandas as pd
+from components.preprocessing import is_categorical_column
+from components.sparse_encoding import ID_COLUMNS, factorize_categories
+from logger.log_config import get_logger
+from exception.custom_exception import CustomException
+
+logger = get_logger("monitoring")
+
+# 2: count-min rows hashed with blake2b (version 1 used seeded crc32, whose rows collide together)
+SKETCH_VERSION = 2
+PSI_BINS = 10
+# usual PSI reading: < 0.1 stable, 0.1-0.25 moderate shift, > 0.25 significant shift
+PSI_WARN = 0.1
+PSI_ALERT = 0.25
+# floor for bin fractions in PSI, so empty bins give a large but finite score
+PSI_EPSILON = 1e-4
+
+
+def _encode_array(array: np.ndarray) -> dict:
+    return {"dtype": str(array.dtype), "shape": list(array.shape),
+            "data": base64.b64encode(np.ascontiguousarray(array).tobytes()).decode("ascii")}
+
+
+def _decode_array(state: dict) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(state["data"]), dtype=state["dtype"]).reshape(state["shape"]).copy()
+
+
+class QuantileSketch:
+    """
+    Quantiles and CDF of a numeric stream with bounded relative error.
+
+    A value x > 0 is counted in bucket ceil(log_gamma(x)), negatives in a
+    mirrored store, zeros separately; gamma = (1 + a) / (1 - a) for relative
+    accuracy a. Above `max_bins` buckets, the buckets of the smallest
+    magnitudes are folded together (only low quantiles lose accuracy).
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048):
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.null_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _add_to(self, store: Dict[int, int], magnitudes: np.ndarray) -> None:
+        if len(magnitudes):
+            keys, counts = np.unique(np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64),
+                                     return_counts=True)
+            for key, n in zip(keys.tolist(), counts.tolist()):
+                store[key] = store.get(key, 0) + n
+
+    def update(self, values) -> "QuantileSketch":
+        values = np.asarray(values, dtype=np.float64)
+        nulls = np.isnan(values)
+        self.null_count += int(nulls.sum())
+        values = values[~nulls]
+        if not len(values):
+            return self
+        self.count += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        tiny = np.finfo(np.float64).tiny
+        self._add_to(self.positive, values[values > tiny])
+        self._add_to(self.negative, -values[values < -tiny])
+        self.zero_count += int((np.abs(values) <= tiny).sum())
+        self._collapse()
+        return self
+
+    def _collapse(self) -> None:
+        excess = len(self.positive) + len(self.negative) - self.max_bins
+        for store in (self.negative, self.positive):
+            if excess <= 0 or len(store) < 2:
+                continue
+            keys = sorted(store)
+            fold = keys[:min(excess, len(keys) - 1)]
+            into = keys[len(fold)]
+            store[into] += sum(store.pop(k) for k in fold)
+            excess -= len(fold)
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge quantile sketches with different relative accuracy")
+        for store, theirs in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, n in theirs.items():
+                store[key] = store.get(key, 0) + n
+        self.zero_count += other.zero_count
+        self.null_count += other.null_count
+        self.count += other.count
+        self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+        self._collapse()
+        return self
+
+    def _bucket_values(self, keys) -> np.ndarray:
+        # midpoint (in relative terms) of (gamma^(k-1), gamma^k]
+        return 2 * np.power(self.gamma, np.asarray(keys, dtype=np.float64)) / (self.gamma + 1)
+
+    def points(self):
+        """(values ascending, counts): one representative value per bucket."""
+        neg_keys = sorted(self.negative, reverse=True)
+        pos_keys = sorted(self.positive)
+        values = np.concatenate([-self._bucket_values(neg_keys), [0.0] if self.zero_count else [],
+                                 self._bucket_values(pos_keys)])
+        counts = np.array([self.negative[k] for k in neg_keys] + ([self.zero_count] if self.zero_count else [])
+                          + [self.positive[k] for k in pos_keys], dtype=np.float64)
+        return np.clip(values, self.min, self.max), counts
+
+    def quantile(self, q):
+        """Approximate q-quantile(s) (NaN for an empty sketch)."""
+        q = np.asarray(q, dtype=np.float64)
+        if not self.count:
+            return np.full(q.shape, np.nan)
+        values, counts = self.points()
+        ranks = q * (self.count - 1)
+        idx = np.searchsorted(np.cumsum(counts), ranks, side="right")
+        return values[np.minimum(idx, len(values) - 1)]
+
+    def cdf(self, x) -> np.ndarray:
+        """Approximate fraction of values <= x."""
+        x = np.asarray(x, dtype=np.float64)
+        if not self.count:
+            return np.zeros(x.shape)
+        values, counts = self.points()
+        cumulative = np.concatenate([[0.0], np.cumsum(counts)]) / self.count
+        return cumulative[np.searchsorted(values, x, side="right")]
+
+    def to_dict(self) -> dict:
+        return {"type": "quantile", "relative_accuracy": self.relative_accuracy, "max_bins": self.max_bins,
+                "positive": [[k, n] for k, n in sorted(self.positive.items())],
+                "negative": [[k, n] for k, n in sorted(self.negative.items())],
+                "zero_count": self.zero_count, "null_count": self.null_count, "count": self.count,
+                "min": self.min if self.count else None, "max": self.max if self.count else None}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "QuantileSketch":
+        sketch = cls(state["relative_accuracy"], state["max_bins"])
+        sketch.positive = {int(k): int(n) for k, n in state["positive"]}
+        sketch.negative = {int(k): int(n) for k, n in state["negative"]}
+        sketch.zero_count, sketch.null_count = state["zero_count"], state["null_count"]
+        sketch.count = state["count"]
+        if sketch.count:
+            sketch.min, sketch.max = state["min"], state["max"]
+        return sketch
+
+
+class CountMinSketch:
+    """
+    Approximate counts of keys: never below the true count, and above it by at
+    most ~e/width of the total except with probability ~e^-depth.
+    """
+
+    MAX_DEPTH = 8  # one 64-bit word of a blake2b digest (at most 64 bytes) per row
+
+    def __init__(self, width: int = 1024, depth: int = 4):
+        if not 1 <= depth <= self.MAX_DEPTH:
+            raise ValueError(f"Count-min depth must be between 1 and {self.MAX_DEPTH}, got {depth}")
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.total = 0
+
+    def _indices(self, keys: List[str]) -> np.ndarray:
+        # each row takes its own word of one blake2b digest: process-stable hashes that, unlike seeded
+        # CRCs (affine in the key), do not collide in every row once they collide in one
+        digests = b"".join(hashlib.blake2b(k.encode("utf-8"), digest_size=8 * self.depth).digest() for k in keys)
+        words = np.frombuffer(digests, dtype="<u8").reshape(len(keys), self.depth)
+        return (words % np.uint64(self.width)).T.astype(np.int64)
+
+    def add(self, keys: List[str], counts) -> None:
+        counts = np.asarray(counts, dtype=np.int64)
+        indices = self._indices(keys)
+        for d in range(self.depth):
+            np.add.at(self.table[d], indices[d], counts)
+        self.total += int(counts.sum())
+
+    def estimate(self, keys: List[str]) -> np.ndarray:
+        if not keys:
+            return np.zeros(0, dtype=np.int64)
+        indices = self._indices(keys)
+        return self.table[np.arange(self.depth)[:, None], indices].min(axis=0)
+
+    def merge(self, other: "CountMinSketch") -> "CountMinSketch":
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Cannot merge count-min sketches of different shapes")
+        self.table += other.table
+        self.total += other.total
+        return self
+
+    def to_dict(self) -> dict:
+        return {"type": "count_min", "width": self.width, "depth": self.depth, "total": self.total,
+                "table": _encode_array(self.table)}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "CountMinSketch":
+        sketch = cls(state["width"], state["depth"])
+        sketch.table = _decode_array(state["table"])
+        sketch.total = state["total"]
+        return sketch
+
+
+class HeavyHitters:
+    """
+    Misra-Gries summary: at most `capacity` candidate frequent keys.
+
+    Every key with frequency above total / (capacity + 1) is kept; counts
+    are underestimated by at most that much.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.capacity = capacity
+        self.counters: Dict[str, int] = {}
+
+    def _reduce(self) -> None:
+        if len(self.counters) > self.capacity:
+            cut = sorted(self.counters.values(), reverse=True)[self.capacity]
+            self.counters = {k: n - cut for k, n in self.counters.items() if n > cut}
+
+    def add(self, keys: List[str], counts) -> None:
+        for key, n in zip(keys, np.asarray(counts).tolist()):
+            self.counters[key] = self.counters.get(key, 0) + n
+        self._reduce()
+
+    def merge(self, other: "HeavyHitters") -> "HeavyHitters":
+        for key, n in other.counters.items():
+            self.counters[key] = self.counters.get(key, 0) + n
+        self._reduce()
+        return self
+
+    def top(self, n: Optional[int] = None) -> List[str]:
+        return sorted(self.counters, key=lambda k: (-self.counters[k], k))[:n]
+
+    def to_dict(self) -> dict:
+        return {"type": "heavy_hitters", "capacity": self.capacity, "counters": self.counters}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "HeavyHitters":
+        sketch = cls(state["capacity"])
+        sketch.counters = {k: int(n) for k, n in state["counters"].items()}
+        return sketch
+
+
+class HyperLogLog:
+    """Approximate distinct count (standard error ~1.04 / sqrt(2^precision))."""
+
+    def __init__(self, precision: int = 12):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, keys: List[str]) -> None:
+        suffix_bits = 64 - self.precision
+        for key in keys:
+            h = int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+            index, rest = h >> suffix_bits, h & ((1 << suffix_bits) - 1)
+            rank = suffix_bits - rest.bit_length() + 1
+            if rank > self.registers[index]:
+                self.registers[index] = rank
+
+    def estimate(self) -> float:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        empty = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and empty:
+            return float(m * math.log(m / empty))  # linear counting for small cardinalities
+        return float(raw)
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def to_dict(self) -> dict:
+        return {"type": "hyperloglog", "precision": self.precision, "registers": _encode_array(self.registers)}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "HyperLogLog":
+        sketch = cls(state["precision"])
+        sketch.registers = _decode_array(state["registers"])
+        return sketch
+
+
+class CategoricalSketch:
+    """Count-min counts, heavy hitters and distinct count of one categorical column (nulls are a category)."""
+
+    def __init__(self, width: int = 1024, depth: int = 4, capacity: int = 64, precision: int = 12):
+        self.counts = CountMinSketch(width, depth)
+        self.hitters = HeavyHitters(capacity)
+        self.distinct = HyperLogLog(precision)
+
+    @property
+    def count(self) -> int:
+        return self.counts.total
+
+    def update(self, series: pd.Series) -> "CategoricalSketch":
+        codes, keys = factorize_categories(series)
+        if keys:
+            counts = np.bincount(codes, minlength=len(keys))
+            # distinct keys can repeat after normalisation (e.g. 9 and 9.0); the sketches add them up
+            self.counts.add(keys, counts)
+            self.hitters.add(keys, counts)
+            self.distinct.add(keys)
+        return self
+
+    def merge(self, other: "CategoricalSketch") -> "CategoricalSketch":
+        self.counts.merge(other.counts)
+        self.hitters.merge(other.hitters)
+        self.distinct.merge(other.distinct)
+        return self
+
+    def frequencies(self, keys: List[str]) -> np.ndarray:
+        """Approximate share of rows for each of `keys`."""
+        return self.counts.estimate(keys) / max(self.count, 1)
+
+    def to_dict(self) -> dict:
+        return {"type": "categorical", "counts": self.counts.to_dict(), "hitters": self.hitters.to_dict(),
+                "distinct": self.distinct.to_dict()}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "CategoricalSketch":
+        sketch = cls.__new__(cls)
+        sketch.counts = CountMinSketch.from_dict(state["counts"])
+        sketch.hitters = HeavyHitters.from_dict(state["hitters"])
+        sketch.distinct = HyperLogLog.from_dict(state["distinct"])
+        return sketch
+
+
+_SKETCH_TYPES = {"quantile": QuantileSketch, "categorical": CategoricalSketch}
+
+
+class DataSketch:
+    """
+    Sketches of every column of a bookings frame or chunk stream.
+
+    Columns are typed on the first update: string-like columns and the
+    agent/company ids are categorical, other numeric columns numeric, dates
+    are skipped.
+    """
+
+    def __init__(self):
+        self.columns: Dict[str, object] = {}
+        self.rows = 0
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "DataSketch":
+        return cls().update(df)
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[pd.DataFrame]) -> "DataSketch":
+        sketch = cls()
+        for _ in sketch.observe(chunks):
+            pass
+        return sketch
+
+    def _new_sketch(self, series: pd.Series):
+        if series.name in ID_COLUMNS or is_categorical_column(series):
+            return CategoricalSketch()
+        if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+            return QuantileSketch()
+        return None
+
+    def update(self, df: pd.DataFrame) -> "DataSketch":
+        try:
+            for col in df.columns:
+                sketch = self.columns.get(col)
+                if sketch is None:
+                    sketch = self._new_sketch(df[col])
+                    if sketch is None:
+                        continue
+                    self.columns[col] = sketch
+                if isinstance(sketch, QuantileSketch):
+                    sketch.update(df[col].to_numpy(dtype=np.float64, na_value=np.nan))
+                else:
+                    sketch.update(df[col])
+            self.rows += len(df)
+            return self
+        except Exception as e:
+            raise CustomException("Error updating data sketch", e)
+
+    def observe(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """Pass `chunks` through unchanged, sketching each one on the way (for streams read once)."""
+        for chunk in chunks:
+            self.update(chunk)
+            yield chunk
+
+    def merge(self, other: "DataSketch") -> "DataSketch":
+        for col, sketch in other.columns.items():
+            if col in self.columns:
+                self.columns[col].merge(sketch)
+            else:
+                self.columns[col] = type(sketch).from_dict(sketch.to_dict())
+        self.rows += other.rows
+        return self
+
+    def to_dict(self) -> dict:
+        return {"version": SKETCH_VERSION, "rows": self.rows,
+                "columns": {col: sketch.to_dict() for col, sketch in self.columns.items()}}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "DataSketch":
+        if state.get("version") != SKETCH_VERSION:
+            raise CustomException(f"Unsupported data sketch version {state.get('version')}")
+        sketch = cls()
+        sketch.rows = state["rows"]
+        sketch.columns = {col: _SKETCH_TYPES[s["type"]].from_dict(s) for col, s in state["columns"].items()}
+        return sketch
+
+    def save(self, path: str) -> None:
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: str) -> "DataSketch":
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+def psi(expected: np.ndarray, actual: np.ndarray) -> float:
+    """Population stability index of two binned distributions (fractions summing to 1)."""
+    e = np.maximum(np.asarray(expected, dtype=np.float64), PSI_EPSILON)
+    a = np.maximum(np.asarray(actual, dtype=np.float64), PSI_EPSILON)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+def drift_status(score: float) -> str:
+    if not np.isfinite(score):
+        return "n/a"
+    return "alert" if score > PSI_ALERT else "warn" if score > PSI_WARN else "ok"
+
+
+def _numeric_drift(ref: QuantileSketch, batch: QuantileSketch) -> dict:
+    if not ref.count or not batch.count:
+        return {"kind": "numeric", "psi": float("nan"), "ks": float("nan")}
+    edges = np.unique(ref.quantile(np.linspace(0, 1, PSI_BINS + 1)[1:-1]))
+
+    def binned(sketch):
+        return np.diff(np.concatenate([[0.0], sketch.cdf(edges), [1.0]]))
+
+    points = np.union1d(ref.points()[0], batch.points()[0])
+    return {
+        "kind": "numeric",
+        "psi": psi(binned(ref), binned(batch)),
+        "ks": float(np.max(np.abs(ref.cdf(points) - batch.cdf(points)))),
+        "reference_median": float(ref.quantile(0.5)),
+        "batch_median": float(batch.quantile(0.5)),
+        "reference_null_rate": ref.null_count / max(ref.count + ref.null_count, 1),
+        "batch_null_rate": batch.null_count / max(batch.count + batch.null_count, 1),
+    }
+
+
+def _categorical_drift(ref: CategoricalSketch, batch: CategoricalSketch, top: int = 5) -> dict:
+    if not ref.count or not batch.count:
+        return {"kind": "categorical", "psi": float("nan"), "ks": None}
+    keys = ref.hitters.top()
+    expected, actual = ref.frequencies(keys), batch.frequencies(keys)
+    expected = np.append(expected, max(0.0, 1.0 - expected.sum()))
+    actual = np.append(actual, max(0.0, 1.0 - actual.sum()))
+    # categories frequent in the batch that the reference never saw (count-min never undercounts)
+    candidates = batch.hitters.top()
+    unseen = [k for k, n in zip(candidates, ref.counts.estimate(candidates)) if n == 0]
+    return {
+        "kind": "categorical",
+        "psi": psi(expected, actual),
+        "ks": None,
+        "reference_distinct": round(ref.distinct.estimate()),
+        "batch_distinct": round(batch.distinct.estimate()),
+        "unseen_share": float(batch.frequencies(unseen).sum()) if unseen else 0.0,
+        "unseen_top": unseen[:top],
+        "reference_top": keys[:top],
+        "batch_top": candidates[:top],
+    }
+
+
+def drift_scores(reference: DataSketch, batch: DataSketch) -> Dict[str, dict]:
+    """Per-column drift of `batch` against `reference`, for the columns both sketches have."""
+    try:
+        scores = {}
+        for col, ref in reference.columns.items():
+            other = batch.columns.get(col)
+            if other is None or type(other) is not type(ref):
+                continue
+            scores[col] = (_numeric_drift(ref, other) if isinstance(ref, QuantileSketch)
+                           else _categorical_drift(ref, other))
+            scores[col]["status"] = drift_status(scores[col]["psi"])
+        return scores
+    except Exception as e:
+        raise CustomException("Error computing drift scores", e)
@@ -0,0 +1,135 @@
+"""
+Monthly booking aggregates behind the seasonality plots.
+
+The notebook built `final_rush` (guests per month at each hotel) and
+`sorted_data` (bookings per month by weekend/weekday stay type) from
+value_counts, a merge, a row-wise `apply` and a month-sorting package.
+`MonthlyCounts` gets both from a single `np.bincount` over a
+(month, hotel, stay type) cube of integer codes: months are coded by
+calendar position, hotels and stay types by their fixed label order, so
+the cost is a few vector operations per row (tens of millions of rows
+in seconds) and the tables come out in calendar order without sorting.
+Counts are additive, so chunks or files can be counted separately and
+merged.
+"""
+from dataclasses import dataclass, field
+import numpy as np
+import pandas as pd
+from constants.schema import MONTHS
+from logger.log_config import get_logger
+from exception.custom_exception import CustomException
+
+logger = get_logger("monthly_aggregation")
+
+HOTELS = ['Resort Hotel', 'City Hotel']
+# column labels of the notebook's week_function, in the order unstack() gave them
+STAY_TYPES = ['stay_both_weekdays_weekends', 'stay_just_weekdays', 'stay_just_weekend', 'undefined_data']
+GUEST_COLUMNS = ['no_of_guests_in_resort', 'no_of_guests_city']
+REQUIRED_COLUMNS = ['arrival_date_month', 'hotel', 'stays_in_weekend_nights', 'stays_in_week_nights']
+
+
+def label_codes(series: pd.Series, labels: list) -> np.ndarray:
+    """Position of each value in `labels` (-1 if absent or null), looked up once per distinct value."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+    else:
+        codes, uniques = pd.factorize(series)
+    position = {label: i for i, label in enumerate(labels)}
+    # the trailing -1 is where the null code (-1) lands
+    lookup = np.array([position.get(v, -1) for v in uniques] + [-1], dtype=np.int64)
+    return lookup[codes]
+
+
+def _sign_index(series: pd.Series) -> np.ndarray:
+    """0 for negative or null, 1 for zero, 2 for positive values."""
+    if series.dtype.kind in 'iu':
+        return np.sign(series.to_numpy()).astype(np.int8) + 1
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    index = np.sign(values) + 1
+    index[np.isnan(values)] = 0
+    return index.astype(np.int8)
+
+
+def _stay_type_table() -> np.ndarray:
+    """STAY_TYPES index by (week nights sign index * 3 + weekend nights sign index)."""
+    table = np.full((3, 3), STAY_TYPES.index('undefined_data'), dtype=np.int64)
+    table[1, 2] = STAY_TYPES.index('stay_just_weekend')
+    table[2, 1] = STAY_TYPES.index('stay_just_weekdays')
+    table[2, 2] = STAY_TYPES.index('stay_both_weekdays_weekends')
+    return table.ravel()
+
+
+_STAY_TYPE_TABLE = _stay_type_table()
+
+
+def stay_type_codes(weekend_nights: pd.Series, week_nights: pd.Series) -> np.ndarray:
+    """Index into STAY_TYPES per row; nulls fall through to undefined_data, as in week_function."""
+    return _STAY_TYPE_TABLE[_sign_index(week_nights) * np.int8(3) + _sign_index(weekend_nights)]
+
+
+@dataclass
+class MonthlyCounts:
+    """
+    Non-cancelled bookings per (month, hotel, stay type).
+
+    The hotel axis has one slot per HOTELS entry plus a last slot for any
+    other or missing hotel, so those bookings still count in `sorted_data`.
+    Rows with an unrecognised month are not counted.
+    """
+    counts: np.ndarray = field(
+        default_factory=lambda: np.zeros((len(MONTHS), len(HOTELS) + 1, len(STAY_TYPES)), dtype=np.int64))
+
+    @property
+    def bookings(self) -> int:
+        return int(self.counts.sum())
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "MonthlyCounts":
+        return cls().update(df)
+
+    def update(self, df: pd.DataFrame) -> "MonthlyCounts":
+        """Add the non-cancelled rows of `df` (bookings without is_canceled all count)."""
+        try:
+            missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+            if missing:
+                logger.warning(f"Monthly aggregates need {missing}; skipping {len(df):,} rows")
+                return self
+            n_months, n_hotels, n_stays = self.counts.shape
+            month = label_codes(df['arrival_date_month'], MONTHS)
+            hotel = label_codes(df['hotel'], HOTELS)
+            hotel[hotel < 0] = n_hotels - 1
+            stay = stay_type_codes(df['stays_in_weekend_nights'], df['stays_in_week_nights'])
+            cell = (month * n_hotels + hotel) * n_stays + stay
+            skip = month < 0
+            if 'is_canceled' in df.columns:
+                skip |= df['is_canceled'].to_numpy(dtype=np.float64, na_value=np.nan) != 0
+            # skipped rows go to one extra bin that is dropped, rather than compressing the arrays
+            size = self.counts.size
+            cell[skip] = size
+            self.counts += np.bincount(cell, minlength=size + 1)[:size].reshape(self.counts.shape)
+            return self
+        except Exception as e:
+            raise CustomException("Error computing monthly aggregates", e)
+
+    def merge(self, other: "MonthlyCounts") -> "MonthlyCounts":
+        self.counts += other.counts
+        return self
+
+    def _months_present(self, counts: np.ndarray) -> np.ndarray:
+        return counts.sum(axis=1) > 0
+
+    def final_rush(self) -> pd.DataFrame:
+        """Guests (non-cancelled bookings) per month at each hotel, indexed by month in calendar order."""
+        per_hotel = self.counts[:, :len(HOTELS), :].sum(axis=2)
+        present = self._months_present(per_hotel)
+        index = pd.Index(np.array(MONTHS)[present], name='month')
+        return pd.DataFrame(per_hotel[present], index=index, columns=GUEST_COLUMNS)
+
+    def sorted_data(self) -> pd.DataFrame:
+        """Bookings per month by stay type (the weekend/weekday stacked bars), in calendar order."""
+        per_stay = self.counts.sum(axis=1)
+        present = self._months_present(per_stay)
+        used = per_stay.sum(axis=0) > 0
+        index = pd.Index(np.array(MONTHS)[present], name='arrival_date_month')
+        columns = pd.Index(np.array(STAY_TYPES)[used], name='weekend_or_weekday')
+        return pd.DataFrame(per_stay[present][:, used], index=index, columns=columns)
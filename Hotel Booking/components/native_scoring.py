@@ -0,0 +1,157 @@
+"""
+Scoring from a model's native export with numpy and the standard library only.
+
+`NativeScorer` reads the coefficients (NPZ) and preprocessing maps (JSON)
+written by utils.model_registry.export_native, and rebuilds the features of
+`BookingPreprocessor.transform_array` from raw CSV fields. A scoring process
+therefore never imports pandas or sklearn. Its probabilities match
+`Scorer.predict_proba` on the same file.
+"""
+import csv
+import itertools
+import json
+import os
+import time
+from typing import Dict, Iterator, List, Sequence
+
+import numpy as np
+
+NATIVE_COEF_FILE = "coefficients.npz"
+NATIVE_PREPROCESSING_FILE = "preprocessing.json"
+DEPOSIT_MAPPING = {'No Deposit': 0, 'Non Refund': 1, 'Refundable': 0}
+
+# fields pandas.read_csv reads as missing by default; treated the same way so
+# both scorers see the same nulls (e.g. country "NA")
+NA_VALUES = frozenset(['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND',
+                       '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'])
+
+OUTPUT_COLUMNS = ['source', 'row', 'cancel_probability', 'predicted_is_canceled']
+
+
+def _to_float(value: str) -> float:
+    if value in NA_VALUES:
+        return 0.0
+    try:
+        return float(value)
+    except ValueError:
+        return 0.0
+
+
+class NativeScorer:
+    """
+    Logistic scoring over columns of raw CSV strings.
+
+    `state` is `BookingPreprocessor.to_dict()`; only the columns the model
+    uses (and the raw columns they are derived from) are read.
+    """
+
+    def __init__(self, state: dict, coef: np.ndarray, intercept: float, threshold: float = 0.5):
+        self.prior = float(state["prior"])
+        self.country_fill = state["country_fill"]
+        self.encodings = {col: {k: float(v) for k, v in pairs} for col, pairs in state["encodings"].items()}
+        self.log_shifts = {k: float(v) for k, v in state["log_shifts"].items()}
+        self.log_floors = {k: float(v) for k, v in state["log_floors"].items()}
+        selected = state.get("selected_features")
+        self.output_columns: List[str] = list(selected if selected is not None else state["feature_columns"])
+        self.coef = np.asarray(coef, dtype=np.float64).ravel()
+        self.intercept = float(intercept)
+        self.threshold = threshold
+        if len(self.output_columns) != len(self.coef):
+            raise ValueError(f"Preprocessing produces {len(self.output_columns)} features "
+                             f"but model expects {len(self.coef)}")
+
+    @classmethod
+    def from_model_dir(cls, model_dir: str, threshold: float = 0.5) -> "NativeScorer":
+        with np.load(os.path.join(model_dir, NATIVE_COEF_FILE)) as data:
+            coef, intercept = data["coef"], float(data["intercept"][0])
+        with open(os.path.join(model_dir, NATIVE_PREPROCESSING_FILE)) as f:
+            state = json.load(f)
+        return cls(state, coef, intercept, threshold)
+
+    def _numeric(self, columns: Dict[str, Sequence[str]], col: str, n: int) -> np.ndarray:
+        if col not in columns:
+            return np.zeros(n)
+        return np.fromiter((_to_float(v) for v in columns[col]), dtype=np.float64, count=n)
+
+    def _encode(self, values: Sequence[str], col: str) -> np.ndarray:
+        enc, prior = self.encodings[col], self.prior
+        null_key = self.country_fill if col == 'country' else 0
+        null_value = enc.get(null_key, prior)
+        return np.fromiter((null_value if v in NA_VALUES else enc.get(v, prior) for v in values),
+                           dtype=np.float64, count=len(values))
+
+    def _column(self, columns: Dict[str, Sequence[str]], col: str, n: int) -> np.ndarray:
+        if col in self.encodings:
+            if col not in columns:
+                raise KeyError(col)
+            return self._encode(columns[col], col)
+        if col == 'is_family':
+            adults = self._numeric(columns, 'adults', n)
+            kids = (self._numeric(columns, 'children', n) > 0) | (self._numeric(columns, 'babies', n) > 0)
+            return ((adults > 0) & kids).astype(np.float64)
+        if col == 'total_customer':
+            return (self._numeric(columns, 'adults', n) + self._numeric(columns, 'children', n)
+                    + self._numeric(columns, 'babies', n))
+        if col == 'total_nights':
+            return self._numeric(columns, 'stays_in_week_nights', n) + self._numeric(columns, 'stays_in_weekend_nights', n)
+        if col == 'deposit_given':
+            values = columns.get('deposit_type', ())
+            return np.fromiter((DEPOSIT_MAPPING.get(v, 0) for v in values), dtype=np.float64, count=len(values)) \
+                if values else np.zeros(n)
+        values = self._numeric(columns, col, n)
+        if col in self.log_shifts:
+            values = np.log1p(np.maximum(values, self.log_floors[col]) + self.log_shifts[col])
+        return values
+
+    def features(self, columns: Dict[str, Sequence[str]], n: int) -> np.ndarray:
+        """Feature matrix (n x output_columns) for `n` bookings given as {column: raw string values}."""
+        out = np.empty((n, len(self.output_columns)), dtype=np.float64)
+        for j, col in enumerate(self.output_columns):
+            out[:, j] = self._column(columns, col, n)
+        return out
+
+    def predict_proba(self, columns: Dict[str, Sequence[str]], n: int) -> np.ndarray:
+        z = self.features(columns, n) @ self.coef + self.intercept
+        return 1.0 / (1.0 + np.exp(-z))
+
+    def predict_records(self, records: List[dict]) -> np.ndarray:
+        """Probabilities for bookings given as dicts (e.g. parsed JSON); values are converted with str()."""
+        names = set(itertools.chain.from_iterable(records))
+        columns = {name: ['' if r.get(name) is None else str(r[name]) for r in records] for name in names}
+        return self.predict_proba(columns, len(records))
+
+
+def iter_csv_columns(path: str, chunk_rows: int) -> Iterator[Dict[str, List[str]]]:
+    """Yield {column: values} for each block of `chunk_rows` rows of a CSV file."""
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        while True:
+            rows = list(itertools.islice(reader, chunk_rows))
+            if not rows:
+                break
+            yield dict(zip(header, map(list, zip(*rows))))
+
+
+def score_csv_files(inputs: List[str], output_path: str, scorer: NativeScorer, chunk_rows: int = 100_000) -> dict:
+    """Score CSV files into one output CSV laid out like components.scoring.score_files writes it."""
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    start = time.perf_counter()
+    total_rows = 0
+    with open(output_path, 'w', newline='') as out:
+        out.write(",".join(OUTPUT_COLUMNS) + "\n")
+        for path in inputs:
+            source, first_row = os.path.basename(path), 0
+            for columns in iter_csv_columns(path, chunk_rows):
+                n = len(next(iter(columns.values())))
+                proba = scorer.predict_proba(columns, n)
+                labels = (proba >= scorer.threshold).astype(np.int8)
+                out.writelines(f"{source},{first_row + i},{p:.6f},{label}\n"
+                               for i, (p, label) in enumerate(zip(proba.tolist(), labels.tolist())))
+                first_row += n
+                total_rows += n
+    elapsed = time.perf_counter() - start
+    rate = total_rows / elapsed if elapsed > 0 else float('inf')
+    return {"rows": total_rows, "files": len(inputs), "seconds": elapsed, "rows_per_sec": rate}
@@ -0,0 +1,231 @@
+"""
+Nightly occupancy per hotel and room type, from arrival date plus stay length.
+
+A booking arriving on day `a` for `n` nights (weekend + week nights) is in
+house on the nights a .. a+n-1. Rather than expanding every booking into its
+nights, `OccupancyIndex.from_frame` adds +1 (or +guests) at `a` and -1 at
+`a+n` in a difference array over (cancelled, hotel, room type, day), built
+with two np.bincount calls, and takes one cumulative sum along the day
+axis. Building costs a few vector operations per booking; the index holds
+one count per night per hotel/room type/status however many bookings there
+are, so range queries are a slice and a sum (well under a millisecond).
+"""
+from typing import Iterable, List, Union
+import numpy as np
+import pandas as pd
+from components.monthly_aggregation import label_codes
+from components.sparse_encoding import factorize_categories
+from constants.schema import MONTHS
+from logger.log_config import get_logger
+from exception.custom_exception import CustomException
+
+logger = get_logger("occupancy")
+
+MEASURES = ("guests", "rooms")
+STATUSES = ("booked", "cancelled")
+GUEST_COLUMNS = ['adults', 'children', 'babies']
+DATE_COLUMNS = ['arrival_date_year', 'arrival_date_month', 'arrival_date_day_of_month']
+NIGHT_COLUMNS = ['stays_in_weekend_nights', 'stays_in_week_nights']
+EPOCH = np.datetime64('1970-01-01', 'D')
+# bounds on what from_frame accepts, so one mistyped date or stay cannot blow up the dense day axis:
+# stays longer than a year, and arrivals more than a year outside the data's 1st..99th percentile range
+MAX_STAY_NIGHTS = 366
+ARRIVAL_MARGIN_DAYS = 366
+ARRIVAL_PERCENTILES = (1, 99)
+
+
+def _numbers(df: pd.DataFrame, col: str) -> np.ndarray:
+    return df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def arrival_days(df: pd.DataFrame) -> np.ndarray:
+    """Arrival date per row as days since 1970-01-01 (float, NaN where the date is missing or invalid)."""
+    year = _numbers(df, 'arrival_date_year')
+    month = label_codes(df['arrival_date_month'], MONTHS).astype(np.float64)
+    month[month < 0] = np.nan
+    day = _numbers(df, 'arrival_date_day_of_month')
+    valid = ~(np.isnan(year) | np.isnan(month) | np.isnan(day))
+    months = np.zeros(len(df), dtype=np.int64)
+    months[valid] = (year[valid] - 1970) * 12 + month[valid]
+    first = months.astype('datetime64[M]').astype('datetime64[D]')
+    length = ((months + 1).astype('datetime64[M]').astype('datetime64[D]') - first).astype(np.int64)
+    days = (first - EPOCH).astype(np.int64) + day - 1
+    # a day past the end of its month (e.g. 31 June) is not rolled into the next month
+    days[~valid | (day < 1) | (day > length)] = np.nan
+    return days
+
+
+def _labels(series: pd.Series):
+    """(codes, labels) with labels sorted, so the index layout does not depend on row order."""
+    codes, keys = factorize_categories(series)
+    order = np.argsort(keys, kind='stable')
+    rank = np.empty(len(keys), dtype=np.int64)
+    rank[order] = np.arange(len(keys))
+    return rank[codes], [keys[i] for i in order]
+
+
+def _selection(labels: List[str], wanted: Union[None, str, Iterable[str]], what: str) -> np.ndarray:
+    if wanted is None:
+        return np.arange(len(labels))
+    wanted = [wanted] if isinstance(wanted, str) else list(wanted)
+    unknown = [w for w in wanted if w not in labels]
+    if unknown:
+        raise ValueError(f"Unknown {what} {unknown}; the index has {labels}")
+    return np.array([labels.index(w) for w in wanted], dtype=np.int64)
+
+
+class OccupancyIndex:
+    """
+    In-house guests and occupied rooms per night, by status, hotel and room type.
+
+    `counts[measure]` has shape (len(STATUSES), len(hotels), len(room_types),
+    n_nights); night `i` is `origin + i` days. Bookings with a missing or
+    invalid arrival date, or missing/negative stay lengths, are left out, as
+    are implausible ones (see `from_frame`); zero-night (day use) bookings
+    occupy no night.
+    """
+
+    def __init__(self, counts: dict, hotels: List[str], room_types: List[str], origin: np.datetime64,
+                 room_column: str = 'assigned_room_type'):
+        self.counts = counts
+        self.hotels = list(hotels)
+        self.room_types = list(room_types)
+        self.origin = np.datetime64(origin, 'D')
+        self.room_column = room_column
+
+    @property
+    def n_nights(self) -> int:
+        return self.counts["rooms"].shape[-1]
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        return pd.date_range(pd.Timestamp(self.origin), periods=self.n_nights, freq='D', name='night')
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, room_column: str = 'assigned_room_type',
+                   max_stay_nights: int = MAX_STAY_NIGHTS,
+                   arrival_margin_days: int = ARRIVAL_MARGIN_DAYS) -> "OccupancyIndex":
+        """
+        Build the index from raw bookings; `room_column` is the room type a stay is counted under.
+
+        Stays longer than `max_stay_nights`, and arrivals more than
+        `arrival_margin_days` before the 1st or after the 99th percentile
+        arrival (typos such as year 9000), are skipped with a warning, so
+        the night axis spans the data's real date range.
+        """
+        try:
+            required = DATE_COLUMNS + NIGHT_COLUMNS + ['hotel', room_column]
+            missing = [c for c in required if c not in df.columns]
+            if missing:
+                raise ValueError(f"Occupancy needs the columns {missing}")
+            arrival = arrival_days(df)
+            nights = _numbers(df, 'stays_in_weekend_nights') + _numbers(df, 'stays_in_week_nights')
+            valid = ~np.isnan(arrival) & (nights >= 0)
+            skipped = len(df) - int(valid.sum())
+            if skipped:
+                logger.warning(f"Occupancy: skipping {skipped:,} bookings without a valid arrival date "
+                               f"or stay length")
+            if valid.any():
+                low, high = np.percentile(arrival[valid], ARRIVAL_PERCENTILES)
+                plausible = ((nights <= max_stay_nights) & (arrival >= low - arrival_margin_days)
+                             & (arrival <= high + arrival_margin_days))
+                implausible = int((valid & ~plausible).sum())
+                if implausible:
+                    logger.warning(f"Occupancy: skipping {implausible:,} bookings with a stay over "
+                                   f"{max_stay_nights} nights or an arrival far outside "
+                                   f"{EPOCH + int(low)} .. {EPOCH + int(high)}")
+                valid &= plausible
+            hotel, hotels = _labels(df['hotel'])
+            room, room_types = _labels(df[room_column])
+            if 'is_canceled' in df.columns:
+                status = (_numbers(df, 'is_canceled') > 0).astype(np.int64)
+            else:
+                status = np.zeros(len(df), dtype=np.int64)
+            guests = np.zeros(len(df), dtype=np.float64)
+            for col in GUEST_COLUMNS:
+                if col in df.columns:
+                    guests += np.nan_to_num(_numbers(df, col))
+
+            arrival, nights = arrival[valid].astype(np.int64), nights[valid].astype(np.int64)
+            first = int(arrival.min()) if len(arrival) else 0
+            n_nights = int((arrival + nights).max()) - first if len(arrival) else 0
+            # one slot past the last night takes the -1 of the latest departures
+            span = n_nights + 1
+            shape = (len(STATUSES), len(hotels), len(room_types), span)
+            cell = ((status[valid] * len(hotels) + hotel[valid]) * len(room_types) + room[valid]) * span
+            start = cell + (arrival - first)
+            end = start + nights
+            size = int(np.prod(shape))
+            counts = {}
+            for measure, weights in (("rooms", None), ("guests", guests[valid])):
+                diff = (np.bincount(start, weights, minlength=size)
+                        - np.bincount(end, weights, minlength=size)).reshape(shape)
+                cumulative = np.cumsum(diff, axis=-1)[..., :n_nights]
+                counts[measure] = np.rint(cumulative).astype(np.int64) if weights is not None else cumulative
+            index = cls(counts, hotels, room_types, EPOCH + first, room_column)
+            logger.info(f"Built occupancy index: {int(valid.sum()):,} bookings, {n_nights:,} nights from "
+                        f"{index.origin}, {len(hotels)} hotels x {len(room_types)} room types")
+            return index
+        except Exception as e:
+            raise CustomException("Error building occupancy index", e)
+
+    def _window(self, start, end):
+        """(first, last) night positions of the inclusive window, relative to the origin and not clipped."""
+        first = 0 if start is None else int((np.datetime64(pd.Timestamp(start).date(), 'D') - self.origin)
+                                            .astype(np.int64))
+        last = self.n_nights - 1 if end is None else int((np.datetime64(pd.Timestamp(end).date(), 'D')
+                                                          - self.origin).astype(np.int64))
+        if last < first:
+            raise ValueError(f"Empty date window: {start} .. {end}")
+        return first, last
+
+    def _nightly(self, measure: str, statuses, hotel, room_type, start, end) -> pd.Series:
+        if measure not in MEASURES:
+            raise ValueError(f"Unknown measure {measure!r}; expected one of {MEASURES}")
+        hotels = _selection(self.hotels, hotel, "hotel")
+        rooms = _selection(self.room_types, room_type, "room type")
+        first, last = self._window(start, end)
+        lo, hi = max(first, 0), min(last + 1, self.n_nights)
+        values = np.zeros(last - first + 1, dtype=np.int64)
+        if lo < hi:
+            block = self.counts[measure][np.ix_(statuses, hotels, rooms, np.arange(lo, hi))]
+            values[lo - first:hi - first] = block.sum(axis=(0, 1, 2))
+        dates = pd.date_range(pd.Timestamp(self.origin + first), periods=len(values), freq='D', name='night')
+        return pd.Series(values, index=dates, name=measure)
+
+    def nightly(self, hotel=None, room_type=None, start=None, end=None, include_cancelled: bool = False,
+                measure: str = "guests") -> pd.Series:
+        """
+        In-house `measure` per night over the inclusive [start, end] window.
+
+        `hotel` / `room_type` take a label, a list of labels or None (all);
+        with include_cancelled the cancelled bookings' nights are added, which
+        gives the demand as booked rather than as realised. Nights outside
+        the indexed range are zero.
+        """
+        statuses = [0, 1] if include_cancelled else [0]
+        return self._nightly(measure, statuses, hotel, room_type, start, end)
+
+    def breakdown(self, hotel=None, room_type=None, start=None, end=None, measure: str = "guests") -> pd.DataFrame:
+        """Booked and cancelled `measure` per night, side by side."""
+        return pd.DataFrame({status: self._nightly(measure, [i], hotel, room_type, start, end)
+                             for i, status in enumerate(STATUSES)})
+
+    def demand_index(self, hotel=None, room_type=None, start=None, end=None, measure: str = "guests") -> pd.Series:
+        """Nightly demand (booked plus cancelled) relative to its mean over the window; 1.0 is an average night."""
+        demand = self.nightly(hotel, room_type, start, end, include_cancelled=True, measure=measure)
+        mean = demand.mean()
+        return (demand / mean if mean > 0 else demand * 0.0).rename("demand_index")
+
+    def save(self, path: str) -> None:
+        np.savez_compressed(path, rooms=self.counts["rooms"], guests=self.counts["guests"],
+                            hotels=np.array(self.hotels, dtype=str), room_types=np.array(self.room_types, dtype=str),
+                            origin=np.array(str(self.origin)), room_column=np.array(self.room_column))
+        logger.info(f"Saved occupancy index to {path}")
+
+    @classmethod
+    def load(cls, path: str) -> "OccupancyIndex":
+        with np.load(path, allow_pickle=False) as data:
+            return cls({"rooms": data["rooms"], "guests": data["guests"]}, data["hotels"].tolist(),
+                       data["room_types"].tolist(), np.datetime64(str(data["origin"]), 'D'),
+                       str(data["room_column"]))
@@ -1,7 +1,20 @@
-"""Module for generating text-based reports and console outputs."""
+"""
+Module for generating text-based reports and console outputs.
+
+Each `print_*` function emits a structured record through utils.report_sink,
+and the matching `_render_*` function, registered for the record's name,
+turns that record into the text report. Inside a report-sink session,
+rendering happens on the sink's writer thread, or never (quiet mode; see
+render_reports.py). Outside a session it happens right away, as before.
+"""
 import os
 import io
+import json
+import numpy as np
 import pandas as pd
+from components.data_profile import get_profile, get_report_level
+from utils import report_sink
+from utils.report_sink import renderer
 from logger.log_config import get_logger
 
 logger = get_logger("output_reports")
@@ -14,182 +27,450 @@ def ensure_reports_dir():
     os.makedirs(PLOTS_DIR, exist_ok=True)
 
 
-def print_and_save_text(title: str, content: str, filename: str = None):
-    """Print content to console and optionally save to file."""
-    print("\n" + "=" * 80)
-    print(f"  {title}")
-    print("=" * 80)
-    print(content)
-    
-    if filename:
-        ensure_reports_dir()
-        filepath = os.path.join(PLOTS_DIR, filename)
-        with open(filepath, 'w') as f:
-            f.write(f"{title}\n")
-            f.write("=" * 80 + "\n")
-            f.write(content)
-        logger.info(f"Saved report to {filepath}")
+def _report_path(filename: str) -> str:
+    return os.path.join(PLOTS_DIR, filename)
+
+
+def _frame(df: pd.DataFrame) -> dict:
+    """JSON form of a small DataFrame (orient="split"); `_unframe` restores it for rendering."""
+    dates = [col for col in df.columns if pd.api.types.is_datetime64_any_dtype(df[col])]
+    if dates:
+        # as pandas prints them (no time part at midnight), not as ISO timestamps
+        df = df.assign(**{col: df[col].astype(str) for col in dates})
+    return json.loads(df.to_json(orient="split", default_handler=str))
+
+
+def _unframe(data: dict) -> pd.DataFrame:
+    return pd.DataFrame(data["data"], index=data["index"], columns=data["columns"])
+
+
+def _series_text(mapping: dict) -> str:
+    return pd.Series(mapping, dtype=object if not mapping else None).to_string()
+
+
+def print_and_save_text(title: str, content: str, filename: str = None, data: dict = None):
+    """Print content to console and optionally save to file; `data` stores structured values alongside."""
+    record = {"content": content}
+    if data is not None:
+        record["values"] = data
+    report_sink.emit("report", "text", record, title=title, file=_report_path(filename) if filename else None)
+
+
+@renderer("text")
+def _render_text(data: dict) -> str:
+    return data["content"]
 
 
 def print_dataframe_info(df: pd.DataFrame, stage: str = "Data"):
-    """Print comprehensive DataFrame information."""
-    ensure_reports_dir()
-    
+    """Print DataFrame information at the configured report level (see data_profile.set_report_level)."""
+    level = get_report_level()
+    if level == "off":
+        return
+    profile = get_profile(df, full=(level == "full"))
+    data = {"stage": stage, "level": level, "shape": list(profile.shape),
+            "null_counts": {str(k): int(v) for k, v in profile.null_counts.items()},
+            "columns": [str(c) for c in profile.dtypes.index]}
+    if level == "full":
+        data["head"] = _frame(profile.head)
+        data["dtypes"] = {str(k): str(v) for k, v in profile.dtypes.items()}
+        data["describe"] = _frame(profile.describe) if profile.describe is not None else None
+    filename = f"00_dataframe_{stage.lower().replace(' ', '_')}.txt"
+    report_sink.emit("report", "dataframe_info", data, file=_report_path(filename))
+
+
+@renderer("dataframe_info")
+def _render_dataframe_info(data: dict) -> str:
     output = []
     output.append(f"\n{'=' * 80}")
-    output.append(f"STAGE: {stage}")
+    output.append(f"STAGE: {data['stage']}")
     output.append(f"{'=' * 80}\n")
-    
+
     # Shape
-    output.append(f"Shape: {df.shape} (rows, columns)\n")
-    
-    # First 5 rows
-    output.append("First 5 Rows:")
-    output.append(df.head().to_string())
-    output.append("")
-    
-    # Data types
-    output.append("Data Types:")
-    output.append(df.dtypes.to_string())
-    output.append("")
-    
-    # Missing values
-    output.append("Missing Values:")
-    output.append(df.isnull().sum().to_string())
-    output.append("")
-    
-    # Descriptive statistics
-    output.append("Descriptive Statistics:")
-    output.append(df.describe().to_string())
-    output.append("")
-    
+    output.append(f"Shape: {tuple(data['shape'])} (rows, columns)\n")
+
+    if data["level"] == "summary":
+        with_nulls = {k: v for k, v in data["null_counts"].items() if v > 0}
+        output.append(f"Total missing values: {sum(data['null_counts'].values())}")
+        if with_nulls:
+            output.append("Columns with missing values:")
+            output.append(_series_text(with_nulls))
+        output.append("")
+    else:
+        # First 5 rows
+        output.append("First 5 Rows:")
+        output.append(_unframe(data["head"]).to_string())
+        output.append("")
+
+        # Data types
+        output.append("Data Types:")
+        output.append(_series_text(data["dtypes"]))
+        output.append("")
+
+        # Missing values
+        output.append("Missing Values:")
+        output.append(_series_text(data["null_counts"]))
+        output.append("")
+
+        # Descriptive statistics
+        output.append("Descriptive Statistics:")
+        output.append(_unframe(data["describe"]).to_string() if data["describe"] is not None else "(no numeric columns)")
+        output.append("")
+
     # Column names
     output.append("All Columns:")
-    output.append(str(list(df.columns)))
+    output.append(str(data["columns"]))
     output.append("")
-    
-    content = "\n".join(output)
-    print(content)
-    
-    # Save to file
-    filename = f"00_dataframe_{stage.lower().replace(' ', '_')}.txt"
-    filepath = os.path.join(PLOTS_DIR, filename)
-    with open(filepath, 'w') as f:
-        f.write(content)
-    logger.info(f"Saved DataFrame info to {filepath}")
+    return "\n".join(output)
+
+
+def print_memory_footprint(df: pd.DataFrame, filename: str = "00_memory_footprint.txt"):
+    """Print per-column dtype and memory usage of a DataFrame."""
+    if get_report_level() == "off":
+        return
+    usage = df.memory_usage(deep=True, index=False)
+    data = {"rows": len(df), "columns": {str(col): {"dtype": str(df[col].dtype), "bytes": int(usage[col])}
+                                         for col in df.columns}}
+    report_sink.emit("report", "memory_footprint", data, title="MEMORY FOOTPRINT", file=_report_path(filename))
+
+
+@renderer("memory_footprint")
+def _render_memory_footprint(data: dict) -> str:
+    rows = data["rows"]
+    table = pd.DataFrame.from_dict(data["columns"], orient="index")
+    table["bytes_per_row"] = (table["bytes"] / max(rows, 1)).round(2)
+    total_mb = table["bytes"].sum() / 2 ** 20
+    return table.to_string() + f"\n\nTotal: {total_mb:.2f} MB for {rows} rows\n"
+
 
+def frame_summary(df: pd.DataFrame) -> dict:
+    """Cheap metadata snapshot (row count, column count, null count) of a DataFrame."""
+    return {
+        "rows": len(df),
+        "columns": len(df.columns),
+        "nulls": int(df.isnull().sum().sum()),
+    }
 
-def print_data_cleaning_summary(df_before: pd.DataFrame, df_after: pd.DataFrame, stage: str):
-    """Print summary of data cleaning operations."""
+
+def print_data_cleaning_summary(df_before, df_after, stage: str):
+    """Print summary of data cleaning operations.
+
+    `df_before` / `df_after` may be DataFrames or summaries from `frame_summary`,
+    so callers do not need to keep a full copy of the frame around.
+    """
+    if get_report_level() == "off":
+        return
+    before = df_before if isinstance(df_before, dict) else frame_summary(df_before)
+    after = df_after if isinstance(df_after, dict) else frame_summary(df_after)
+    report_sink.emit("report", "data_cleaning", {"stage": stage, "before": dict(before), "after": dict(after)})
+
+
+@renderer("data_cleaning")
+def _render_data_cleaning(data: dict) -> str:
+    before, after = data["before"], data["after"]
     output = []
     output.append(f"\n{'=' * 80}")
-    output.append(f"DATA CLEANING: {stage}")
+    output.append(f"DATA CLEANING: {data['stage']}")
     output.append(f"{'=' * 80}\n")
-    
-    rows_before = len(df_before)
-    rows_after = len(df_after)
+
+    rows_before = before["rows"]
+    rows_after = after["rows"]
     rows_dropped = rows_before - rows_after
-    
-    cols_before = len(df_before.columns)
-    cols_after = len(df_after.columns)
+
+    cols_before = before["columns"]
+    cols_after = after["columns"]
     cols_dropped = cols_before - cols_after
-    
+
     output.append(f"Rows: {rows_before} -> {rows_after} (dropped: {rows_dropped})")
     output.append(f"Columns: {cols_before} -> {cols_after} (dropped: {cols_dropped})")
-    output.append(f"Nulls before: {df_before.isnull().sum().sum()}")
-    output.append(f"Nulls after: {df_after.isnull().sum().sum()}\n")
-    
-    content = "\n".join(output)
-    print(content)
+    output.append(f"Nulls before: {before['nulls']}")
+    output.append(f"Nulls after: {after['nulls']}\n")
+    return "\n".join(output)
 
 
 def print_categorical_features(df: pd.DataFrame, categorical_cols: list):
     """Print value counts for categorical features."""
+    counts = {col: {str(k): int(v) for k, v in df[col].value_counts().items()}
+              for col in categorical_cols if col in df.columns}
+    report_sink.emit("report", "categorical_features", {"value_counts": counts})
+
+
+@renderer("categorical_features")
+def _render_categorical_features(data: dict) -> str:
     output = []
     output.append(f"\n{'=' * 80}")
     output.append("CATEGORICAL FEATURES - VALUE COUNTS")
     output.append(f"{'=' * 80}\n")
-    
-    for col in categorical_cols:
-        if col in df.columns:
-            output.append(f"\n{col}:")
-            output.append(df[col].value_counts().to_string())
-            output.append("")
-    
-    content = "\n".join(output)
-    print(content)
+
+    for col, counts in data["value_counts"].items():
+        output.append(f"\n{col}:")
+        output.append(_series_text(counts))
+        output.append("")
+    return "\n".join(output)
 
 
 def print_numerical_features(df: pd.DataFrame, numerical_cols: list):
     """Print statistics for numerical features."""
+    stats = {col: json.loads(df[col].describe().to_json()) for col in numerical_cols if col in df.columns}
+    report_sink.emit("report", "numerical_features", {"describe": stats})
+
+
+@renderer("numerical_features")
+def _render_numerical_features(data: dict) -> str:
     output = []
     output.append(f"\n{'=' * 80}")
     output.append("NUMERICAL FEATURES - STATISTICS")
     output.append(f"{'=' * 80}\n")
-    
-    for col in numerical_cols:
-        if col in df.columns:
-            output.append(f"\n{col}:")
-            output.append(df[col].describe().to_string())
-            output.append("")
-    
-    content = "\n".join(output)
-    print(content)
+
+    for col, stats in data["describe"].items():
+        output.append(f"\n{col}:")
+        output.append(pd.Series(stats).to_string())
+        output.append("")
+    return "\n".join(output)
 
 
 def print_feature_importance(features: list, title: str = "Selected Features"):
     """Print important features list."""
+    report_sink.emit("report", "feature_list", {"title": title, "features": [str(f) for f in features]})
+
+
+@renderer("feature_list")
+def _render_feature_list(data: dict) -> str:
+    features = data["features"]
     output = []
     output.append(f"\n{'=' * 80}")
-    output.append(title)
+    output.append(data["title"])
     output.append(f"{'=' * 80}\n")
     output.append(f"Number of features: {len(features)}\n")
     output.append("Features:")
     for i, feat in enumerate(features, 1):
         output.append(f"  {i}. {feat}")
     output.append("")
-    
-    content = "\n".join(output)
-    print(content)
+    return "\n".join(output)
+
+
+def print_train_test_split(X_train_shape, X_test_shape):
+    """Print the shapes of a train/test split."""
+    report_sink.emit("report", "train_test_split", {"train_shape": list(X_train_shape),
+                                                    "test_shape": list(X_test_shape)})
+
+
+@renderer("train_test_split")
+def _render_train_test_split(data: dict) -> str:
+    output = []
+    output.append(f"\n{'=' * 80}")
+    output.append("TRAIN-TEST SPLIT")
+    output.append(f"{'=' * 80}")
+    output.append(f"Training set shape: {tuple(data['train_shape'])}")
+    output.append(f"Test set shape: {tuple(data['test_shape'])}")
+    output.append(f"Training/Test ratio: {data['train_shape'][0]}/{data['test_shape'][0]}")
+    output.append("")
+    return "\n".join(output)
+
+
+def print_fitted_model(model):
+    """Print a fitted linear model: its parameters, coefficient shape and intercept."""
+    report_sink.emit("report", "fitted_model", {
+        "model": str(model),
+        "coef_shape": list(model.coef_.shape),
+        "intercept": np.ravel(model.intercept_).tolist(),
+    })
+
+
+@renderer("fitted_model")
+def _render_fitted_model(data: dict) -> str:
+    output = []
+    output.append(f"Model trained: {data['model']}")
+    output.append(f"Model coefficients shape: {tuple(data['coef_shape'])}")
+    output.append(f"Intercept: {np.array(data['intercept'])}")
+    output.append("")
+    return "\n".join(output)
 
 
 def print_model_training_summary(X_train_shape, X_test_shape, model_name: str, accuracy: float, cm):
     """Print model training summary."""
+    report_sink.emit("metrics", "model_training", {
+        "train_shape": list(X_train_shape),
+        "test_shape": list(X_test_shape),
+        "model": model_name,
+        "accuracy": float(accuracy),
+        "confusion_matrix": np.asarray(cm).tolist(),
+    }, file=_report_path("99_model_metrics_summary.txt"))
+
+
+@renderer("model_training")
+def _render_model_training(data: dict) -> str:
+    accuracy = data["accuracy"]
     output = []
     output.append(f"\n{'=' * 80}")
-    output.append(f"MODEL TRAINING: {model_name}")
+    output.append(f"MODEL TRAINING: {data['model']}")
     output.append(f"{'=' * 80}\n")
-    
-    output.append(f"Training set shape: {X_train_shape}")
-    output.append(f"Test set shape: {X_test_shape}")
-    output.append(f"Model: {model_name}")
+
+    output.append(f"Training set shape: {tuple(data['train_shape'])}")
+    output.append(f"Test set shape: {tuple(data['test_shape'])}")
+    output.append(f"Model: {data['model']}")
     output.append(f"Accuracy: {accuracy:.4f} ({accuracy*100:.2f}%)\n")
-    
+
     output.append("Confusion Matrix:")
-    output.append(str(cm))
+    output.append(str(np.array(data["confusion_matrix"])))
     output.append("")
-    
-    content = "\n".join(output)
-    print(content)
-    
-    # Save to file
-    filepath = os.path.join(PLOTS_DIR, "99_model_metrics_summary.txt")
-    with open(filepath, 'w') as f:
-        f.write(content)
-    logger.info(f"Model metrics saved to {filepath}")
-
-
-def print_cross_validation_summary(cv_scores: list, mean_score: float, std_score: float):
-    """Print cross-validation summary."""
+    return "\n".join(output)
+
+
+def print_model_metrics(accuracy: float, cm, cv_scores=None, filename: str = "15_model_metrics_summary.txt"):
+    """Save model performance metrics (test accuracy, confusion matrix, CV scores) to file."""
+    data = {"accuracy": float(accuracy), "confusion_matrix": np.asarray(cm).tolist(),
+            "cv_scores": None if cv_scores is None else np.asarray(cv_scores).tolist()}
+    # file only, as before: the console already shows the training and CV summaries
+    report_sink.emit("metrics", "model_metrics", data, file=_report_path(filename), console=False)
+
+
+@renderer("model_metrics")
+def _render_model_metrics(data: dict) -> str:
+    accuracy, cm = data["accuracy"], np.array(data["confusion_matrix"])
+    cv_scores = None if data["cv_scores"] is None else np.array(data["cv_scores"])
+    f = io.StringIO()
+    f.write("="*60 + "\n")
+    f.write("MODEL PERFORMANCE METRICS\n")
+    f.write("="*60 + "\n\n")
+    f.write(f"Test Accuracy: {accuracy:.4f} ({accuracy*100:.2f}%)\n\n")
+    f.write("Confusion Matrix:\n")
+    f.write(f"  True Negatives:  {cm[0,0]:6d}\n")
+    f.write(f"  False Positives: {cm[0,1]:6d}\n")
+    f.write(f"  False Negatives: {cm[1,0]:6d}\n")
+    f.write(f"  True Positives:  {cm[1,1]:6d}\n\n")
+    if cv_scores is not None and len(cv_scores) > 0:
+        f.write(f"Cross-Validation Scores ({len(cv_scores)}-fold):\n")
+        f.write(f"  Mean: {cv_scores.mean():.4f}\n")
+        f.write(f"  Std:  {cv_scores.std():.4f}\n")
+        f.write(f"  Scores: {cv_scores}\n")
+    return f.getvalue()
+
+
+def print_data_shape_info(df: pd.DataFrame, filename: str = "01_data_shape_info.txt"):
+    """Save the shape, dtypes, null counts and first rows of a frame (reuses its cached profile)."""
+    profile = get_profile(df, full=False)
+    report_sink.emit("report", "data_shape_info", {
+        "shape": list(profile.shape),
+        "dtypes": {str(k): str(v) for k, v in profile.dtypes.items()},
+        "null_counts": {str(k): int(v) for k, v in profile.null_counts.items()},
+        "head": _frame(profile.head),
+    }, file=_report_path(filename), console=False)
+
+
+@renderer("data_shape_info")
+def _render_data_shape_info(data: dict) -> str:
+    return (f"Dataset Shape: {tuple(data['shape'])}\n"
+            f"Data Types:\n{pd.Series(data['dtypes'], dtype=object)}\n\n"
+            f"Missing Values:\n{pd.Series(data['null_counts'], dtype='int64')}\n\n"
+            f"First 5 Rows:\n{_unframe(data['head'])}\n")
+
+
+def print_search_leaderboard(result, top: int = 20, filename: str = "96_hyperparameter_search.txt"):
+    """Print and save the leaderboard of a hyperparameter search (components.hyperparameter_search)."""
+    report_sink.emit("metrics", "search_leaderboard", {
+        "n_splits": result.n_splits, "workers": result.workers, "wall_seconds": result.wall_seconds,
+        "rungs": result.rungs, "leaderboard": result.leaderboard, "best": result.best, "top": top,
+    }, title="HYPERPARAMETER SEARCH LEADERBOARD", file=_report_path(filename))
+
+
+@renderer("search_leaderboard")
+def _render_search_leaderboard(data: dict) -> str:
+    leaderboard, top = data["leaderboard"], data["top"]
+    output = []
+    output.append(f"Candidates: {len(leaderboard)}, folds: {data['n_splits']}, "
+                  f"workers: {data['workers']}, wall time: {data['wall_seconds']:.2f}s\n")
+    output.append(f"{'rung':>4} {'rows':>9} {'candidates':>10} {'wall s':>8} {'cpu s':>8} {'lasso s':>8}")
+    for rung in data["rungs"]:
+        output.append(f"{rung['rung']:>4} {rung['rows']:>9,} {rung['candidates']:>10} {rung['wall_seconds']:>8.2f} "
+                      f"{rung['cpu_seconds']:>8.2f} {rung['lasso_seconds']:>8.2f}")
+    output.append("")
+    output.append(f"{'rank':>4} {'alpha':>8} {'C':>7} {'penalty':>7} {'class_weight':>12} {'rung':>4} "
+                  f"{'rows':>9} {'accuracy':>8} {'std':>7} {'fit s':>7} {'features':>8}")
+    for row in leaderboard[:top]:
+        output.append(f"{row['rank']:>4} {row['lasso_alpha']:>8g} {row['C']:>7g} {row['penalty']:>7} "
+                      f"{str(row['class_weight']):>12} {row['rung']:>4} {row['rows']:>9,} {row['score']:>8.4f} "
+                      f"{row['score_std']:>7.4f} {row['fit_seconds']:>7.2f} {row['n_selected']:>8.1f}")
+    if len(leaderboard) > top:
+        output.append(f"... {len(leaderboard) - top} more")
+    output.append("")
+    output.append(f"Selected: {data['best']}")
+    return "\n".join(output)
+
+
+def print_cross_validation_summary(cv_scores: list, mean_score: float, std_score: float,
+                                   fit_seconds: list = None, serial_seconds: float = None,
+                                   wall_seconds: float = None, workers: int = None):
+    """Print cross-validation summary, with per-fold fit times and parallel speedup when given."""
+    report_sink.emit("metrics", "cross_validation", {
+        "scores": [float(s) for s in cv_scores], "mean": float(mean_score), "std": float(std_score),
+        "fit_seconds": None if fit_seconds is None else [float(t) for t in fit_seconds],
+        "serial_seconds": serial_seconds, "wall_seconds": wall_seconds, "workers": workers,
+    })
+
+
+@renderer("cross_validation")
+def _render_cross_validation(data: dict) -> str:
+    cv_scores, mean_score, fit_seconds = data["scores"], data["mean"], data["fit_seconds"]
     output = []
     output.append(f"\n{'=' * 80}")
     output.append("CROSS-VALIDATION RESULTS")
     output.append(f"{'=' * 80}\n")
-    
+
     output.append(f"Number of folds: {len(cv_scores)}")
     output.append(f"Scores per fold: {[f'{s:.4f}' for s in cv_scores]}")
     output.append(f"Mean CV Accuracy: {mean_score:.4f} ({mean_score*100:.2f}%)")
-    output.append(f"Std Dev: {std_score:.4f}\n")
-    
-    content = "\n".join(output)
-    print(content)
+    output.append(f"Std Dev: {data['std']:.4f}\n")
+
+    if fit_seconds is not None:
+        serial = float(sum(fit_seconds)) if data["serial_seconds"] is None else data["serial_seconds"]
+        output.append(f"Fit time per fold (s): {[f'{t:.2f}' for t in fit_seconds]}")
+        output.append(f"Serial fit time (estimated): {serial:.2f}s")
+        if data["wall_seconds"]:
+            output.append(f"Wall time: {data['wall_seconds']:.2f}s with {data['workers']} worker(s)")
+            output.append(f"Speedup vs serial: {serial / data['wall_seconds']:.2f}x")
+        output.append("")
+    return "\n".join(output)
+
+
+def print_drift_report(batch: str, rows: int, scores: dict, filename: str = None):
+    """Print (and optionally save) the per-column drift of one batch (components.monitoring.drift_scores)."""
+    report_sink.emit("metrics", "data_drift", {"batch": batch, "rows": rows, "scores": scores},
+                     title=f"DATA DRIFT: {batch}", file=_report_path(filename) if filename else None)
+
+
+@renderer("data_drift")
+def _render_data_drift(data: dict) -> str:
+    scores = data["scores"]
+    output = []
+    output.append(f"Rows: {data['rows']:,}\n")
+    output.append(f"{'column':<32} {'kind':<12} {'psi':>8} {'ks':>7} {'status':<6} details")
+    order = {"alert": 0, "warn": 1, "ok": 2}
+    for col in sorted(scores, key=lambda c: (order.get(scores[c]["status"], 3), c)):
+        s = scores[col]
+        ks = f"{s['ks']:>7.4f}" if s.get("ks") is not None else f"{'-':>7}"
+        if s["kind"] == "numeric" and "batch_median" in s:
+            details = f"median {s['reference_median']:.4g} -> {s['batch_median']:.4g}"
+        elif "batch_distinct" in s:
+            details = f"distinct {s['reference_distinct']} -> {s['batch_distinct']}"
+            if s["unseen_top"]:
+                details += f", unseen {s['unseen_share']:.1%}: {', '.join(s['unseen_top'])}"
+        else:
+            details = "empty"
+        output.append(f"{col:<32} {s['kind']:<12} {s['psi']:>8.4f} {ks} {s['status']:<6} {details}")
+    flagged = [c for c in scores if scores[c]["status"] in ("warn", "alert")]
+    output.append("")
+    output.append(f"Columns drifting: {len(flagged)} of {len(scores)}")
+    return "\n".join(output)
+
+
+def print_stage_timings(summary: dict, filename: str = "98_stage_timings.txt"):
+    """Print and save the scheduler's per-stage timings (StageScheduler.timing_summary)."""
+    report_sink.emit("metrics", "stage_timings", summary, title="PIPELINE STAGE TIMINGS",
+                     file=_report_path(filename))
+
+
+@renderer("stage_timings")
+def _render_stage_timings(data: dict) -> str:
+    from pipeline.scheduler import format_timing_report
+
+    return format_timing_report(data)
@@ -0,0 +1,224 @@
+"""Bounded-size summaries of large frames for plotting (samples, histograms, box stats, correlations, missing matrix)."""
+from dataclasses import dataclass, field
+from typing import List, Optional
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_ROWS = 50_000
+
+
+@dataclass
+class Histogram:
+    counts: np.ndarray
+    edges: np.ndarray
+    n: int
+    std: float
+
+    @property
+    def centers(self) -> np.ndarray:
+        return (self.edges[:-1] + self.edges[1:]) / 2
+
+    def density(self) -> np.ndarray:
+        """Gaussian-smoothed histogram (a binned KDE), normalised to integrate to 1."""
+        width = self.edges[1] - self.edges[0]
+        if self.n == 0 or width <= 0:
+            return np.zeros_like(self.counts, dtype=np.float64)
+        # Silverman's rule of thumb, expressed in bins
+        bandwidth = 1.06 * self.std * self.n ** (-1 / 5) if self.std > 0 else width
+        sigma = max(bandwidth / width, 0.5)
+        radius = int(np.ceil(4 * sigma))
+        offsets = np.arange(-radius, radius + 1)
+        kernel = np.exp(-0.5 * (offsets / sigma) ** 2)
+        kernel /= kernel.sum()
+        smoothed = np.convolve(self.counts.astype(np.float64), kernel, mode='same')
+        return smoothed / (self.n * width)
+
+
+@dataclass
+class BoxStats:
+    """Per-group box statistics in the format matplotlib's Axes.bxp expects."""
+    groups: List[str]
+    hues: List[str]
+    stats: List[dict] = field(default_factory=list)
+
+
+@dataclass
+class MissingMatrix:
+    fractions: np.ndarray  # (row bins, columns), share of missing cells
+    columns: List[str]
+    rows_per_bin: int
+
+
+def _values(series: pd.Series) -> np.ndarray:
+    return series.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _group_order(series: pd.Series) -> list:
+    """Category order for categoricals, order of first appearance otherwise (as seaborn does)."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        present = set(series.cat.codes.unique())
+        return [c for i, c in enumerate(series.cat.categories) if i in present]
+    return list(pd.unique(series.dropna()))
+
+
+def _group_runs(codes: np.ndarray):
+    """Row positions sorted by group code, and each group's start and size in that order."""
+    order = np.argsort(codes.astype(np.min_scalar_type(max(int(codes.max()), 0))), kind='stable')
+    sizes = np.bincount(codes)
+    starts = np.r_[0, np.cumsum(sizes)[:-1]]
+    return order, starts, sizes
+
+
+def _sample_runs(order: np.ndarray, starts: np.ndarray, sizes: np.ndarray, quota: np.ndarray,
+                 rng: np.random.Generator) -> np.ndarray:
+    """Sorted positions of `quota[g]` rows drawn without replacement from each group g."""
+    picked = [order[start + rng.choice(size, take, replace=False)] if take < size else order[start:start + size]
+              for start, size, take in zip(starts, sizes, quota) if take > 0]
+    return np.sort(np.concatenate(picked)) if picked else np.zeros(0, dtype=np.int64)
+
+
+def stratified_sample(df: pd.DataFrame, by: Optional[str], max_rows: int = DEFAULT_MAX_ROWS,
+                      seed: int = 42) -> pd.DataFrame:
+    """At most `max_rows` rows, sampled proportionally within each `by` group (at least one per group)."""
+    if len(df) <= max_rows:
+        return df
+    rng = np.random.default_rng(seed)
+    if by is None:
+        return df.iloc[np.sort(rng.choice(len(df), max_rows, replace=False))]
+    codes = pd.factorize(df[by], use_na_sentinel=False)[0]
+    order, starts, sizes = _group_runs(codes)
+    quota = np.maximum(1, np.floor(sizes * max_rows / len(df))).astype(np.int64)
+    return df.iloc[_sample_runs(order, starts, sizes, quota, rng)]
+
+
+def histogram(series: pd.Series, bins: int = 50, value_range: Optional[tuple] = None) -> Histogram:
+    """Exact binned counts of the non-null values."""
+    values = _values(series)
+    values = values[~np.isnan(values)]
+    if value_range is None:
+        value_range = (values.min(), values.max()) if len(values) else (0.0, 1.0)
+        if value_range[0] == value_range[1]:
+            value_range = (value_range[0] - 0.5, value_range[1] + 0.5)
+    counts, edges = np.histogram(values, bins=bins, range=value_range)
+    std = float(values.std()) if len(values) > 1 else 0.0
+    return Histogram(counts=counts, edges=edges, n=int(len(values)), std=std)
+
+
+def grouped_histograms(df: pd.DataFrame, value: str, by: str, bins: int = 200,
+                       value_range: Optional[tuple] = None, max_rows: Optional[int] = DEFAULT_MAX_ROWS,
+                       seed: int = 42) -> dict:
+    """
+    One histogram per group, on shared bin edges, for density plots.
+
+    The histograms are built from a stratified sample of at most `max_rows`
+    rows (None: every row), which keeps each group's distribution.
+    """
+    data = df[[by, value]]
+    if max_rows is not None:
+        data = stratified_sample(data, by, max_rows=max_rows, seed=seed)
+    if value_range is None:
+        values = _values(data[value])
+        value_range = (np.nanmin(values), np.nanmax(values))
+    return {key: histogram(data.loc[data[by] == key, value], bins=bins, value_range=value_range)
+            for key in _group_order(data[by])}
+
+
+def box_stats(df: pd.DataFrame, value: str, by: str, hue: Optional[str] = None,
+              max_fliers: int = 200, max_rows: Optional[int] = DEFAULT_MAX_ROWS, seed: int = 42) -> BoxStats:
+    """
+    Quartiles, 1.5 IQR whiskers and a bounded sample of fliers per (by, hue) group.
+
+    The statistics are computed on a sample of at most `max_rows` rows,
+    stratified by `by` (None: every row).
+    """
+    keys = [by] + ([hue] if hue else [])
+    # rows with a missing value or group key are not drawn (as seaborn drops them)
+    data = df[keys + [value]].dropna()
+    if max_rows is not None:
+        data = stratified_sample(data, by, max_rows=max_rows, seed=seed)
+    grouped = data.groupby(keys, observed=True)
+    quart = grouped[value].quantile([0.25, 0.5, 0.75]).unstack()
+    quart.columns = ['q1', 'med', 'q3']
+    q1, q3 = quart['q1'].to_numpy(), quart['q3'].to_numpy()
+    lo_fence, hi_fence = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+
+    # rows as group numbers (in quart's order), so fences are looked up, not reindexed
+    codes = grouped.ngroup().to_numpy(dtype=np.int64)
+    vals = data[value].to_numpy(dtype=np.float64)
+    inside = (vals >= lo_fence[codes]) & (vals <= hi_fence[codes])
+    inner = pd.Series(vals[inside]).groupby(codes[inside]).agg(['min', 'max'])
+    whislo = inner['min'].reindex(range(len(quart))).fillna(quart['q1'].reset_index(drop=True)).to_numpy()
+    whishi = inner['max'].reindex(range(len(quart))).fillna(quart['q3'].reset_index(drop=True)).to_numpy()
+
+    # at most max_fliers per group, drawn from the rows outside the fences
+    outside = np.flatnonzero(~inside)
+    fliers = {}
+    if len(outside):
+        out_codes = codes[outside]
+        order, starts, sizes = _group_runs(out_codes)
+        picked = outside[_sample_runs(order, starts, sizes, np.minimum(sizes, max_fliers),
+                                      np.random.default_rng(seed))]
+        fliers = dict(tuple(pd.Series(vals[picked]).groupby(codes[picked])))
+
+    position = {key: i for i, key in enumerate(quart.index)}
+    groups = _group_order(df[by])
+    hues = _group_order(df[hue]) if hue else [None]
+    result = BoxStats(groups=[str(g) for g in groups], hues=[str(h) for h in hues if h is not None])
+    for g in groups:
+        for h in hues:
+            i = position.get((g, h) if hue else g)
+            if i is None:
+                result.stats.append(None)
+                continue
+            result.stats.append({
+                'med': quart['med'].iat[i], 'q1': q1[i], 'q3': q3[i],
+                'whislo': whislo[i], 'whishi': whishi[i],
+                'fliers': fliers[i].to_numpy() if i in fliers else np.zeros(0),
+                'label': str(g),
+            })
+    return result
+
+
+def grouped_mean_ci(df: pd.DataFrame, value: str, by: str, hue: str) -> pd.DataFrame:
+    """Mean and normal-approximation 95% CI half-width per (by, hue), ordered like seaborn."""
+    agg = df.groupby([by, hue], observed=True)[value].agg(['mean', 'std', 'count'])
+    agg['ci'] = 1.96 * agg['std'] / np.sqrt(agg['count'])
+    agg = agg.reset_index()
+    position = {key: i for i, key in enumerate(_group_order(df[by]))}
+    agg['_order'] = agg[by].map(position).astype(int)
+    return agg.sort_values(['_order', hue]).drop(columns='_order').reset_index(drop=True)
+
+
+def correlation(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pearson correlation matrix of `df`'s columns, as `df.corr()` gives it.
+
+    Computed with NumPy in one pass when there are no missing values;
+    pandas' pairwise-complete version is used otherwise.
+    """
+    values = df.to_numpy(dtype=np.float64, na_value=np.nan)
+    if np.isnan(values).any():
+        return df.corr()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = np.corrcoef(values, rowvar=False)
+    return pd.DataFrame(np.atleast_2d(corr), index=df.columns, columns=df.columns)
+
+
+def missing_matrix(df: pd.DataFrame, n_bins: int = 200, chunk_rows: int = 1_000_000) -> MissingMatrix:
+    """Share of missing cells per (row bin, column), computed chunk by chunk."""
+    n_rows = len(df)
+    if n_rows == 0:
+        return MissingMatrix(fractions=np.zeros((1, df.shape[1])), columns=list(df.columns), rows_per_bin=1)
+    rows_per_bin = max(1, int(np.ceil(n_rows / n_bins)))
+    n_bins = max(1, int(np.ceil(n_rows / rows_per_bin)))
+    sums = np.zeros((n_bins, df.shape[1]), dtype=np.int64)
+    # chunks start on bin boundaries, so each chunk's whole bins are one reshaped sum
+    chunk_rows = max(1, chunk_rows // rows_per_bin) * rows_per_bin
+    for start in range(0, n_rows, chunk_rows):
+        block = df.iloc[start:start + chunk_rows].isna().to_numpy()
+        first, whole = start // rows_per_bin, len(block) // rows_per_bin
+        sums[first:first + whole] = block[:whole * rows_per_bin].reshape(whole, rows_per_bin, -1).sum(axis=1)
+        if len(block) > whole * rows_per_bin:
+            sums[first + whole] = block[whole * rows_per_bin:].sum(axis=0)
+    counts = np.minimum(rows_per_bin, n_rows - np.arange(n_bins) * rows_per_bin)
+    return MissingMatrix(fractions=sums / counts[:, None], columns=list(df.columns), rows_per_bin=rows_per_bin)
@@ -1,41 +1,85 @@
 import numpy as np
 import pandas as pd
 from logger.log_config import get_logger
+from utils.instrumentation import instrument
 from exception.custom_exception import CustomException
 
 logger = get_logger("preprocessing")
 
 
-def basic_cleaning(df: pd.DataFrame) -> pd.DataFrame:
+def copy_on_write_enabled() -> bool:
+    """Whether pandas copy-on-write is in effect."""
     try:
-        # drop agent and company as in notebook
-        df = df.copy()
+        return pd.get_option("mode.copy_on_write") is True
+    except (KeyError, pd.errors.OptionError):
+        # option not available: either too old (no CoW) or CoW is always on
+        return int(pd.__version__.split(".")[0]) >= 3
+
+
+def enable_copy_on_write() -> bool:
+    """
+    Turn on pandas copy-on-write for the rest of the process (pandas >= 1.5).
+
+    The option is process-global, so it is set once at startup, before any
+    stage thread runs (pipeline.run with `low_memory`), never around a call.
+    Returns whether copy-on-write is in effect.
+    """
+    try:
+        pd.set_option("mode.copy_on_write", True)
+    except (KeyError, pd.errors.OptionError):
+        pass
+    return copy_on_write_enabled()
+
+
+@instrument()
+def basic_cleaning(df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
+    try:
+        # drop agent and company as in notebook (drop returns a new frame,
+        # so no extra defensive copy is needed)
         if 'agent' in df.columns and 'company' in df.columns:
-            df.drop(['agent', 'company'], axis=1, inplace=True)
+            if copy:
+                df = df.drop(columns=['agent', 'company'])
+            else:
+                df.drop(columns=['agent', 'company'], inplace=True)
+        elif copy:
+            df = df.copy()
 
         # fill country with mode
         if 'country' in df.columns:
-            df['country'].fillna(df['country'].mode().iloc[0], inplace=True)
+            df['country'] = df['country'].fillna(df['country'].mode().iloc[0])
 
-        # replace remaining nulls with 0 (as notebook did)
-        df.fillna(0, inplace=True)
+        # replace remaining nulls with 0 (as notebook did); only columns that
+        # actually contain nulls are touched
+        null_cols = df.columns[df.isna().any().to_numpy()]
+        for col in null_cols:
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].cat.add_categories([0]).fillna(0)
+            else:
+                df[col] = df[col].fillna(0)
 
         # remove rows where adults, children and babies are all zero
         if set(['adults', 'children', 'babies']).issubset(df.columns):
-            filt = (df['adults'] == 0) & (df['children'] == 0) & (df['babies'] == 0)
-            df = df[~filt]
+            guests = df[['adults', 'children', 'babies']].to_numpy()
+            keep = (guests != 0).any(axis=1)
+            if not keep.all():
+                df = df[keep]
 
         return df
     except Exception as e:
         raise CustomException("Error in basic_cleaning", e)
 
 
-def feature_engineering(df: pd.DataFrame) -> pd.DataFrame:
+@instrument()
+def feature_engineering(df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
     try:
-        df = df.copy()
+        if copy:
+            df = df.copy()
         # family feature
         if set(['adults', 'children', 'babies']).issubset(df.columns):
-            df['is_family'] = df.apply(lambda r: 1 if (r['adults'] > 0 and (r['children'] > 0 or r['babies'] > 0)) else 0, axis=1)
+            adults = df['adults'].to_numpy()
+            children = df['children'].to_numpy()
+            babies = df['babies'].to_numpy()
+            df['is_family'] = ((adults > 0) & ((children > 0) | (babies > 0))).astype(np.int64)
             df['total_customer'] = df['adults'] + df['children'] + df['babies']
             df['total_nights'] = df.get('stays_in_week_nights', 0) + df.get('stays_in_weekend_nights', 0)
 
@@ -54,32 +98,58 @@ def feature_engineering(df: pd.DataFrame) -> pd.DataFrame:
         raise CustomException("Error in feature_engineering", e)
 
 
-def mean_encode_categoricals(df: pd.DataFrame, target: str = 'is_canceled') -> pd.DataFrame:
+def is_categorical_column(series: pd.Series) -> bool:
+    """True for string-like columns: object, pandas string or category dtype."""
+    dtype = series.dtype
+    return (isinstance(dtype, pd.CategoricalDtype)
+            or pd.api.types.is_object_dtype(dtype)
+            or pd.api.types.is_string_dtype(dtype))
+
+
+def _category_means(series: pd.Series, y: np.ndarray) -> np.ndarray:
+    """Target mean per row of a categorical column, computed on the category codes."""
+    codes = series.cat.codes.to_numpy()
+    valid = codes >= 0
+    n_cat = len(series.cat.categories)
+    sums = np.bincount(codes[valid], weights=y[valid], minlength=n_cat)
+    counts = np.bincount(codes[valid], minlength=n_cat)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / counts
+    return np.where(valid, means[codes], np.nan)
+
+
+@instrument()
+def mean_encode_categoricals(df: pd.DataFrame, target: str = 'is_canceled', copy: bool = True) -> pd.DataFrame:
     try:
-        df = df.copy()
+        if copy:
+            df = df.copy()
         # select categorical columns
-        cat_cols = [c for c in df.columns if df[c].dtype == 'object']
+        cat_cols = [c for c in df.columns if is_categorical_column(df[c])]
         if target in df.columns:
-            df_cat = df[cat_cols].copy()
-            df_cat[target] = df[target]
+            y = df[target]
             for col in cat_cols:
-                enc = df_cat.groupby(col)[target].mean().to_dict()
-                df[col] = df[col].map(enc)
+                if isinstance(df[col].dtype, pd.CategoricalDtype):
+                    df[col] = _category_means(df[col], y.to_numpy(dtype=np.float64))
+                else:
+                    enc = y.groupby(df[col]).mean().to_dict()
+                    df[col] = df[col].map(enc)
         return df
     except Exception as e:
         raise CustomException("Error in mean_encode_categoricals", e)
 
 
-def handle_outliers_log_transform(df: pd.DataFrame, cols=None) -> pd.DataFrame:
+@instrument()
+def handle_outliers_log_transform(df: pd.DataFrame, cols=None, copy: bool = True) -> pd.DataFrame:
     try:
-        df = df.copy()
+        if copy:
+            df = df.copy()
         if cols is None:
             cols = ['lead_time', 'adr']
         for col in cols:
             if col not in df.columns:
                 continue
             # for adr, ensure non-negative before log
-            series = df[col].copy()
+            series = df[col].astype(np.float64)
             min_val = series.min()
             if pd.isnull(min_val):
                 continue
@@ -94,9 +164,11 @@ def handle_outliers_log_transform(df: pd.DataFrame, cols=None) -> pd.DataFrame:
         raise CustomException("Error in handle_outliers_log_transform", e)
 
 
-def select_and_drop_features(df: pd.DataFrame) -> pd.DataFrame:
+@instrument()
+def select_and_drop_features(df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
     try:
-        df = df.copy()
+        if copy:
+            df = df.copy()
         features_to_drop = ['reservation_status', 'reservation_status_date', 'arrival_date_year',
                             'arrival_date_week_number', 'stays_in_weekend_nights', 'arrival_date_day_of_month']
         to_drop = [c for c in features_to_drop if c in df.columns]
@@ -107,46 +179,85 @@ def select_and_drop_features(df: pd.DataFrame) -> pd.DataFrame:
         raise CustomException("Error in select_and_drop_features", e)
 
 
-def preprocess_pipeline(df: pd.DataFrame, generate_plots: bool = True) -> pd.DataFrame:
+@instrument()
+def preprocess_pipeline(df: pd.DataFrame, generate_plots: bool = True, low_memory: bool = False) -> pd.DataFrame:
     """
     Execute the full preprocessing pipeline with logging.
+
+    This is `BookingPreprocessor.fit` followed by `training_frame`, so the
+    frame a model trains on is built by the same transform that scores new
+    bookings.
     
     Args:
         df: Input dataframe
         generate_plots: Whether to generate EDA plots during preprocessing
+        low_memory: Run the stages without defensive copies. Stages work on a
+            copy-on-write view of `df`, so only the columns they modify are
+            materialised and the caller's frame is left untouched. Needs
+            copy-on-write enabled at startup (`enable_copy_on_write`).
     
     Returns:
         Preprocessed dataframe
     """
-    from components.output_reports import print_dataframe_info, print_data_cleaning_summary
-    
-    # Log initial state
-    print_dataframe_info(df.copy(), stage="00 - Initial Data")
-    
-    df_before = df.copy()
-    df = basic_cleaning(df)
-    print_data_cleaning_summary(df_before, df, "After Basic Cleaning")
-    
-    df_before = df.copy()
-    df = feature_engineering(df)
-    print_data_cleaning_summary(df_before, df, "After Feature Engineering")
-    
-    df_before = df.copy()
-    df = mean_encode_categoricals(df)
-    print_data_cleaning_summary(df_before, df, "After Mean Encoding")
-    
-    df_before = df.copy()
-    df = handle_outliers_log_transform(df)
-    print_data_cleaning_summary(df_before, df, "After Outlier Handling")
-    
-    df_before = df.copy()
-    df = select_and_drop_features(df)
-    # drop remaining na
-    df.dropna(inplace=True)
-    print_data_cleaning_summary(df_before, df, "After Feature Selection & Null Removal")
+    from components.preprocessor import BookingPreprocessor
+
+    return BookingPreprocessor().fit(df, low_memory=low_memory, report=True).training_frame(df)
+
+
+STAGES = [
+    (basic_cleaning, "After Basic Cleaning"),
+    (feature_engineering, "After Feature Engineering"),
+    (mean_encode_categoricals, "After Mean Encoding"),
+    (handle_outliers_log_transform, "After Outlier Handling"),
+    (select_and_drop_features, "After Feature Selection & Null Removal"),
+]
+
+
+def run_stages(df: pd.DataFrame, low_memory: bool = False, report: bool = True, after_stage=None) -> pd.DataFrame:
+    """
+    Run the preprocessing stages on `df`, printing a summary after each one when `report` is set.
+
+    `after_stage(stage, frame)` is called with each stage function and its
+    output (BookingPreprocessor.fit records its statistics this way).
+    `low_memory` drops the defensive copies only when copy-on-write is on
+    (see enable_copy_on_write); without it the stages would write into
+    the caller's frame.
+    """
+    if low_memory and not copy_on_write_enabled():
+        logger.warning("low_memory needs pandas copy-on-write enabled at startup; preprocessing with copies")
+        low_memory = False
+    return _run_stages(df, copy=not low_memory, report=report, after_stage=after_stage)
+
+
+def _run_stages(df: pd.DataFrame, copy: bool, report: bool, after_stage) -> pd.DataFrame:
+    from components.output_reports import print_dataframe_info, print_data_cleaning_summary, frame_summary
+    from components.data_profile import get_profile, get_report_level
+
+    reporting = report and get_report_level() != "off"
+
+    # Log initial state (reuses the ingestion profile when df is the loaded frame)
+    if report:
+        print_dataframe_info(df, stage="00 - Initial Data")
+    before = get_profile(df, full=False).summary() if reporting else None
+    if not copy:
+        # stages mutate this copy-on-write view, never the caller's frame
+        df = df.copy(deep=False)
+
+    for stage, label in STAGES:
+        df = stage(df, copy=copy)
+        if stage is select_and_drop_features:
+            # drop remaining na
+            df.dropna(inplace=True)
+        if after_stage is not None:
+            after_stage(stage, df)
+        if reporting:
+            # each stage's "after" summary is the next stage's "before"
+            after = frame_summary(df)
+            print_data_cleaning_summary(before, after, label)
+            before = after
     
     # Log final state
-    print_dataframe_info(df.copy(), stage="Final Preprocessed Data")
+    if report:
+        print_dataframe_info(df, stage="Final Preprocessed Data")
     
     return df
-
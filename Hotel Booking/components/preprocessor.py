@@ -0,0 +1,187 @@
+"""Fitted preprocessing: learn encodings/fills/shifts once, apply them to new bookings."""
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from components.native_scoring import DEPOSIT_MAPPING
+from components.preprocessing import feature_engineering, is_categorical_column, mean_encode_categoricals, run_stages
+from logger.log_config import get_logger
+from exception.custom_exception import CustomException
+
+logger = get_logger("preprocessor")
+
+LOG_COLUMNS = ['lead_time', 'adr']
+
+
+def has_guests(df: pd.DataFrame) -> np.ndarray:
+    """Rows kept by `basic_cleaning`: at least one adult, child or baby."""
+    keep = np.zeros(len(df), dtype=bool)
+    for col in ['adults', 'children', 'babies']:
+        if col not in df.columns:
+            return np.ones(len(df), dtype=bool)
+        keep |= np.nan_to_num(df[col].to_numpy(dtype=np.float64, na_value=np.nan), nan=0.0) != 0
+    return keep
+
+
+class BookingPreprocessor:
+    """
+    The preprocessing pipeline as a fitted transform.
+
+    `fit` runs the preprocessing stages (components.preprocessing) once on the
+    training frame and records what they derive from the data: the country
+    fill value, the per-category target means, the log-shift per column and
+    the output column order. Trainer adds the Lasso-selected columns via
+    `selected_features`. `transform` then builds only the requested columns
+    from raw bookings in one columnar pass, so scoring never recomputes
+    statistics from the frame it is given; `training_frame` is the same
+    transform applied to the rows the model trains on.
+    """
+
+    def __init__(self, target: str = 'is_canceled'):
+        self.target = target
+        self.country_fill: Optional[str] = None
+        self.encodings: Dict[str, Dict] = {}
+        self.prior: float = 0.0
+        self.log_shifts: Dict[str, float] = {}
+        self.log_floors: Dict[str, float] = {}
+        self.feature_columns: List[str] = []
+        self.selected_features: Optional[List[str]] = None
+
+    @property
+    def output_columns(self) -> List[str]:
+        return list(self.selected_features) if self.selected_features is not None else list(self.feature_columns)
+
+    def fit(self, df: pd.DataFrame, low_memory: bool = False, report: bool = False) -> "BookingPreprocessor":
+        """
+        Learn the preprocessing statistics of `df` in one run of the stages.
+
+        `low_memory` and `report` are passed to preprocessing.run_stages
+        (no defensive copies when copy-on-write is enabled; per-stage data
+        reports).
+        """
+        try:
+            if 'country' in df.columns and df['country'].notna().any():
+                self.country_fill = df['country'].mode().iloc[0]
+
+            def record(stage, data):
+                if stage is feature_engineering:
+                    y = data[self.target].astype(np.float64)
+                    self.prior = float(y.mean())
+                    self.encodings = {}
+                    for col in data.columns:
+                        if col != self.target and is_categorical_column(data[col]):
+                            means = y.groupby(data[col], observed=True).mean()
+                            self.encodings[col] = {k: float(v) for k, v in means.items()}
+                elif stage is mean_encode_categoricals:
+                    self.log_shifts, self.log_floors = {}, {}
+                    for col in LOG_COLUMNS:
+                        if col in data.columns:
+                            min_val = data[col].min()
+                            if pd.isnull(min_val):
+                                continue
+                            self.log_floors[col] = float(min_val)
+                            self.log_shifts[col] = float(abs(min_val) + 1) if min_val <= -1 else 0.0
+
+            data = run_stages(df, low_memory=low_memory, report=report, after_stage=record)
+            self.feature_columns = [c for c in data.columns if c != self.target]
+            logger.info(f"Fitted preprocessor: {len(self.encodings)} encoded columns, "
+                        f"{len(self.feature_columns)} output features")
+            return self
+        except Exception as e:
+            raise CustomException("Error fitting preprocessor", e)
+
+    def _encode(self, series: pd.Series, col: str) -> np.ndarray:
+        enc = self.encodings[col]
+        null_key = self.country_fill if col == 'country' else 0
+        null_value = enc.get(null_key, self.prior)
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            lookup = np.array([enc.get(c, self.prior) for c in series.cat.categories] + [null_value])
+            codes = series.cat.codes.to_numpy()
+            return lookup[np.where(codes < 0, len(lookup) - 1, codes)]
+        values = series.map(enc).to_numpy(dtype=np.float64, na_value=np.nan)
+        values[series.isna().to_numpy()] = null_value
+        return np.where(np.isnan(values), self.prior, values)
+
+    @staticmethod
+    def _numeric(df: pd.DataFrame, col: str) -> np.ndarray:
+        if col not in df.columns:
+            return np.zeros(len(df))
+        return np.nan_to_num(df[col].to_numpy(dtype=np.float64, na_value=np.nan), nan=0.0)
+
+    def _column(self, df: pd.DataFrame, col: str) -> np.ndarray:
+        if col in self.encodings:
+            return self._encode(df[col], col)
+        if col == 'is_family':
+            adults = self._numeric(df, 'adults')
+            return ((adults > 0) & ((self._numeric(df, 'children') > 0) | (self._numeric(df, 'babies') > 0))).astype(np.float64)
+        if col == 'total_customer':
+            return self._numeric(df, 'adults') + self._numeric(df, 'children') + self._numeric(df, 'babies')
+        if col == 'total_nights':
+            return self._numeric(df, 'stays_in_week_nights') + self._numeric(df, 'stays_in_weekend_nights')
+        if col == 'deposit_given':
+            if 'deposit_type' not in df.columns:
+                return np.zeros(len(df))
+            mapped = df['deposit_type'].map(DEPOSIT_MAPPING)
+            return np.nan_to_num(mapped.to_numpy(dtype=np.float64, na_value=np.nan), nan=0.0)
+        values = self._numeric(df, col)
+        if col in self.log_shifts:
+            values = np.log1p(np.maximum(values, self.log_floors[col]) + self.log_shifts[col])
+        return values
+
+    def transform_array(self, df: pd.DataFrame) -> np.ndarray:
+        """Feature matrix (rows x output_columns, float64) for raw bookings, one row per input row."""
+        try:
+            columns = self.output_columns
+            out = np.empty((len(df), len(columns)), dtype=np.float64)
+            for j, col in enumerate(columns):
+                out[:, j] = self._column(df, col)
+            return out
+        except Exception as e:
+            raise CustomException("Error transforming bookings", e)
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Same as `transform_array`, as a DataFrame indexed like `df`."""
+        return pd.DataFrame(self.transform_array(df), index=df.index, columns=self.output_columns)
+
+    def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        return self.fit(df).transform(df)
+
+    def training_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """The rows the model trains on (bookings with guests), transformed, with the target column last."""
+        rows = df[has_guests(df)]
+        out = self.transform(rows)
+        out[self.target] = rows[self.target].to_numpy()
+        return out
+
+    def to_dict(self) -> dict:
+        """Plain-JSON form of the fitted state; encodings are [key, value] pairs so non-string keys survive."""
+        return {
+            "target": self.target,
+            "country_fill": self.country_fill,
+            "encodings": {col: [[_json_key(k), v] for k, v in enc.items()] for col, enc in self.encodings.items()},
+            "prior": self.prior,
+            "log_shifts": self.log_shifts,
+            "log_floors": self.log_floors,
+            "feature_columns": self.feature_columns,
+            "selected_features": self.selected_features,
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "BookingPreprocessor":
+        pre = cls(state["target"])
+        pre.country_fill = state["country_fill"]
+        pre.encodings = {col: {k: float(v) for k, v in pairs} for col, pairs in state["encodings"].items()}
+        pre.prior = float(state["prior"])
+        pre.log_shifts = {k: float(v) for k, v in state["log_shifts"].items()}
+        pre.log_floors = {k: float(v) for k, v in state["log_floors"].items()}
+        pre.feature_columns = list(state["feature_columns"])
+        pre.selected_features = state["selected_features"]
+        return pre
+
+
+def _json_key(key):
+    """Category keys as JSON scalars (numpy scalars become Python numbers, timestamps strings)."""
+    if isinstance(key, np.generic):
+        return key.item()
+    if isinstance(key, (str, int, float, bool)) or key is None:
+        return key
+    return str(key)
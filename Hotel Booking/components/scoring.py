@@ -0,0 +1,149 @@
+"""Batch scoring of booking files with the persisted model and preprocessor."""
+import io
+import itertools
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from utils.helpers import list_inputs, load_model
+from utils.model_registry import ModelRegistry, has_native_export, load_native
+from logger.log_config import get_logger
+from exception.custom_exception import CustomException
+
+logger = get_logger("scoring")
+
+OUTPUT_COLUMNS = ['source', 'row', 'cancel_probability', 'predicted_is_canceled']
+
+
+class Scorer:
+    """Logistic scoring as a single matrix-vector product over preprocessed features."""
+
+    def __init__(self, preprocessor, coef: np.ndarray, intercept: float, threshold: float = 0.5):
+        self.preprocessor = preprocessor
+        self.coef = np.asarray(coef, dtype=np.float64).ravel()
+        self.intercept = float(intercept)
+        self.threshold = threshold
+        n_features = len(preprocessor.output_columns)
+        if n_features != len(self.coef):
+            raise ValueError(f"Preprocessor produces {n_features} features but model expects {len(self.coef)}")
+
+    @classmethod
+    def from_model_dir(cls, model_dir: str, model_name: str = "logistic_model.joblib",
+                       preprocessor_name: str = "preprocessor.joblib") -> "Scorer":
+        """Scorer for a model directory; registry versions are loaded from their native export (no unpickling)."""
+        if has_native_export(model_dir):
+            return cls(*load_native(model_dir))
+        model = load_model(os.path.join(model_dir, model_name))
+        preprocessor = load_model(os.path.join(model_dir, preprocessor_name))
+        return cls(preprocessor, model.coef_, model.intercept_[0])
+
+    @classmethod
+    def from_registry(cls, registry_dir: str, version: Optional[str] = None) -> "Scorer":
+        """Scorer for a registered model version (the current one by default)."""
+        return cls.from_model_dir(ModelRegistry(registry_dir).version_dir(version))
+
+    def predict_proba(self, df: pd.DataFrame) -> np.ndarray:
+        """Cancellation probability per booking."""
+        X = self.preprocessor.transform_array(df)
+        z = X @ self.coef + self.intercept
+        return 1.0 / (1.0 + np.exp(-z))
+
+    def score_frame(self, df: pd.DataFrame, source: str = "") -> pd.DataFrame:
+        proba = self.predict_proba(df)
+        return pd.DataFrame({
+            'source': source,
+            'row': df.index.to_numpy(),
+            'cancel_probability': proba,
+            'predicted_is_canceled': (proba >= self.threshold).astype(np.int8),
+        })
+
+
+def iter_raw_chunks(path: str, chunk_rows: int) -> Iterator[Tuple[bytes, bytes, int]]:
+    """
+    Yield (header, body, first_row) with `chunk_rows` raw CSV lines per body.
+
+    Only line splitting happens here; parsing is left to the worker. Assumes no
+    quoted newlines inside fields, which holds for the bookings exports.
+    """
+    with open(path, 'rb') as f:
+        header = f.readline()
+        first_row = 0
+        while True:
+            lines = list(itertools.islice(f, chunk_rows))
+            if not lines:
+                break
+            yield header, b''.join(lines), first_row
+            first_row += len(lines)
+
+
+_worker_scorer: Optional[Scorer] = None
+
+
+def _init_worker(model_dir: str, model_name: str, preprocessor_name: str) -> None:
+    global _worker_scorer
+    _worker_scorer = Scorer.from_model_dir(model_dir, model_name, preprocessor_name)
+
+
+def _score_raw_chunk(header: bytes, body: bytes, first_row: int, source: str) -> Tuple[bytes, int]:
+    df = pd.read_csv(io.BytesIO(header + body))
+    df.index = pd.RangeIndex(first_row, first_row + len(df))
+    scored = _worker_scorer.score_frame(df, source)
+    out = io.StringIO()
+    scored.to_csv(out, header=False, index=False, float_format='%.6f')
+    return out.getvalue().encode(), len(df)
+
+
+def score_files(input_path: str, output_path: str, model_dir: str, chunk_rows: int = 100_000,
+                workers: int = 1, model_name: str = "logistic_model.joblib",
+                preprocessor_name: str = "preprocessor.joblib") -> dict:
+    """
+    Stream `input_path` (file or directory of CSVs) through the scorer into `output_path`.
+
+    At most 2 * workers chunks are in flight, so memory stays bounded by the
+    chunk size regardless of input size. Results are written in input order.
+    """
+    try:
+        inputs = list_inputs(input_path)
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        init_args = (model_dir, model_name, preprocessor_name)
+        start = time.perf_counter()
+        total_rows = 0
+
+        with open(output_path, 'wb') as out:
+            out.write((",".join(OUTPUT_COLUMNS) + "\n").encode())
+            tasks = ((header, body, first_row, os.path.basename(path))
+                     for path in inputs
+                     for header, body, first_row in iter_raw_chunks(path, chunk_rows))
+
+            if workers <= 1:
+                _init_worker(*init_args)
+                for task in tasks:
+                    data, n = _score_raw_chunk(*task)
+                    out.write(data)
+                    total_rows += n
+            else:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=init_args) as pool:
+                    pending = deque()
+                    for task in tasks:
+                        pending.append(pool.submit(_score_raw_chunk, *task))
+                        if len(pending) >= 2 * workers:
+                            data, n = pending.popleft().result()
+                            out.write(data)
+                            total_rows += n
+                    while pending:
+                        data, n = pending.popleft().result()
+                        out.write(data)
+                        total_rows += n
+
+        elapsed = time.perf_counter() - start
+        rate = total_rows / elapsed if elapsed > 0 else float('inf')
+        logger.info(f"Scored {total_rows} rows from {len(inputs)} file(s) in {elapsed:.2f}s "
+                    f"({rate:,.0f} rows/sec, workers={workers}) -> {output_path}")
+        return {"rows": total_rows, "files": len(inputs), "seconds": elapsed, "rows_per_sec": rate}
+    except Exception as e:
+        raise CustomException("Error during batch scoring", e)
@@ -0,0 +1,268 @@
+"""Local asyncio HTTP service that scores bookings with micro-batching."""
+import asyncio
+import json
+import time
+from collections import deque
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+from components.scoring import Scorer
+from constants.schema import NUMERIC_DTYPES
+from logger.log_config import get_logger
+from exception.custom_exception import CustomException
+
+logger = get_logger("scoring_service")
+
+MAX_BODY_BYTES = 64 * 2 ** 20
+
+
+class ServiceStats:
+    """Request latency percentiles and throughput counters."""
+
+    def __init__(self, window: int = 10_000):
+        self.latencies_ms = deque(maxlen=window)
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self.batched_rows = 0
+        self.errors = 0
+
+    def record_request(self, latency_ms: float, rows: int) -> None:
+        self.latencies_ms.append(latency_ms)
+        self.requests += 1
+        self.rows += rows
+
+    def record_batch(self, rows: int) -> None:
+        self.batches += 1
+        self.batched_rows += rows
+
+    def snapshot(self) -> dict:
+        uptime = time.perf_counter() - self.started
+        latencies = np.asarray(self.latencies_ms) if self.latencies_ms else np.zeros(1)
+        return {
+            "uptime_seconds": round(uptime, 3),
+            "requests": self.requests,
+            "rows": self.rows,
+            "errors": self.errors,
+            "batches": self.batches,
+            "mean_batch_rows": round(self.batched_rows / self.batches, 2) if self.batches else 0.0,
+            "latency_ms_p50": round(float(np.percentile(latencies, 50)), 3),
+            "latency_ms_p99": round(float(np.percentile(latencies, 99)), 3),
+            "requests_per_sec": round(self.requests / uptime, 2) if uptime > 0 else 0.0,
+            "rows_per_sec": round(self.rows / uptime, 2) if uptime > 0 else 0.0,
+        }
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent scoring requests into one model evaluation.
+
+    A batch is flushed when it holds `max_batch_size` rows or when the oldest
+    request has waited `max_wait_ms`, whichever comes first. A bulk request
+    larger than `max_batch_size` is scored as its own batch. If a batch fails,
+    its requests are rescored one by one, so only the failing request sees
+    the error.
+    """
+
+    def __init__(self, scorer: Scorer, stats: ServiceStats, max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        self.scorer = scorer
+        self.stats = stats
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, records: List[dict]) -> np.ndarray:
+        """Probabilities for one request's bookings (already checked by `check_records`)."""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((records, future))
+        return await future
+
+    async def _collect(self) -> list:
+        items = [await self.queue.get()]
+        rows = len(items[0][0])
+        deadline = time.perf_counter() + self.max_wait
+        while rows < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            items.append(item)
+            rows += len(item[0])
+        return items
+
+    def _score(self, records: List[dict]) -> np.ndarray:
+        proba = self.scorer.predict_proba(bookings_frame(records))
+        self.stats.record_batch(len(records))
+        return proba
+
+    def _score_each(self, items: list) -> None:
+        for recs, future in items:
+            try:
+                proba = self._score(recs)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                continue
+            if not future.done():
+                future.set_result(proba)
+
+    async def _run(self) -> None:
+        while True:
+            items = await self._collect()
+            try:
+                proba = self._score([r for recs, _ in items for r in recs])
+            except Exception:
+                self._score_each(items)
+                continue
+            offset = 0
+            for recs, future in items:
+                if not future.done():
+                    future.set_result(proba[offset:offset + len(recs)])
+                offset += len(recs)
+
+
+def _parse_payload(body: bytes) -> List[dict]:
+    """Accept a single booking object, a list of bookings, or {"bookings": [...]}."""
+    payload = json.loads(body or b"null")
+    if isinstance(payload, dict) and isinstance(payload.get("bookings"), list):
+        payload = payload["bookings"]
+    if isinstance(payload, dict):
+        return [payload]
+    if isinstance(payload, list) and all(isinstance(r, dict) for r in payload):
+        return payload
+    raise ValueError("Expected a booking object, a list of bookings, or {\"bookings\": [...]}")
+
+
+def check_records(records: List[dict]) -> List[dict]:
+    """
+    Reject a request whose numeric fields are not numbers, before it joins a batch.
+
+    Checked per request so that one malformed booking fails only its own
+    request (with a ValueError, reported as 400).
+    """
+    for i, record in enumerate(records):
+        for col in NUMERIC_DTYPES.keys() & record.keys():
+            value = record[col]
+            if value is None or isinstance(value, (int, float)):
+                continue
+            try:
+                float(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"Booking {i}: {col} must be a number, got {value!r}") from None
+    return records
+
+
+def bookings_frame(records: List[dict]) -> pd.DataFrame:
+    """Checked records as a frame; numeric fields sent as strings ("85") are parsed."""
+    df = pd.DataFrame.from_records(records)
+    for col in df.columns.intersection(list(NUMERIC_DTYPES)):
+        if df[col].dtype == object:
+            df[col] = pd.to_numeric(df[col])
+    return df
+
+
+def _is_input_error(e: Exception) -> bool:
+    """Errors caused by the request's content (reported as 400), including those the preprocessor wraps."""
+    if isinstance(e, CustomException):
+        e = e.errors
+    return isinstance(e, (ValueError, TypeError, KeyError))
+
+
+class ScoringService:
+    """HTTP/1.1 endpoints: POST /score, GET /metrics, GET /health."""
+
+    def __init__(self, scorer: Scorer, max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        self.scorer = scorer
+        self.stats = ServiceStats()
+        self.batcher = MicroBatcher(scorer, self.stats, max_batch_size, max_wait_ms)
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: str, payload: dict, keep_alive: bool) -> None:
+        body = json.dumps(payload).encode()
+        headers = [
+            f"HTTP/1.1 {status}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode() + body)
+        await writer.drain()
+
+    async def _score(self, body: bytes) -> dict:
+        start = time.perf_counter()
+        records = _parse_payload(body)
+        proba = await self.batcher.submit(check_records(records))
+        self.stats.record_request((time.perf_counter() - start) * 1000.0, len(records))
+        return {"cancel_probability": [round(float(p), 6) for p in proba]}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                method, target, version = (lines[0].split(" ") + ["", "", ""])[:3]
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        key, value = line.split(":", 1)
+                        headers[key.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, "413 Payload Too Large", {"error": "body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+                path = target.split("?", 1)[0]
+                try:
+                    if method == "POST" and path == "/score":
+                        status, payload = "200 OK", await self._score(body)
+                    elif method == "GET" and path == "/metrics":
+                        status, payload = "200 OK", self.stats.snapshot()
+                    elif method == "GET" and path == "/health":
+                        status, payload = "200 OK", {"status": "ok"}
+                    else:
+                        status, payload = "404 Not Found", {"error": f"no route for {method} {path}"}
+                except Exception as e:
+                    self.stats.errors += 1
+                    if _is_input_error(e):
+                        detail = f"{e}: {e.errors}" if isinstance(e, CustomException) else str(e)
+                        status, payload = "400 Bad Request", {"error": detail}
+                    else:
+                        logger.error(f"Scoring failed: {e}")
+                        status, payload = "500 Internal Server Error", {"error": str(e)}
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8080) -> None:
+        self.batcher.start()
+        server = await asyncio.start_server(self.handle, host, port)
+        logger.info(f"Scoring service listening on http://{host}:{port} "
+                    f"(max_batch_size={self.batcher.max_batch_size}, max_wait_ms={self.batcher.max_wait * 1000:g})")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.batcher.stop()
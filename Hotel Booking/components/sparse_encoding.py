@@ -0,0 +1,161 @@
+"""
+Sparse categorical encoding: one-hot or hashed columns in a scipy CSR matrix.
+
+`mean_encode_categoricals` turns every categorical column into a single
+target-mean float, which loses most of the signal in `country` (~180 values)
+and cannot use the `agent` / `company` ids at all (basic_cleaning drops them).
+`SparseEncoder` keeps the preprocessor's numeric features and gives every
+category its own column instead: one column per category seen in training
+("onehot"), or `n_features` shared columns indexed by a stable hash of
+"column=value" ("hash", for unbounded or drifting vocabularies). Only non-zero
+entries are stored, so the matrix holds about one value per categorical column
+per row however wide it is. Lasso and LogisticRegression (lbfgs/liblinear) fit
+on CSR input directly; see Trainer.select_features / Trainer.fit.
+"""
+import copy
+import zlib
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from components.preprocessor import BookingPreprocessor
+from logger.log_config import get_logger
+from exception.custom_exception import CustomException
+
+logger = get_logger("sparse_encoding")
+
+ENCODING_METHODS = ("onehot", "hash")
+# id columns basic_cleaning drops from the dense path; encoded here as categories
+ID_COLUMNS = ['agent', 'company']
+MISSING_KEY = "<missing>"
+
+
+def category_key(value) -> str:
+    """String key of a category: ids read as floats (9.0) match ids read as ints (9), nulls share one key."""
+    if value is None or (isinstance(value, float) and np.isnan(value)) or value is pd.NaT:
+        return MISSING_KEY
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def factorize_categories(series: pd.Series):
+    """(codes, keys): per-row code into the column's distinct category keys, nulls included."""
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    return codes, [category_key(v) for v in uniques]
+
+
+def hash_index(column: str, key: str, n_features: int) -> int:
+    """Hashed column of `column=key`; crc32, so it is the same in every process and Python version."""
+    return zlib.crc32(f"{column}={key}".encode("utf-8")) % n_features
+
+
+class SparseEncoder:
+    """
+    Numeric features of a fitted `BookingPreprocessor` plus sparse categorical blocks.
+
+    `fit` takes the raw bookings and a preprocessor fitted on them: its
+    non-encoded output columns become the leading dense-valued columns (zeros
+    are not stored), its encoded columns plus `id_columns` become categorical.
+    With method="onehot", categories seen fewer than `min_count` times in
+    training, and categories never seen, get no column (the row is all-zero in
+    that column's block). With method="hash", every category maps to one of
+    `n_features` columns; collisions add up.
+    """
+
+    def __init__(self, method: str = "onehot", n_features: int = 2 ** 12, min_count: int = 1,
+                 id_columns: Optional[List[str]] = None):
+        if method not in ENCODING_METHODS:
+            raise ValueError(f"Unknown encoding method {method!r}; expected one of {ENCODING_METHODS}")
+        if n_features < 1:
+            raise ValueError("n_features must be positive")
+        self.method = method
+        self.n_features = n_features
+        self.min_count = min_count
+        self.id_columns = list(ID_COLUMNS if id_columns is None else id_columns)
+        self.numeric: Optional[BookingPreprocessor] = None
+        self.numeric_columns: List[str] = []
+        self.categorical_columns: List[str] = []
+        self.vocabulary: Dict[str, Dict[str, int]] = {}
+        self.feature_names: List[str] = []
+
+    @property
+    def n_columns(self) -> int:
+        return len(self.feature_names)
+
+    def fit(self, df: pd.DataFrame, preprocessor: BookingPreprocessor) -> "SparseEncoder":
+        try:
+            self.numeric_columns = [c for c in preprocessor.feature_columns if c not in preprocessor.encodings]
+            self.numeric = copy.copy(preprocessor)
+            self.numeric.selected_features = list(self.numeric_columns)
+            self.categorical_columns = ([c for c in preprocessor.feature_columns if c in preprocessor.encodings]
+                                        + [c for c in self.id_columns if c in df.columns])
+            names = list(self.numeric_columns)
+            self.vocabulary = {}
+            if self.method == "onehot":
+                for col in self.categorical_columns:
+                    codes, keys = factorize_categories(df[col])
+                    counts = np.bincount(codes, minlength=len(keys))
+                    kept = sorted(k for k, n in zip(keys, counts) if n >= self.min_count)
+                    self.vocabulary[col] = {k: len(names) + i for i, k in enumerate(kept)}
+                    names.extend(f"{col}={k}" for k in kept)
+            else:
+                names.extend(f"hash_{i}" for i in range(self.n_features))
+            self.feature_names = names
+            logger.info(f"Fitted {self.method} encoder: {len(self.numeric_columns)} numeric and "
+                        f"{len(self.categorical_columns)} categorical columns -> {self.n_columns} features")
+            return self
+        except Exception as e:
+            raise CustomException("Error fitting sparse encoder", e)
+
+    def _category_indices(self, series: pd.Series, col: str) -> np.ndarray:
+        """Output column per row (-1 where the category has no column), looked up once per distinct value."""
+        codes, keys = factorize_categories(series)
+        if self.method == "onehot":
+            vocab = self.vocabulary[col]
+            lookup = np.array([vocab.get(k, -1) for k in keys], dtype=np.int32)
+        else:
+            offset = len(self.numeric_columns)
+            lookup = np.array([offset + hash_index(col, k, self.n_features) for k in keys], dtype=np.int32)
+        return lookup[codes] if len(lookup) else np.full(len(series), -1, dtype=np.int32)
+
+    def transform(self, df: pd.DataFrame):
+        """CSR matrix (rows x n_columns, float64) of raw bookings, one row per input row."""
+        from scipy import sparse
+
+        try:
+            n_rows = len(df)
+            n_numeric = len(self.numeric_columns)
+            width = n_numeric + len(self.categorical_columns)
+            indices = np.empty((n_rows, width), dtype=np.int32)
+            values = np.ones((n_rows, width), dtype=np.float64)
+            if n_numeric:
+                values[:, :n_numeric] = self.numeric.transform_array(df)
+                indices[:, :n_numeric] = np.arange(n_numeric)
+            for j, col in enumerate(self.categorical_columns, start=n_numeric):
+                if col in df.columns:
+                    indices[:, j] = self._category_indices(df[col], col)
+                else:
+                    indices[:, j] = -1
+            # keep non-zero entries only; row-major order keeps each row's entries together
+            keep = (indices >= 0) & (values != 0)
+            indptr = np.zeros(n_rows + 1, dtype=np.int64)
+            np.cumsum(keep.sum(axis=1), out=indptr[1:])
+            matrix = sparse.csr_matrix((values[keep], indices[keep], indptr),
+                                       shape=(n_rows, self.n_columns))
+            # one-hot blocks are laid out column by column, so rows are already sorted; hashing is not
+            matrix.sum_duplicates()
+            return matrix
+        except Exception as e:
+            raise CustomException("Error in sparse encoding", e)
+
+    def fit_transform(self, df: pd.DataFrame, preprocessor: BookingPreprocessor):
+        return self.fit(df, preprocessor).transform(df)
+
+
+def matrix_nbytes(matrix) -> int:
+    """Memory held by a CSR matrix's arrays (data, indices, indptr) or by a dense array/DataFrame."""
+    if hasattr(matrix, "indptr"):
+        return int(matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes)
+    if isinstance(matrix, pd.DataFrame):
+        return int(matrix.memory_usage(deep=True, index=False).sum())
+    return int(np.asarray(matrix).nbytes)
@@ -1,71 +1,146 @@
-from sklearn.linear_model import Lasso, LogisticRegression
-from sklearn.feature_selection import SelectFromModel
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, confusion_matrix
 from entity.config_entity import TrainingConfig
 from utils.helpers import save_model, ensure_dir
+from utils.instrumentation import instrument
 from logger.log_config import get_logger
 from exception.custom_exception import CustomException
+import copy
 import os
+import time
+import numpy as np
 
 logger = get_logger("trainer")
 
+# sklearn is imported inside the functions that fit models, so importing this
+# module (e.g. to build the pipeline's stage graph) stays cheap
 
-def lasso_feature_selection(X, y, alpha=0.005):
+
+@instrument()
+def lasso_feature_selection(X, y, alpha=0.005, columns=None):
+    """
+    Names of the columns Lasso keeps. `X` is a DataFrame, or a scipy sparse
+    matrix whose columns are named by `columns` (components.sparse_encoding).
+    """
+    from sklearn.feature_selection import SelectFromModel
+    from sklearn.linear_model import Lasso
+
+    columns = X.columns if columns is None else columns
     sel = SelectFromModel(Lasso(alpha=alpha))
     sel.fit(X, y)
     support = sel.get_support()
-    selected = X.columns[support]
-    return list(selected)
+    return [c for c, keep in zip(columns, support) if keep]
+
+
+def select_columns(X, selected: list, columns=None):
+    """`X[selected]` for a DataFrame; the named columns of a sparse matrix whose columns are `columns`."""
+    if columns is None:
+        return X[selected]
+    position = {c: i for i, c in enumerate(columns)}
+    return X[:, [position[c] for c in selected]]
+
+
+def make_classifier(C: float = 1.0, penalty: str = "l2", class_weight=None, **kwargs):
+    """
+    The pipeline's LogisticRegression for the given hyperparameters.
+
+    l2 uses the default lbfgs solver (which supports warm starts); l1 needs
+    liblinear.
+    """
+    import sklearn
+    from sklearn.linear_model import LogisticRegression
+
+    if penalty not in ("l1", "l2"):
+        raise ValueError(f"Unsupported penalty {penalty!r}; expected 'l1' or 'l2'")
+    # scikit-learn 1.8 deprecated `penalty` in favour of l1_ratio (0 = l2, 1 = l1)
+    if tuple(int(part) for part in sklearn.__version__.split(".")[:2]) >= (1, 8):
+        kwargs["l1_ratio"] = 1.0 if penalty == "l1" else 0.0
+    else:
+        kwargs["penalty"] = penalty
+    solver = "lbfgs"
+    if penalty == "l1":
+        # liblinear shuffles the data; fix its seed so searches and refits are reproducible
+        solver = "liblinear"
+        kwargs.setdefault("random_state", 0)
+    return LogisticRegression(C=C, class_weight=class_weight, solver=solver, max_iter=1000, **kwargs)
+
+
+def hyperparameters(config: TrainingConfig) -> dict:
+    """Feature-selection and model hyperparameters of `config`, as stored in registry metadata."""
+    return {"lasso_alpha": config.lasso_alpha, "C": config.C, "penalty": config.penalty,
+            "class_weight": config.class_weight}
+
+
+def model_params(config: TrainingConfig) -> dict:
+    """`make_classifier` arguments of `config`."""
+    return {"C": config.C, "penalty": config.penalty, "class_weight": config.class_weight}
+
+
+def fitted_params(model) -> dict:
+    """`make_classifier` arguments that reproduce a fitted LogisticRegression's hyperparameters."""
+    penalty = getattr(model, "penalty", "l2")
+    if penalty not in ("l1", "l2"):
+        # scikit-learn >= 1.8 keeps the penalty in l1_ratio
+        penalty = "l1" if (getattr(model, "l1_ratio", None) or 0.0) >= 1.0 else "l2"
+    return {"C": float(model.C), "penalty": penalty, "class_weight": model.class_weight}
+
+
+def training_metrics(fitted: dict, cv_scores=None) -> dict:
+    """Metrics of a `Trainer.fit` result (plus CV scores) in the form stored with registered versions."""
+    cm = fitted["confusion_matrix"]
+    metrics = {"accuracy": float(fitted["accuracy"]), "confusion_matrix": [[int(v) for v in row] for row in cm]}
+    if cv_scores is not None and len(cv_scores):
+        metrics.update(cv_mean=float(np.mean(cv_scores)), cv_std=float(np.std(cv_scores)))
+    return metrics
 
 
 class Trainer:
     def __init__(self, config: TrainingConfig):
         self.config = config
 
-    def train(self, X, y):
+    @instrument()
+    def select_features(self, X, y, columns: list = None) -> list:
+        """
+        Lasso-selected columns of `X` (all columns if Lasso fails).
+
+        `X` may be a sparse matrix with column names `columns` (see
+        components.sparse_encoding); the same applies to `fit`.
+        """
+        from components.output_reports import print_feature_importance
+
+        logger.info("Running Lasso for feature selection")
         try:
-            from components.visualizations import plot_confusion_matrix
-            from components.output_reports import (
-                print_feature_importance, 
-                print_model_training_summary,
-                print_cross_validation_summary
-            )
-            
-            # feature selection
-            logger.info("Running Lasso for feature selection")
-            try:
-                selected = lasso_feature_selection(X, y)
-            except Exception:
-                # fallback: keep all if Lasso fails
-                selected = list(X.columns)
-            
-            X_sel = X[selected]
-            
-            # Print selected features
-            print_feature_importance(selected, "SELECTED FEATURES (Lasso)")
+            selected = lasso_feature_selection(X, y, alpha=self.config.lasso_alpha, columns=columns)
+        except Exception:
+            # fallback: keep all if Lasso fails
+            selected = list(X.columns if columns is None else columns)
+
+        # Print selected features
+        print_feature_importance(selected, "SELECTED FEATURES (Lasso)")
+        return selected
+
+    @instrument()
+    def fit(self, X, y, selected: list, columns: list = None) -> dict:
+        """Fit the logistic model on a train split of `X[selected]` and evaluate it on the test split."""
+        try:
+            from sklearn.metrics import accuracy_score, confusion_matrix
+            from sklearn.model_selection import train_test_split
+            from components.output_reports import print_fitted_model, print_model_training_summary, print_train_test_split
+
+            X_sel = select_columns(X, selected, columns)
 
             # split
             X_train, X_test, y_train, y_test = train_test_split(
                 X_sel, y, test_size=self.config.test_size, random_state=self.config.random_state
             )
             
-            print(f"\n{'='*80}")
-            print("TRAIN-TEST SPLIT")
-            print(f"{'='*80}")
-            print(f"Training set shape: {X_train.shape}")
-            print(f"Test set shape: {X_test.shape}")
-            print(f"Training/Test ratio: {len(X_train)}/{len(X_test)}")
-            print("")
+            print_train_test_split(X_train.shape, X_test.shape)
 
             # train logistic regression
-            model = LogisticRegression(max_iter=1000)
+            model = make_classifier(**model_params(self.config))
+            fit_start = time.perf_counter()
             model.fit(X_train, y_train)
+            fit_seconds = time.perf_counter() - fit_start
             
-            print(f"Model trained: LogisticRegression(max_iter=1000)")
-            print(f"Model coefficients shape: {model.coef_.shape}")
-            print(f"Intercept: {model.intercept_}")
-            print("")
+            print_fitted_model(model)
 
             preds = model.predict(X_test)
             acc = accuracy_score(y_test, preds)
@@ -73,29 +148,102 @@ class Trainer:
             
             # Print training summary
             print_model_training_summary(X_train.shape, X_test.shape, "LogisticRegression", acc, cm)
+            return {"model": model, "accuracy": acc, "confusion_matrix": cm, "fit_seconds": fit_seconds,
+                    "train_rows": len(X_train)}
+        except Exception as e:
+            raise CustomException("Error fitting model", e)
 
-            # Cross-validation
-            try:
+    @instrument()
+    def cross_validate(self, X, y, selected: list, preprocessor=None, df_raw=None):
+        """
+        Per-fold accuracy scores, or None if cross-validation fails.
+
+        When the raw bookings `df_raw` and the fitted `preprocessor` are given,
+        encodings and feature selection are refitted inside every fold (see
+        components.cross_validation); otherwise the already-encoded `X[selected]`
+        is scored as before.
+        """
+        from components.output_reports import print_cross_validation_summary
+
+        try:
+            if df_raw is not None and preprocessor is not None:
+                from components.cross_validation import build_base_matrix, cross_validate
+                cv = cross_validate(build_base_matrix(df_raw, preprocessor),
+                                    n_splits=self.config.cv_folds, workers=self.config.cv_workers,
+                                    alpha=self.config.lasso_alpha, model_params=model_params(self.config))
+                cv_scores = cv.scores
+                print_cross_validation_summary(cv_scores, cv_scores.mean(), cv_scores.std(),
+                                               fit_seconds=cv.fit_seconds, serial_seconds=cv.serial_seconds,
+                                               wall_seconds=cv.wall_seconds, workers=cv.workers)
+            else:
                 from sklearn.model_selection import cross_val_score
-                cv_scores = cross_val_score(model, X_sel, y, cv=10)
+                cv_scores = cross_val_score(make_classifier(**model_params(self.config)), X[selected], y,
+                                            cv=self.config.cv_folds)
                 print_cross_validation_summary(cv_scores, cv_scores.mean(), cv_scores.std())
-            except Exception as e:
-                logger.warning(f"Could not perform cross-validation: {e}")
-                cv_scores = None
+            return cv_scores
+        except Exception as e:
+            logger.warning(f"Could not perform cross-validation: {e}")
+            return None
 
-            # save model
+    @instrument()
+    def save(self, model, preprocessor=None, selected: list = None) -> dict:
+        """Persist the model, and the preprocessor restricted to `selected`, under config.model_dir."""
+        try:
             model_dir = self.config.model_dir
             ensure_dir(model_dir)
             model_path = os.path.join(model_dir, self.config.model_name)
             save_model(model, model_path)
             logger.info(f"Model saved at {model_path}")
+
+            # save the fitted preprocessing next to the model so scoring uses the same columns
+            preprocessor_path = None
+            if preprocessor is not None:
+                preprocessor.selected_features = list(selected)
+                preprocessor_path = os.path.join(model_dir, self.config.preprocessor_name)
+                save_model(preprocessor, preprocessor_path)
+                logger.info(f"Preprocessor saved at {preprocessor_path}")
+            return {"model_path": model_path, "preprocessor_path": preprocessor_path}
+        except Exception as e:
+            raise CustomException("Error saving model", e)
+
+    @instrument()
+    def register(self, model, preprocessor, selected: list, metadata: dict = None, reference=None) -> str:
+        """
+        Register the model as a new immutable version in config.registry_dir and make it current.
+
+        `metadata` (data fingerprint, metrics, training time, ...) and the
+        training data's `reference` sketch (components.monitoring) are stored
+        with the version; see utils.model_registry.
+        """
+        from utils.model_registry import ModelRegistry
+
+        try:
+            preprocessor = copy.copy(preprocessor)
+            preprocessor.selected_features = list(selected)
+            return ModelRegistry(self.config.registry_dir).register(model, preprocessor, metadata,
+                                                                    reference=reference)
+        except Exception as e:
+            raise CustomException("Error registering model", e)
+
+    def train(self, X, y, preprocessor=None, df_raw=None):
+        """Select features, fit, evaluate, cross-validate and save the logistic model, one step after another."""
+        try:
+            from components.visualizations import plot_confusion_matrix
+
+            selected = self.select_features(X, y)
+            fitted = self.fit(X, y, selected)
+            cv_scores = self.cross_validate(X, y, selected, preprocessor=preprocessor, df_raw=df_raw)
+            paths = self.save(fitted["model"], preprocessor, selected)
+            if self.config.registry_dir and preprocessor is not None:
+                paths["version"] = self.register(fitted["model"], preprocessor, selected, metadata={
+                    "metrics": training_metrics(fitted, cv_scores), "fit_seconds": fitted["fit_seconds"]})
             
             # generate confusion matrix plot
             try:
-                plot_confusion_matrix(cm)
+                plot_confusion_matrix(fitted["confusion_matrix"])
             except Exception as e:
                 logger.warning(f"Could not generate confusion matrix plot: {e}")
 
-            return {"accuracy": acc, "confusion_matrix": cm, "model_path": model_path, "cv_scores": cv_scores}
+            return dict(fitted, cv_scores=cv_scores, selected=selected, **paths)
         except Exception as e:
             raise CustomException("Error during training", e)
@@ -1,9 +1,18 @@
 """Comprehensive EDA and visualization module for hotel booking data."""
+import functools
 import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+from matplotlib.patches import Patch
+from components.output_reports import print_data_shape_info, print_model_metrics
+from utils.instrumentation import add_records, drain_records, measure
+from components.plot_reduction import (BoxStats, Histogram, box_stats, correlation, grouped_histograms,
+                                       grouped_mean_ci, histogram, missing_matrix)
 from logger.log_config import get_logger
 
 logger = get_logger("visualizations")
@@ -15,51 +24,101 @@ def ensure_plots_dir():
     os.makedirs(PLOTS_DIR, exist_ok=True)
 
 
+PLOT_FORMATS = ("png", "svg", "webp")
+
+# per-run rendering options, see configure_rendering()
+_render_options = {"dpi": 300, "format": "png"}
+
+# pyplot keeps global figure state, so in-process plots are drawn one at a time
+# even when pipeline stages call them from several threads
+_pyplot_lock = threading.RLock()
+
+
+def configure_rendering(dpi: int = 300, fmt: str = "png"):
+    """Set the DPI and output format (png, svg or webp) used by every saved plot."""
+    fmt = fmt.lower()
+    if fmt not in PLOT_FORMATS:
+        raise ValueError(f"Unsupported plot format {fmt!r}, expected one of {PLOT_FORMATS}")
+    _render_options.update(dpi=dpi, format=fmt)
+
+
 def save_plot(filename: str, tight_layout=True):
-    """Decorator to save plots to disk."""
+    """Decorator to save plots to disk (each call is recorded by utils.instrumentation)."""
     def decorator(func):
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
             ensure_plots_dir()
-            result = func(*args, **kwargs)
-            if tight_layout:
-                plt.tight_layout()
-            path = os.path.join(PLOTS_DIR, filename)
-            plt.savefig(path, dpi=300, bbox_inches='tight')
-            logger.info(f"Saved plot: {path}")
-            plt.close()
+            with _pyplot_lock, measure(f"plot:{os.path.splitext(filename)[0]}"):
+                try:
+                    start = time.perf_counter()
+                    result = func(*args, **kwargs)
+                    if tight_layout:
+                        plt.tight_layout()
+                    path = os.path.join(PLOTS_DIR, f"{os.path.splitext(filename)[0]}.{_render_options['format']}")
+                    plt.savefig(path, dpi=_render_options["dpi"], bbox_inches='tight')
+                    logger.info(f"Saved plot: {path} ({time.perf_counter() - start:.2f}s)")
+                finally:
+                    plt.close('all')
             return result
         return wrapper
     return decorator
 
 
 def log_data_info(df: pd.DataFrame):
-    """Log basic data info and save to file."""
-    ensure_plots_dir()
-    info_path = os.path.join(PLOTS_DIR, "01_data_shape_info.txt")
-    with open(info_path, 'w') as f:
-        f.write(f"Dataset Shape: {df.shape}\n")
-        f.write(f"Data Types:\n{df.dtypes}\n\n")
-        f.write(f"Missing Values:\n{df.isnull().sum()}\n\n")
-        f.write(f"First 5 Rows:\n{df.head()}\n")
-    logger.info(f"Data info saved to {info_path}")
+    """Log basic data info and save to file (reuses the cached profile of `df`)."""
+    print_data_shape_info(df)
     return df
 
 
+def _draw_boxes(box: BoxStats, hue_title: str = None):
+    """Draw precomputed box statistics with seaborn-like dodged, coloured boxes."""
+    n_hues = max(len(box.hues), 1)
+    palette = sns.color_palette(n_colors=n_hues)
+    width = 0.8 / n_hues
+    ax = plt.gca()
+    for i, stats in enumerate(box.stats):
+        if stats is None:
+            continue
+        group, hue = divmod(i, n_hues)
+        position = group - 0.4 + width * (hue + 0.5)
+        ax.bxp([stats], positions=[position], widths=width * 0.9, patch_artist=True,
+               boxprops={'facecolor': palette[hue]}, medianprops={'color': 'black'},
+               flierprops={'marker': 'd', 'markersize': 3, 'alpha': 0.5})
+    ax.set_xticks(range(len(box.groups)))
+    ax.set_xticklabels(box.groups)
+    ax.set_xlim(-0.5, len(box.groups) - 0.5)
+    if box.hues:
+        handles = [Patch(facecolor=palette[j], label=h) for j, h in enumerate(box.hues)]
+        ax.legend(handles=handles, title=hue_title)
+
+
+def _draw_histogram(hist: Histogram):
+    """Filled histogram with its smoothed density scaled to counts (like histplot(kde=True))."""
+    plt.stairs(hist.counts, hist.edges, fill=True, alpha=0.6, edgecolor='white')
+    width = hist.edges[1] - hist.edges[0]
+    plt.plot(hist.centers, hist.density() * hist.n * width, linewidth=2)
+
+
 @save_plot("02_missing_values_heatmap.png")
-def plot_missing_values(df: pd.DataFrame):
-    """Plot missing values heatmap."""
+def plot_missing_values(missing):
+    """Plot missing values heatmap (a DataFrame or a plot_reduction.MissingMatrix)."""
+    if isinstance(missing, pd.DataFrame):
+        missing = missing_matrix(missing)
     plt.figure(figsize=(12, 6))
-    sns.heatmap(df.isnull(), cbar=True, cmap='viridis', yticklabels=False)
+    sns.heatmap(missing.fractions, cbar=True, cmap='viridis', vmin=0, vmax=1,
+                xticklabels=missing.columns, yticklabels=False)
     plt.title('Missing Values Heatmap')
     plt.xlabel('Columns')
-    plt.ylabel('Rows (Sample)')
+    plt.ylabel(f'Rows ({missing.rows_per_bin} per band, share missing)')
 
 
 @save_plot("03_room_price_by_type.png")
-def plot_room_price_boxplot(data: pd.DataFrame):
-    """Boxplot: Price of room types per night by hotel."""
+def plot_room_price_boxplot(data):
+    """Boxplot: Price of room types per night by hotel (a DataFrame or precomputed BoxStats)."""
+    if isinstance(data, pd.DataFrame):
+        data = box_stats(data, 'adr', 'reserved_room_type', hue='hotel')
     plt.figure(figsize=(12, 8))
-    sns.boxplot(x='reserved_room_type', y='adr', hue='hotel', data=data)
+    _draw_boxes(data, hue_title='hotel')
     plt.title('Price of Room Types per Night and Person')
     plt.xlabel('Room Types')
     plt.ylabel('Price (EUR)')
@@ -85,9 +144,23 @@ def plot_monthly_guest_trends(final_rush: pd.DataFrame):
 
 @save_plot("05_adr_by_month_barplot.png")
 def plot_adr_by_month(data: pd.DataFrame):
-    """Barplot: Average room rate (ADR) by month with cancellation status."""
+    """Barplot: Average room rate (ADR) by month with cancellation status.
+
+    Accepts the raw rows or the output of plot_reduction.grouped_mean_ci.
+    """
+    if 'mean' not in data.columns:
+        data = grouped_mean_ci(data, 'adr', 'arrival_date_month', 'is_canceled')
+    months = list(pd.unique(data['arrival_date_month']))
+    hues = sorted(pd.unique(data['is_canceled']))
+    palette = sns.color_palette(n_colors=len(hues))
+    width = 0.8 / len(hues)
     plt.figure(figsize=(14, 6))
-    sns.barplot(x='arrival_date_month', y='adr', hue='is_canceled', data=data)
+    for j, hue in enumerate(hues):
+        rows = data[data['is_canceled'] == hue]
+        x = np.array([months.index(m) for m in rows['arrival_date_month']]) - 0.4 + width * (j + 0.5)
+        plt.bar(x, rows['mean'], width=width, yerr=rows['ci'], color=palette[j], label=str(hue), capsize=0)
+    plt.xticks(range(len(months)), [str(m) for m in months])
+    plt.legend(title='is_canceled')
     plt.title('Average Daily Rate (ADR) by Month and Cancellation Status')
     plt.xlabel('Arrival Month')
     plt.ylabel('ADR (EUR)')
@@ -95,10 +168,12 @@ def plot_adr_by_month(data: pd.DataFrame):
 
 
 @save_plot("06_adr_by_month_boxplot.png")
-def plot_adr_boxplot(data: pd.DataFrame):
-    """Boxplot: ADR distribution by month."""
+def plot_adr_boxplot(data):
+    """Boxplot: ADR distribution by month (a DataFrame or precomputed BoxStats)."""
+    if isinstance(data, pd.DataFrame):
+        data = box_stats(data, 'adr', 'arrival_date_month', hue='is_canceled')
     plt.figure(figsize=(14, 8))
-    sns.boxplot(x='arrival_date_month', y='adr', hue='is_canceled', data=data)
+    _draw_boxes(data, hue_title='is_canceled')
     plt.title('ADR Distribution by Month (with Cancellation Status)')
     plt.xlabel('Arrival Month')
     plt.ylabel('ADR (EUR)')
@@ -122,23 +197,32 @@ def plot_weekend_weekday_breakdown(sorted_data: pd.DataFrame):
 
 
 @save_plot("08_lead_time_distribution.png")
-def plot_lead_time_distribution(df: pd.DataFrame):
-    """Distribution plot: Lead time."""
+def plot_lead_time_distribution(hist):
+    """Distribution plot: Lead time (a DataFrame or a precomputed Histogram)."""
+    if isinstance(hist, pd.DataFrame):
+        hist = histogram(hist['lead_time'], bins=50)
     plt.figure(figsize=(12, 6))
-    sns.histplot(df['lead_time'], kde=True, bins=50)
+    _draw_histogram(hist)
     plt.title('Lead Time Distribution')
     plt.xlabel('Lead Time (days)')
     plt.ylabel('Frequency')
 
 
 @save_plot("09_lead_time_by_cancellation.png")
-def plot_lead_time_by_cancellation(df: pd.DataFrame):
-    """KDE plot: Lead time distribution by cancellation status."""
+def plot_lead_time_by_cancellation(hists):
+    """KDE plot: Lead time distribution by cancellation status.
+
+    Accepts the raw rows or {is_canceled: Histogram} from plot_reduction.grouped_histograms.
+    """
+    if isinstance(hists, pd.DataFrame):
+        hists = grouped_histograms(hists, 'lead_time', 'is_canceled')
     plt.figure(figsize=(12, 6))
     for cancel_status in [0, 1]:
-        data_subset = df[df['is_canceled'] == cancel_status]['lead_time']
+        if cancel_status not in hists:
+            continue
+        hist = hists[cancel_status]
         label = 'Not Cancelled' if cancel_status == 0 else 'Cancelled'
-        sns.kdeplot(data=data_subset, label=label, fill=True, alpha=0.5)
+        plt.fill_between(hist.centers, hist.density(), label=label, alpha=0.5)
     plt.xlim(0, 500)
     plt.title('Lead Time Distribution by Cancellation Status')
     plt.xlabel('Lead Time (days)')
@@ -147,31 +231,38 @@ def plot_lead_time_by_cancellation(df: pd.DataFrame):
 
 
 @save_plot("10_adr_distribution_before.png")
-def plot_adr_distribution_before(df: pd.DataFrame):
-    """Distribution plot: ADR before outlier handling."""
+def plot_adr_distribution_before(hist):
+    """Distribution plot: ADR before outlier handling (a DataFrame or a precomputed Histogram)."""
+    if isinstance(hist, pd.DataFrame):
+        hist = histogram(hist['adr'], bins=50)
     plt.figure(figsize=(12, 6))
-    sns.histplot(df['adr'], kde=True, bins=50)
+    _draw_histogram(hist)
     plt.title('ADR Distribution (Before Outlier Handling)')
     plt.xlabel('ADR (EUR)')
     plt.ylabel('Frequency')
 
 
 @save_plot("11_adr_distribution_after.png")
-def plot_adr_distribution_after(df: pd.DataFrame):
-    """Distribution plot: ADR after log transformation."""
+def plot_adr_distribution_after(hist):
+    """Distribution plot: ADR after log transformation (a DataFrame or a precomputed Histogram)."""
+    if isinstance(hist, pd.DataFrame):
+        hist = histogram(hist['adr'], bins=50)  # nulls are skipped
     plt.figure(figsize=(12, 6))
-    valid_adr = df['adr'].dropna()
-    sns.histplot(valid_adr, kde=True, bins=50)
+    _draw_histogram(hist)
     plt.title('ADR Distribution (After Log Transformation)')
     plt.xlabel('Log(ADR)')
     plt.ylabel('Frequency')
 
 
+def _as_correlation(df: pd.DataFrame) -> pd.DataFrame:
+    return df if df.index.equals(df.columns) else correlation(df)
+
+
 @save_plot("12_correlation_heatmap.png")
 def plot_correlation_heatmap(df: pd.DataFrame):
-    """Heatmap: Correlation matrix."""
+    """Heatmap: Correlation matrix (of `df`, or `df` itself when it already is one)."""
     plt.figure(figsize=(14, 10))
-    corr = df.corr()
+    corr = _as_correlation(df)
     sns.heatmap(corr, annot=False, cmap='coolwarm', center=0, square=True)
     plt.title('Feature Correlation Matrix')
 
@@ -181,7 +272,7 @@ def plot_cancellation_correlation(df: pd.DataFrame):
     """Barplot: Feature correlation with cancellation."""
     plt.figure(figsize=(12, 8))
     if 'is_canceled' in df.columns:
-        corr = df.corr()['is_canceled'].sort_values(ascending=False)
+        corr = _as_correlation(df)['is_canceled'].sort_values(ascending=False)
         corr.plot(kind='barh')
         plt.title('Feature Correlation with Cancellation')
         plt.xlabel('Correlation Coefficient')
@@ -201,109 +292,187 @@ def plot_confusion_matrix(cm: np.ndarray, title: str = "Confusion Matrix"):
 
 def save_model_metrics(accuracy: float, cm: np.ndarray, cv_scores: np.ndarray = None):
     """Save model performance metrics to file."""
-    ensure_plots_dir()
-    metrics_path = os.path.join(PLOTS_DIR, "15_model_metrics_summary.txt")
-    with open(metrics_path, 'w') as f:
-        f.write("="*60 + "\n")
-        f.write("MODEL PERFORMANCE METRICS\n")
-        f.write("="*60 + "\n\n")
-        f.write(f"Test Accuracy: {accuracy:.4f} ({accuracy*100:.2f}%)\n\n")
-        f.write("Confusion Matrix:\n")
-        f.write(f"  True Negatives:  {cm[0,0]:6d}\n")
-        f.write(f"  False Positives: {cm[0,1]:6d}\n")
-        f.write(f"  False Negatives: {cm[1,0]:6d}\n")
-        f.write(f"  True Positives:  {cm[1,1]:6d}\n\n")
-        if cv_scores is not None and len(cv_scores) > 0:
-            f.write(f"Cross-Validation Scores (10-fold):\n")
-            f.write(f"  Mean: {cv_scores.mean():.4f}\n")
-            f.write(f"  Std:  {cv_scores.std():.4f}\n")
-            f.write(f"  Scores: {cv_scores}\n")
-    logger.info(f"Metrics saved to {metrics_path}")
+    print_model_metrics(accuracy, cm, cv_scores)
+
+
+def _add_job(jobs: list, description: str, func_name: str, reduce) -> None:
+    """
+    Append the job plotting `reduce()`'s summaries (a tuple of arguments).
+
+    A reduction that fails is reported like a plot that fails to render, and
+    only its plot is skipped.
+    """
+    try:
+        jobs.append((description, func_name, reduce()))
+    except Exception as e:
+        logger.warning(f"Could not generate {description}: {e}")
+
+
+def build_eda_jobs(df_original: pd.DataFrame, final_rush: pd.DataFrame, sorted_data: pd.DataFrame) -> list:
+    """Plot jobs that only need the raw bookings (and the monthly aggregates)."""
+    jobs = []
+    cols = df_original.columns
+
+    # Missing values heatmap, summarised into row bands
+    _add_job(jobs, "missing values heatmap", "plot_missing_values", lambda: (missing_matrix(df_original),))
+
+    # Room pricing plot
+    if {'is_canceled', 'reserved_room_type', 'adr', 'hotel'}.issubset(cols):
+        data_completed = df_original.loc[df_original['is_canceled'] == 0, ['reserved_room_type', 'adr', 'hotel']]
+        if not data_completed.empty:
+            _add_job(jobs, "room pricing plot", "plot_room_price_boxplot",
+                     lambda: (box_stats(data_completed, 'adr', 'reserved_room_type', hue='hotel'),))
+
+    # Monthly guest trends
+    if not final_rush.empty:
+        jobs.append(("monthly trends plot", "plot_monthly_guest_trends", (final_rush,)))
+
+    # ADR by month plots
+    if {'arrival_date_month', 'adr', 'is_canceled'}.issubset(cols):
+        adr_month = df_original[['arrival_date_month', 'adr', 'is_canceled']]
+        _add_job(jobs, "ADR by month barplot", "plot_adr_by_month",
+                 lambda: (grouped_mean_ci(adr_month, 'adr', 'arrival_date_month', 'is_canceled'),))
+        _add_job(jobs, "ADR by month boxplot", "plot_adr_boxplot",
+                 lambda: (box_stats(adr_month, 'adr', 'arrival_date_month', hue='is_canceled'),))
+
+    # Weekend/weekday breakdown
+    if not sorted_data.empty:
+        jobs.append(("weekend/weekday plot", "plot_weekend_weekday_breakdown", (sorted_data,)))
+
+    # Lead time plots
+    if 'lead_time' in cols:
+        _add_job(jobs, "lead time distribution", "plot_lead_time_distribution",
+                 lambda: (histogram(df_original['lead_time'], bins=50),))
+        if 'is_canceled' in cols:
+            _add_job(jobs, "lead time by cancellation", "plot_lead_time_by_cancellation",
+                     lambda: (grouped_histograms(df_original, 'lead_time', 'is_canceled'),))
+
+    # ADR distribution before outlier handling
+    if 'adr' in cols:
+        _add_job(jobs, "ADR distribution before", "plot_adr_distribution_before",
+                 lambda: (histogram(df_original['adr'], bins=50),))
+    return jobs
+
+
+def build_processed_jobs(df_processed: pd.DataFrame) -> list:
+    """Plot jobs on the preprocessed feature frame."""
+    jobs = []
+    # ADR distribution after outlier handling
+    if 'adr' in df_processed.columns:
+        _add_job(jobs, "ADR distribution after", "plot_adr_distribution_after",
+                 lambda: (histogram(df_processed['adr'], bins=50),))
+
+    # Correlation plots
+    try:
+        corr = correlation(df_processed)
+    except Exception as e:
+        logger.warning(f"Could not generate correlation plots: {e}")
+    else:
+        jobs.append(("correlation heatmap", "plot_correlation_heatmap", (corr,)))
+        jobs.append(("cancellation correlation", "plot_cancellation_correlation", (corr,)))
+    return jobs
+
+
+def build_model_jobs(cm: np.ndarray) -> list:
+    """Model evaluation plot jobs."""
+    return [("confusion matrix", "plot_confusion_matrix", (cm, "Logistic Regression - Confusion Matrix"))]
+
+
+def build_plot_jobs(df_original: pd.DataFrame, df_processed: pd.DataFrame,
+                    final_rush: pd.DataFrame, sorted_data: pd.DataFrame, cm: np.ndarray) -> list:
+    """
+    List the plots to render as (description, plot function name, args).
+
+    Large-N plots are reduced here to fixed-size summaries (binned counts, box
+    statistics and densities of stratified samples, a row-banded missing
+    matrix; see plot_reduction), so rendering cost does not grow with the
+    number of rows and jobs ship cheaply to workers.
+    """
+    return (build_eda_jobs(df_original, final_rush, sorted_data)
+            + build_processed_jobs(df_processed)
+            + build_model_jobs(cm))
+
+
+_in_render_worker = False
+
+
+def _init_render_worker(options: dict):
+    global _in_render_worker
+    import matplotlib
+    matplotlib.use("Agg")
+    _render_options.update(options)
+    _in_render_worker = True
+    drain_records()  # a forked worker starts with a copy of the parent's records
+
+
+def _render_job(description: str, func_name: str, args: tuple):
+    """
+    Render one plot; failures are reported, not raised, so other plots still render.
+
+    In a worker process the plot's instrumentation records are returned so the
+    parent can add them to its run report.
+    """
+    start = time.perf_counter()
+    try:
+        globals()[func_name](*args)
+        error = None
+    except Exception as e:
+        error = str(e)
+    records = drain_records() if _in_render_worker else []
+    return description, time.perf_counter() - start, error, records
+
+
+def render_plot_jobs(jobs: list, workers: int = 1) -> dict:
+    """Render plot jobs in this process (workers <= 1) or in a process pool. Returns seconds per plot."""
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker,
+                                 initargs=(dict(_render_options),)) as pool:
+            results = list(pool.map(_render_job, *zip(*jobs))) if jobs else []
+    else:
+        results = [_render_job(*job) for job in jobs]
+
+    timings = {}
+    for description, seconds, error, records in results:
+        add_records(records)
+        timings[description] = seconds
+        if error:
+            logger.warning(f"Could not generate {description}: {error}")
+        else:
+            logger.info(f"Rendered {description} in {seconds:.2f}s")
+    return timings
 
 
 def generate_all_visualizations(df_original: pd.DataFrame, df_processed: pd.DataFrame,
                                final_rush: pd.DataFrame, sorted_data: pd.DataFrame,
-                               cm: np.ndarray, accuracy: float, cv_scores: np.ndarray = None):
-    """Generate all EDA and model evaluation plots."""
+                               cm: np.ndarray, accuracy: float, cv_scores: np.ndarray = None,
+                               workers: int = 1, jobs: list = None):
+    """
+    Generate all EDA and model evaluation plots (in a process pool when workers > 1).
+
+    `jobs` may be a list from an earlier `build_plot_jobs` call with the same inputs.
+    """
     logger.info("Generating all visualizations...")
     
     try:
+        start = time.perf_counter()
+
         # Data info file
         try:
             log_data_info(df_original)
         except Exception as e:
             logger.warning(f"Could not generate data info: {e}")
-        
-        # Missing values heatmap (optional - can be expensive for large datasets)
-        try:
-            if len(df_original) < 50000:  # Only for smaller datasets
-                plot_missing_values(df_original)
-        except Exception as e:
-            logger.warning(f"Could not generate missing values heatmap: {e}")
-        
-        # Room pricing plot
-        try:
-            data_completed = df_original[df_original['is_canceled'] == 0]
-            if not data_completed.empty and 'reserved_room_type' in df_original.columns and 'adr' in df_original.columns:
-                plot_room_price_boxplot(data_completed)
-        except Exception as e:
-            logger.warning(f"Could not generate room pricing plot: {e}")
-        
-        # Monthly guest trends
-        try:
-            if not final_rush.empty:
-                plot_monthly_guest_trends(final_rush)
-        except Exception as e:
-            logger.warning(f"Could not generate monthly trends plot: {e}")
-        
-        # ADR by month plots
-        try:
-            if 'arrival_date_month' in df_original.columns and 'adr' in df_original.columns:
-                plot_adr_by_month(df_original)
-                plot_adr_boxplot(df_original)
-        except Exception as e:
-            logger.warning(f"Could not generate ADR plots: {e}")
-        
-        # Weekend/weekday breakdown
-        try:
-            if not sorted_data.empty:
-                plot_weekend_weekday_breakdown(sorted_data)
-        except Exception as e:
-            logger.warning(f"Could not generate weekend/weekday plot: {e}")
-        
-        # Lead time plots
-        try:
-            if 'lead_time' in df_original.columns:
-                plot_lead_time_distribution(df_original)
-                plot_lead_time_by_cancellation(df_original)
-        except Exception as e:
-            logger.warning(f"Could not generate lead time plots: {e}")
-        
-        # ADR distribution before/after
-        try:
-            if 'adr' in df_processed.columns:
-                plot_adr_distribution_before(df_original)
-                plot_adr_distribution_after(df_processed)
-        except Exception as e:
-            logger.warning(f"Could not generate ADR distribution plots: {e}")
-        
-        # Correlation plots
-        try:
-            plot_correlation_heatmap(df_processed)
-            plot_cancellation_correlation(df_processed)
-        except Exception as e:
-            logger.warning(f"Could not generate correlation plots: {e}")
-        
-        # Model evaluation plots
+
+        if jobs is None:
+            jobs = build_plot_jobs(df_original, df_processed, final_rush, sorted_data, cm)
+        timings = render_plot_jobs(jobs, workers=workers)
+
         try:
-            plot_confusion_matrix(cm, "Logistic Regression - Confusion Matrix")
             save_model_metrics(accuracy, cm, cv_scores)
         except Exception as e:
-            logger.warning(f"Could not generate model evaluation plots: {e}")
+            logger.warning(f"Could not save model metrics: {e}")
         
-        logger.info("All visualizations generated successfully!")
+        logger.info(f"All visualizations generated in {time.perf_counter() - start:.2f}s "
+                    f"({len(timings)} plots, {sum(timings.values()):.2f}s of rendering, workers={workers})")
     except Exception as e:
         logger.error(f"Error generating visualizations: {str(e)}")
         raise
-
-
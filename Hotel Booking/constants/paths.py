@@ -7,6 +7,16 @@ import os
 PROJECT_ROOT = os.getcwd()
 DATA_DIR = os.path.join(PROJECT_ROOT, "Hotel Booking_DATA")
 DATA_FILE = "hotel_bookings.csv"
+DATA_CACHE_DIR = os.path.join(DATA_DIR, "cache")
 ARTIFACTS_DIR = os.path.join(PROJECT_ROOT, "artifacts")
+STAGE_CACHE_DIR = os.path.join(ARTIFACTS_DIR, "stage_cache")
+STAGE_CACHE_MAX_BYTES = 2 * 2 ** 30
+CHECKPOINT_DIR = os.path.join(ARTIFACTS_DIR, "checkpoints")
+RUN_REPORT_FILE = os.path.join(ARTIFACTS_DIR, "run_report.json")
+PROFILE_DIR = os.path.join(ARTIFACTS_DIR, "profile")
+REPORTS_DIR = os.path.join(ARTIFACTS_DIR, "reports")
 MODEL_DIR = os.path.join(ARTIFACTS_DIR, "models")
+REGISTRY_DIR = os.path.join(ARTIFACTS_DIR, "registry")
+OCCUPANCY_FILE = os.path.join(ARTIFACTS_DIR, "occupancy.npz")
 MODEL_FILE = "logistic_model.joblib"
+PREPROCESSOR_FILE = "preprocessor.joblib"
@@ -0,0 +1,47 @@
+import pandas as pd
+
+# Declared schema for hotel_bookings.csv.
+# Integer columns use the narrowest dtype that fits the published dataset;
+# the loader checks value ranges before narrowing and keeps the wider dtype
+# if a column does not fit. Nullable numeric columns stay floating point.
+
+# bump when the declared dtypes change so cached parses are invalidated
+SCHEMA_VERSION = 1
+
+MONTHS = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+          'August', 'September', 'October', 'November', 'December']
+
+CATEGORICAL_COLUMNS = [
+    'hotel', 'meal', 'country', 'market_segment', 'distribution_channel',
+    'reserved_room_type', 'assigned_room_type', 'deposit_type', 'customer_type',
+    'reservation_status',
+]
+
+DATE_COLUMNS = ['reservation_status_date']
+
+NUMERIC_DTYPES = {
+    'is_canceled': 'int8',
+    'lead_time': 'int16',
+    'arrival_date_year': 'int16',
+    'arrival_date_week_number': 'int8',
+    'arrival_date_day_of_month': 'int8',
+    'stays_in_weekend_nights': 'int16',
+    'stays_in_week_nights': 'int16',
+    'adults': 'int8',
+    'children': 'float32',
+    'babies': 'int8',
+    'is_repeated_guest': 'int8',
+    'previous_cancellations': 'int8',
+    'previous_bookings_not_canceled': 'int16',
+    'booking_changes': 'int8',
+    'agent': 'float32',
+    'company': 'float32',
+    'days_in_waiting_list': 'int16',
+    'adr': 'float32',
+    'required_car_parking_spaces': 'int8',
+    'total_of_special_requests': 'int8',
+}
+
+# dtypes that are safe to hand straight to the CSV reader
+READ_DTYPES = {col: 'category' for col in CATEGORICAL_COLUMNS}
+READ_DTYPES['arrival_date_month'] = pd.CategoricalDtype(MONTHS, ordered=True)
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Optional
 import os
 
 
@@ -6,6 +7,8 @@ import os
 class DataIngestionConfig:
     data_dir: str
     data_file: str
+    use_schema: bool = True
+    cache_dir: Optional[str] = None
 
     @property
     def data_path(self) -> str:
@@ -18,3 +21,12 @@ class TrainingConfig:
     random_state: int = 42
     model_dir: str = "artifacts/models"
     model_name: str = "logistic_model.joblib"
+    preprocessor_name: str = "preprocessor.joblib"
+    cv_folds: int = 10
+    cv_workers: int = 1
+    registry_dir: Optional[str] = None
+    # feature selection and model hyperparameters (see components.hyperparameter_search)
+    lasso_alpha: float = 0.005
+    C: float = 1.0
+    penalty: str = "l2"
+    class_weight: Optional[str] = None
@@ -1,14 +1,28 @@
 import logging
 import sys
+import threading
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# one stdout handler shared by every project logger, so console output can be
+# silenced or rerouted in one place (see utils.report_sink)
+_console_handler = None
+_console_lock = threading.Lock()
+
+
+def console_handler() -> logging.Handler:
+    global _console_handler
+    with _console_lock:
+        if _console_handler is None:
+            _console_handler = logging.StreamHandler(sys.stdout)
+            _console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    return _console_handler
 
 
 def get_logger(name: str = __name__):
     logger = logging.getLogger(name)
     if logger.handlers:
         return logger
-    handler = logging.StreamHandler(sys.stdout)
-    fmt = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    handler.setFormatter(logging.Formatter(fmt))
-    logger.addHandler(handler)
+    logger.addHandler(console_handler())
     logger.setLevel(logging.INFO)
     return logger
@@ -1,61 +1,343 @@
+import copy
+import dataclasses
 import os
 import sys
-import pandas as pd
+import time
 from entity.config_entity import DataIngestionConfig, TrainingConfig
+from components import (data_ingestion, monitoring, monthly_aggregation, occupancy, preprocessing,
+                        preprocessor as preprocessor_module)
 from components.data_ingestion import DataIngestion
-from components.preprocessing import preprocess_pipeline
-from components.trainer import Trainer
-from components.visualizations import generate_all_visualizations
-from constants import paths
+from components.monitoring import DataSketch
+from components.monthly_aggregation import MonthlyCounts
+from components.occupancy import OccupancyIndex
+from components.preprocessor import BookingPreprocessor
+from components.trainer import Trainer, hyperparameters, training_metrics
+from components.data_profile import set_report_level
+from components.output_reports import print_model_training_summary, print_stage_timings
+from constants import paths, schema
+from pipeline.scheduler import Checkpoint, Stage, StageScheduler
+from utils import instrumentation
+from utils.data_cache import content_hash
+from utils.stage_cache import StageCache, code_version
 from logger.log_config import get_logger
 
 logger = get_logger("run_pipeline")
 
+TARGET = 'is_canceled'
 
-def run():
+# matplotlib/seaborn (components.visualizations) and sklearn are imported by
+# the stages that plot or train, not when the pipeline module is imported, so
+# entry points and cache hits don't pay for them up front
+PLOT_MODULES = ("components.visualizations", "components.plot_reduction")
+TRAIN_MODULES = ("components.trainer", "components.cross_validation")
+SEARCH_REPORT_TOP = 20
+
+
+def _visualizations(render_options: dict = None):
+    """components.visualizations, imported on first use and configured with `render_options`."""
+    from components import visualizations
+
+    if render_options:
+        visualizations.configure_rendering(**render_options)
+    return visualizations
+
+
+def build_stages(data_cfg: DataIngestionConfig, train_cfg: TrainingConfig, low_memory: bool = False,
+                 plot_workers: int = 1, stage_cache: StageCache = None, render_options: dict = None) -> list:
+    """
+    The pipeline as a graph of stages.
+
+    Raw-data EDA plots depend only on ingestion, and cross-validation,
+    model persistence and confusion-matrix plotting each depend only on
+    what they read, so the scheduler can overlap them. Deterministic stages
+    are memoized in `stage_cache` under keys chained from the data file's
+    content hash (see utils.stage_cache). Plotting stages render with
+    `render_options` (dpi, fmt; see visualizations.configure_rendering).
+    """
+    memoize = stage_cache.memoize if stage_cache else (lambda stage, key, compute: compute())
+    file_key = stage_cache.file_fingerprint(data_cfg.data_path) if stage_cache else ""
+    data_key = StageCache.key("data", [file_key], code_version(data_ingestion, schema),
+                              {"use_schema": data_cfg.use_schema})
+    plots_version = code_version(*PLOT_MODULES)
+    train_version = code_version(*TRAIN_MODULES)
+    train_config = {k: v for k, v in dataclasses.asdict(train_cfg).items() if k not in ("cv_workers", "registry_dir")}
+
+    keys = {}
+    keys["monthly_counts"] = StageCache.key("monthly_counts", [data_key], code_version(monthly_aggregation))
+    keys["eda_plot_jobs"] = StageCache.key("eda_plot_jobs", [data_key, keys["monthly_counts"]], plots_version)
+    keys["preprocessor"] = StageCache.key("preprocessor", [data_key], code_version(preprocessor_module, preprocessing))
+    keys["preprocess"] = StageCache.key("preprocess", [keys["preprocessor"]], code_version(preprocessor_module))
+    keys["processed_plot_jobs"] = StageCache.key("processed_plot_jobs", [keys["preprocess"]], plots_version)
+    keys["select_features"] = StageCache.key("select_features", [keys["preprocess"]], train_version,
+                                             {"lasso_alpha": train_cfg.lasso_alpha})
+    keys["fit_model"] = StageCache.key("fit_model", [keys["preprocess"], keys["select_features"]],
+                                       train_version, train_config)
+    keys["occupancy_index"] = StageCache.key("occupancy_index", [data_key], code_version(occupancy))
+    keys["reference_sketch"] = StageCache.key("reference_sketch", [data_key], code_version(monitoring))
+    keys["cross_validate"] = StageCache.key("cross_validate", [keys["preprocess"], keys["preprocessor"],
+                                                               keys["select_features"]], train_version, train_config)
+    trainer = Trainer(train_cfg)
+
+    def features(df_processed):
+        return df_processed.drop(TARGET, axis=1), df_processed[TARGET]
+
+    def ingest():
+        return DataIngestion(data_cfg).load_data()
+
+    def monthly_counts(ingest):
+        return memoize("monthly_counts", keys["monthly_counts"], lambda: MonthlyCounts.from_frame(ingest))
+
+    def eda_plot_jobs(ingest, monthly_counts):
+        return memoize("eda_plot_jobs", keys["eda_plot_jobs"],
+                       lambda: _visualizations().build_eda_jobs(ingest, monthly_counts.final_rush(),
+                                                                monthly_counts.sorted_data()))
+
+    def eda_plots(ingest, eda_plot_jobs):
+        visualizations = _visualizations(render_options)
+        visualizations.log_data_info(ingest)
+        return visualizations.render_plot_jobs(eda_plot_jobs, workers=plot_workers)
+
+    def fit_preprocessor(ingest):
+        return memoize("preprocessor", keys["preprocessor"],
+                       lambda: BookingPreprocessor().fit(ingest, low_memory=low_memory, report=True))
+
+    def preprocess(ingest, fit_preprocessor):
+        # the training matrix is the fitted preprocessor's transform, the same one scoring uses
+        if TARGET not in ingest.columns:
+            raise ValueError(f"Target column `{TARGET}` not found in the bookings")
+        return memoize("preprocess", keys["preprocess"], lambda: fit_preprocessor.training_frame(ingest))
+
+    def occupancy_index(ingest):
+        index = memoize("occupancy_index", keys["occupancy_index"], lambda: OccupancyIndex.from_frame(ingest))
+        os.makedirs(os.path.dirname(paths.OCCUPANCY_FILE), exist_ok=True)
+        index.save(paths.OCCUPANCY_FILE)
+        return index
+
+    def reference_sketch(ingest):
+        return memoize("reference_sketch", keys["reference_sketch"], lambda: DataSketch.from_frame(ingest))
+
+    def processed_plot_jobs(preprocess):
+        return memoize("processed_plot_jobs", keys["processed_plot_jobs"],
+                       lambda: _visualizations().build_processed_jobs(preprocess))
+
+    def processed_plots(processed_plot_jobs):
+        return _visualizations(render_options).render_plot_jobs(processed_plot_jobs, workers=plot_workers)
+
+    def select_features(preprocess):
+        return memoize("select_features", keys["select_features"],
+                       lambda: trainer.select_features(*features(preprocess)))
+
+    def fit_model(preprocess, select_features):
+        return memoize("fit_model", keys["fit_model"],
+                       lambda: trainer.fit(*features(preprocess), select_features))
+
+    def cross_validate(ingest, preprocess, fit_preprocessor, select_features):
+        X, y = features(preprocess)
+        return memoize("cross_validate", keys["cross_validate"],
+                       lambda: trainer.cross_validate(X, y, select_features, preprocessor=fit_preprocessor,
+                                                      df_raw=ingest))
+
+    def persist_model(fit_model, fit_preprocessor, select_features):
+        # save() records the selected columns on the preprocessor; work on a copy
+        # so stages still reading the fitted one are unaffected
+        return trainer.save(fit_model["model"], copy.copy(fit_preprocessor), select_features)
+
+    def register_model(ingest, fit_model, fit_preprocessor, select_features, cross_validate, reference_sketch):
+        return trainer.register(fit_model["model"], fit_preprocessor, select_features, metadata={
+            "kind": "full",
+            "data_path": data_cfg.data_path,
+            "data_fingerprint": file_key or content_hash(data_cfg.data_path),
+            "rows": len(ingest),
+            "train_rows": fit_model.get("train_rows"),
+            "fit_seconds": fit_model.get("fit_seconds"),
+            "hyperparameters": hyperparameters(train_cfg),
+            "metrics": training_metrics(fit_model, cross_validate),
+        }, reference=reference_sketch)
+
+    def confusion_plot(fit_model):
+        visualizations = _visualizations(render_options)
+        return visualizations.render_plot_jobs(visualizations.build_model_jobs(fit_model["confusion_matrix"]))
+
+    def metrics_report(fit_model, cross_validate, persist_model, register_model):
+        logger.info(f"Training results: accuracy={fit_model['accuracy']:.4f}, "
+                    f"model_path={persist_model['model_path']}, version={register_model}")
+        _visualizations().save_model_metrics(fit_model["accuracy"], fit_model["confusion_matrix"], cross_validate)
+
+    return [
+        Stage("ingest", ingest, checkpoint=False),
+        Stage("monthly_counts", monthly_counts, ["ingest"]),
+        Stage("eda_plot_jobs", eda_plot_jobs, ["ingest", "monthly_counts"], checkpoint=False),
+        Stage("eda_plots", eda_plots, ["ingest", "eda_plot_jobs"], checkpoint=False),
+        Stage("fit_preprocessor", fit_preprocessor, ["ingest"]),
+        Stage("preprocess", preprocess, ["ingest", "fit_preprocessor"], checkpoint=False),
+        Stage("occupancy_index", occupancy_index, ["ingest"]),
+        Stage("reference_sketch", reference_sketch, ["ingest"]),
+        Stage("processed_plot_jobs", processed_plot_jobs, ["preprocess"], checkpoint=False),
+        Stage("processed_plots", processed_plots, ["processed_plot_jobs"], checkpoint=False),
+        Stage("select_features", select_features, ["preprocess"]),
+        Stage("fit_model", fit_model, ["preprocess", "select_features"]),
+        Stage("cross_validate", cross_validate, ["ingest", "preprocess", "fit_preprocessor", "select_features"]),
+        Stage("persist_model", persist_model, ["fit_model", "fit_preprocessor", "select_features"]),
+        Stage("register_model", register_model,
+              ["ingest", "fit_model", "fit_preprocessor", "select_features", "cross_validate",
+               "reference_sketch"]),
+        Stage("confusion_plot", confusion_plot, ["fit_model"], checkpoint=False),
+        Stage("metrics_report", metrics_report, ["fit_model", "cross_validate", "persist_model", "register_model"],
+              checkpoint=False),
+    ]
+
+
+def run(low_memory: bool = False, use_cache: bool = True, report_level: str = "full",
+        plot_workers: int = 1, plot_dpi: int = 300, plot_format: str = "png", cv_workers: int = 1,
+        use_stage_cache: bool = True, stage_workers: int = 4, resume: bool = False):
     logger.info("Starting pipeline run")
+    set_report_level(report_level)
+    if low_memory:
+        # process-global, so set before the scheduler starts any stage thread
+        preprocessing.enable_copy_on_write()
+    render_options = {"dpi": plot_dpi, "fmt": plot_format}
 
-    data_cfg = DataIngestionConfig(data_dir=paths.DATA_DIR, data_file=paths.DATA_FILE)
-    ingestion = DataIngestion(data_cfg)
-    df_original = ingestion.load_data()
+    data_cfg = DataIngestionConfig(data_dir=paths.DATA_DIR, data_file=paths.DATA_FILE,
+                                   cache_dir=paths.DATA_CACHE_DIR if use_cache else None)
+    train_cfg = TrainingConfig(cv_workers=cv_workers, registry_dir=paths.REGISTRY_DIR)
+    stage_cache = StageCache(paths.STAGE_CACHE_DIR, paths.STAGE_CACHE_MAX_BYTES) if use_stage_cache else None
+    stages = build_stages(data_cfg, train_cfg, low_memory=low_memory, plot_workers=plot_workers,
+                          stage_cache=stage_cache, render_options=render_options)
 
-    df_processed = preprocess_pipeline(df_original)
+    # a checkpoint is only resumed by a run with the same settings
+    signature = {"data_path": data_cfg.data_path, "use_schema": data_cfg.use_schema,
+                 "training": dataclasses.asdict(train_cfg), "report_level": report_level,
+                 "plot_dpi": plot_dpi, "plot_format": plot_format}
+    scheduler = StageScheduler(stages, max_workers=stage_workers,
+                               checkpoint=Checkpoint(paths.CHECKPOINT_DIR, signature))
+    instrumentation.reset()
+    try:
+        scheduler.run(resume=resume)
+        logger.info("Pipeline finished successfully!")
+    finally:
+        print_stage_timings(scheduler.timing_summary())
+        instrumentation.write_run_report(
+            paths.RUN_REPORT_FILE,
+            run=dict(signature, low_memory=low_memory, stage_workers=stage_workers, plot_workers=plot_workers,
+                     resume=resume, wall_seconds=round(scheduler.wall_seconds, 6)),
+            stages=scheduler.stage_records(),
+            critical_path=scheduler.critical_path(),
+        )
 
-    if 'is_canceled' not in df_processed.columns:
-        logger.error('Target column `is_canceled` not found after preprocessing')
-        return
 
-    X = df_processed.drop('is_canceled', axis=1)
-    y = df_processed['is_canceled']
 
-    train_cfg = TrainingConfig()
+def run_out_of_core(chunk_rows: int = 200_000, report_level: str = "full", plot_dpi: int = 300,
+                    plot_format: str = "png"):
+    """
+    Train on a bookings file that does not fit in memory (see components.out_of_core).
+
+    The file is streamed twice, once for the preprocessing statistics and once
+    to train, so only one chunk is held at a time. Steps that need the whole
+    frame are left out: the EDA and processed-data plots, Lasso feature
+    selection (all features are kept) and cross-validation. The model and
+    preprocessor are saved where the in-memory pipeline saves them, so
+    scoring works unchanged.
+    """
+    from components.out_of_core import fit_preprocessor_streaming, train_streaming
+
+    logger.info(f"Starting out-of-core pipeline run (chunks of {chunk_rows:,} rows)")
+    set_report_level(report_level)
+    data_cfg = DataIngestionConfig(data_dir=paths.DATA_DIR, data_file=paths.DATA_FILE)
+    train_cfg = TrainingConfig(registry_dir=paths.REGISTRY_DIR)
+    ingestion = DataIngestion(data_cfg)
     trainer = Trainer(train_cfg)
-    results = trainer.train(X, y)
+    instrumentation.reset()
+    start = time.perf_counter()
+    try:
+        # the training-data sketch is built on the statistics pass, one chunk at a time
+        reference = DataSketch()
+        preprocessor = fit_preprocessor_streaming(reference.observe(ingestion.iter_chunks(chunk_rows)))
+        fitted = train_streaming(lambda: ingestion.iter_chunks(chunk_rows), preprocessor, train_cfg)
+        print_model_training_summary((fitted["rows_trained"], len(preprocessor.feature_columns)),
+                                     (fitted["rows_tested"], len(preprocessor.feature_columns)),
+                                     "SGDClassifier(log_loss, streamed)", fitted["accuracy"],
+                                     fitted["confusion_matrix"])
+        persisted = trainer.save(fitted["model"], preprocessor, preprocessor.feature_columns)
+        version = trainer.register(fitted["model"], preprocessor, preprocessor.feature_columns, metadata={
+            "kind": "out_of_core",
+            "data_path": data_cfg.data_path,
+            "data_fingerprint": content_hash(data_cfg.data_path),
+            "rows": fitted["rows_trained"] + fitted["rows_tested"],
+            "train_rows": fitted["rows_trained"],
+            "chunk_rows": chunk_rows,
+            "metrics": training_metrics(fitted),
+        }, reference=reference)
+        visualizations = _visualizations({"dpi": plot_dpi, "fmt": plot_format})
+        visualizations.render_plot_jobs(visualizations.build_model_jobs(fitted["confusion_matrix"]))
+        visualizations.save_model_metrics(fitted["accuracy"], fitted["confusion_matrix"])
+        logger.info(f"Out-of-core pipeline finished: held-out accuracy={fitted['accuracy']:.4f}, "
+                    f"model_path={persisted['model_path']}, version={version}")
+    finally:
+        instrumentation.write_run_report(
+            paths.RUN_REPORT_FILE,
+            run={"data_path": data_cfg.data_path, "mode": "out_of_core", "chunk_rows": chunk_rows,
+                 "training": dataclasses.asdict(train_cfg),
+                 "wall_seconds": round(time.perf_counter() - start, 6)},
+        )
+
+
+def run_search(workers: int = 1, n_splits: int = 5, eta: int = 3, use_cache: bool = True,
+               report_level: str = "full", plot_dpi: int = 300, plot_format: str = "png"):
+    """
+    Tune the Lasso alpha, C, penalty and class weights, then train and register the best configuration.
 
-    logger.info(f"Training results: accuracy={results['accuracy']:.4f}, model_path={results['model_path']}")
-    
-    # Generate visualizations
-    logger.info("Generating visualizations and reports...")
+    Candidates are compared by successive halving on fixed folds (see
+    components.hyperparameter_search). The winner is trained like a regular
+    run, and the search summary and leaderboard go into its registry metadata.
+    """
+    from components.cross_validation import build_base_matrix
+    from components.hyperparameter_search import SearchSpace, successive_halving
+    from components.output_reports import print_search_leaderboard
+
+    logger.info(f"Starting hyperparameter search ({n_splits} folds, eta={eta}, {workers} worker(s))")
+    set_report_level(report_level)
+    data_cfg = DataIngestionConfig(data_dir=paths.DATA_DIR, data_file=paths.DATA_FILE,
+                                   cache_dir=paths.DATA_CACHE_DIR if use_cache else None)
+    base_cfg = TrainingConfig(registry_dir=paths.REGISTRY_DIR)
+    instrumentation.reset()
+    start = time.perf_counter()
     try:
-        final_rush = pd.DataFrame()  # Empty placeholder
-        sorted_data = pd.DataFrame()  # Empty placeholder
-        accuracy = results['accuracy']
-        cm = results['confusion_matrix']
-        cv_scores = results.get('cv_scores', None)
-        
-        generate_all_visualizations(
-            df_original=df_original,
-            df_processed=df_processed,
-            final_rush=final_rush,
-            sorted_data=sorted_data,
-            cm=cm,
-            accuracy=accuracy,
-            cv_scores=cv_scores
+        df = DataIngestion(data_cfg).load_data()
+        preprocessor = BookingPreprocessor().fit(df, report=True)
+        result = successive_halving(build_base_matrix(df, preprocessor), SearchSpace(), n_splits=n_splits,
+                                    workers=workers, eta=eta, random_state=base_cfg.random_state)
+        print_search_leaderboard(result, top=SEARCH_REPORT_TOP)
+
+        train_cfg = dataclasses.replace(base_cfg, **result.best)
+        trainer = Trainer(train_cfg)
+        df_processed = preprocessor.training_frame(df)
+        X, y = df_processed.drop(TARGET, axis=1), df_processed[TARGET]
+        selected = trainer.select_features(X, y)
+        fitted = trainer.fit(X, y, selected)
+        persisted = trainer.save(fitted["model"], copy.copy(preprocessor), selected)
+        version = trainer.register(fitted["model"], preprocessor, selected, metadata={
+            "kind": "search",
+            "data_path": data_cfg.data_path,
+            "data_fingerprint": content_hash(data_cfg.data_path),
+            "rows": len(df),
+            "train_rows": fitted["train_rows"],
+            "fit_seconds": fitted["fit_seconds"],
+            "hyperparameters": result.best,
+            "metrics": training_metrics(fitted, result.leaderboard[0]["scores"]),
+            "search": result.summary(),
+        }, reference=DataSketch.from_frame(df))
+        visualizations = _visualizations({"dpi": plot_dpi, "fmt": plot_format})
+        visualizations.render_plot_jobs(visualizations.build_model_jobs(fitted["confusion_matrix"]))
+        visualizations.save_model_metrics(fitted["accuracy"], fitted["confusion_matrix"])
+        logger.info(f"Search pipeline finished: {result.best}, accuracy={fitted['accuracy']:.4f}, "
+                    f"model_path={persisted['model_path']}, version={version}")
+        return result
+    finally:
+        instrumentation.write_run_report(
+            paths.RUN_REPORT_FILE,
+            run={"data_path": data_cfg.data_path, "mode": "search", "n_splits": n_splits, "eta": eta,
+                 "workers": workers, "wall_seconds": round(time.perf_counter() - start, 6)},
         )
-        logger.info("Visualizations generated successfully!")
-    except Exception as e:
-        logger.error(f"Error generating visualizations: {str(e)}")
-        raise
 
 
 if __name__ == '__main__':
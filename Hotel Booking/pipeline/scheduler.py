@@ -0,0 +1,306 @@
+"""Dependency-graph scheduler for pipeline stages, with checkpoint/resume and timing reports."""
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import joblib
+from utils import report_sink
+from logger.log_config import get_logger
+from exception.custom_exception import CustomException
+
+logger = get_logger("scheduler")
+
+STATE_FILE = "state.json"
+
+
+@dataclass
+class Stage:
+    """
+    One node of the pipeline graph.
+
+    `func` is called with the outputs of `deps` as keyword arguments (named
+    after the dependency). Outputs of stages with `checkpoint=True` are saved
+    so a resumed run can skip them; cheap or already-cached stages can opt out.
+    """
+    name: str
+    func: Callable[..., Any]
+    deps: List[str] = field(default_factory=list)
+    checkpoint: bool = True
+
+
+@dataclass
+class StageRecord:
+    name: str
+    status: str = "pending"  # ran, resumed, failed, skipped
+    start: float = 0.0
+    seconds: float = 0.0
+    thread: str = ""
+    error: Optional[str] = None
+
+
+class Checkpoint:
+    """Completed-stage outputs of one run signature, stored under `checkpoint_dir`."""
+
+    def __init__(self, checkpoint_dir: str, signature: dict):
+        self.checkpoint_dir = checkpoint_dir
+        self.signature = signature
+        self._lock = threading.Lock()
+
+    @property
+    def state_path(self) -> str:
+        return os.path.join(self.checkpoint_dir, STATE_FILE)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.checkpoint_dir, f"{name}.joblib")
+
+    def reset(self) -> None:
+        if os.path.isdir(self.checkpoint_dir):
+            shutil.rmtree(self.checkpoint_dir)
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        self._write_state({"signature": self.signature, "completed": {}})
+
+    def _read_state(self) -> dict:
+        try:
+            with open(self.state_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_state(self, state: dict) -> None:
+        tmp = self.state_path + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp, self.state_path)
+
+    def completed(self) -> Dict[str, bool]:
+        """
+        {stage: output saved} for stages completed by an earlier run with the
+        same signature; empty if the signatures differ.
+        """
+        state = self._read_state()
+        if state.get("signature") != json.loads(json.dumps(self.signature, default=str)):
+            if state:
+                logger.info("Checkpoint belongs to a run with different settings; starting from scratch")
+            return {}
+        return {name: saved and os.path.exists(self._path(name))
+                for name, saved in state.get("completed", {}).items()}
+
+    def load(self, name: str) -> Any:
+        return joblib.load(self._path(name))
+
+    def mark_done(self, name: str, value: Any = None, save_output: bool = True) -> None:
+        """Record `name` as completed, saving its output unless `save_output` is False."""
+        if save_output:
+            tmp = self._path(name) + ".tmp"
+            joblib.dump(value, tmp)
+            os.replace(tmp, self._path(name))
+        with self._lock:
+            state = self._read_state()
+            state.setdefault("completed", {})[name] = save_output
+            self._write_state(state)
+
+
+class _InlineExecutor:
+    """Executor that runs each task immediately in the calling thread."""
+
+    def submit(self, fn, *args) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class StageScheduler:
+    """
+    Runs a graph of `Stage`s on a thread pool, starting each stage as soon as
+    its dependencies have finished.
+
+    If a stage fails, stages that depend on it are skipped while independent
+    branches keep running; the error is raised once the graph has drained.
+    With a `checkpoint`, finished outputs are saved and `run(resume=True)`
+    picks up from the stages that did not complete. With `max_workers <= 1`
+    stages run one at a time in the calling thread (e.g. under cProfile).
+    """
+
+    def __init__(self, stages: List[Stage], max_workers: int = 4, checkpoint: Optional[Checkpoint] = None):
+        self.stages = {s.name: s for s in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("Stage names must be unique")
+        for stage in stages:
+            missing = [d for d in stage.deps if d not in self.stages]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stage(s) {missing}")
+        self.order = self._topological_order()
+        self.max_workers = max_workers
+        self.checkpoint = checkpoint
+        self.records: Dict[str, StageRecord] = {}
+        self.wall_seconds = 0.0
+
+    def _topological_order(self) -> List[str]:
+        order, state = [], {}
+
+        def visit(name, path):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Cycle in stage graph: {' -> '.join(path + [name])}")
+            state[name] = "visiting"
+            for dep in self.stages[name].deps:
+                visit(dep, path + [name])
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.stages:
+            visit(name, [])
+        return order
+
+    def _needed(self, completed: Dict[str, bool]) -> set:
+        """
+        Stages to execute: those not completed before, plus completed stages
+        without a saved output whose output an executing stage consumes.
+        """
+        needed = set()
+        for name in reversed(self.order):
+            if name not in completed:
+                needed.add(name)
+            elif not completed[name] and any(name in self.stages[n].deps for n in needed):
+                needed.add(name)
+        return needed
+
+    def _execute(self, name: str, outputs: Dict[str, Any], start_time: float):
+        stage = self.stages[name]
+        record = self.records[name]
+        record.thread = threading.current_thread().name
+        record.start = time.perf_counter() - start_time
+        began = time.perf_counter()
+        try:
+            value = stage.func(**{dep: outputs[dep] for dep in stage.deps})
+        finally:
+            record.seconds = time.perf_counter() - began
+        if self.checkpoint is not None:
+            self.checkpoint.mark_done(name, value, save_output=stage.checkpoint)
+        return value
+
+    def run(self, resume: bool = False) -> Dict[str, Any]:
+        """Run the graph and return every stage's output by name."""
+        self.records = {name: StageRecord(name) for name in self.order}
+        outputs: Dict[str, Any] = {}
+        completed: Dict[str, bool] = {}
+        if self.checkpoint is not None:
+            if resume:
+                completed = {n: saved for n, saved in self.checkpoint.completed().items() if n in self.stages}
+            else:
+                self.checkpoint.reset()
+
+        needed = self._needed(completed)
+        for name, saved in completed.items():
+            if name not in needed:
+                if saved:
+                    outputs[name] = self.checkpoint.load(name)
+                self.records[name].status = "resumed"
+        if completed:
+            logger.info(f"Resuming from checkpoint: {sorted(set(completed) - needed)} already completed")
+
+        start_time = time.perf_counter()
+        pending = [n for n in self.order if n in needed]
+        failed: Dict[str, BaseException] = {}
+        pool = (ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="stage")
+                if self.max_workers > 1 else _InlineExecutor())
+        with pool:
+            running = {}
+            while pending or running:
+                for name in list(pending):
+                    deps = self.stages[name].deps
+                    if any(self.records[d].status in ("failed", "skipped") for d in deps):
+                        self.records[name].status = "skipped"
+                        pending.remove(name)
+                    elif all(d in outputs for d in deps):
+                        pending.remove(name)
+                        running[pool.submit(self._execute, name, outputs, start_time)] = name
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        outputs[name] = future.result()
+                        self.records[name].status = "ran"
+                    except Exception as e:
+                        self.records[name].status = "failed"
+                        self.records[name].error = str(e)
+                        failed[name] = e
+                        logger.error(f"Stage '{name}' failed: {e}")
+                    report_sink.emit("stage", name, asdict(self.records[name]))
+        self.wall_seconds = time.perf_counter() - start_time
+
+        if failed:
+            name, error = next(iter(failed.items()))
+            skipped = [n for n, r in self.records.items() if r.status == "skipped"]
+            hint = " Re-run with resume to continue from the completed stages." if self.checkpoint else ""
+            raise CustomException(f"Stage '{name}' failed (skipped: {skipped}).{hint}", error)
+        return outputs
+
+    def stage_records(self) -> List[dict]:
+        return [asdict(self.records[name]) for name in self.order]
+
+    def critical_path(self) -> List[str]:
+        """Longest chain of dependent stages by measured duration."""
+        finish, previous = {}, {}
+        for name in self.order:
+            deps = self.stages[name].deps
+            best = max(deps, key=lambda d: finish[d], default=None)
+            finish[name] = self.records[name].seconds + (finish[best] if best else 0.0)
+            previous[name] = best
+        if not finish:
+            return []
+        node = max(finish, key=finish.get)
+        path = []
+        while node is not None:
+            path.append(node)
+            node = previous[node]
+        return path[::-1]
+
+    def timing_summary(self) -> dict:
+        """Plain-JSON form of the timings (stage rows in report order, critical path, totals)."""
+        executed = ("ran", "failed")
+        names = sorted(self.order, key=lambda n: (self.records[n].status not in executed,
+                                                  self.records[n].start, self.order.index(n)))
+        path = self.critical_path()
+        return {
+            "stages": [asdict(self.records[name]) for name in names],
+            "critical_path": path,
+            "critical_path_seconds": sum(self.records[n].seconds for n in path),
+            "wall_seconds": self.wall_seconds,
+            "busy_seconds": sum(r.seconds for r in self.records.values()),
+            "workers": self.max_workers,
+        }
+
+    def timing_report(self) -> str:
+        """Per-stage status, start offset and duration, followed by the critical path."""
+        return format_timing_report(self.timing_summary())
+
+
+def format_timing_report(summary: dict) -> str:
+    """Text table of a `StageScheduler.timing_summary`."""
+    output = []
+    output.append(f"{'stage':<22} {'status':<9} {'start (s)':>10} {'duration (s)':>13}  thread")
+    for r in summary["stages"]:
+        output.append(f"{r['name']:<22} {r['status']:<9} {r['start']:>10.2f} {r['seconds']:>13.2f}  {r['thread']}")
+    output.append("")
+    output.append(f"Critical path ({summary['critical_path_seconds']:.2f}s): {' -> '.join(summary['critical_path'])}")
+    output.append(f"Wall time: {summary['wall_seconds']:.2f}s, sum of stage times: {summary['busy_seconds']:.2f}s "
+                  f"(workers={summary['workers']})")
+    return "\n".join(output)
@@ -0,0 +1,196 @@
+"""On-disk columnar cache of parsed datasets, keyed by a fingerprint of the source file."""
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from logger.log_config import get_logger
+
+logger = get_logger("data_cache")
+
+MANIFEST_FILE = "manifest.json"
+HASH_CHUNK_SIZE = 8 * 2 ** 20
+
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow.feather  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def content_hash(path: str) -> str:
+    """BLAKE2b digest of the file contents, read in fixed-size chunks."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_npz(df: pd.DataFrame, path: str) -> None:
+    """Fallback writer: one array per column, categoricals stored as codes + categories."""
+    arrays = {"__index__": df.index.to_numpy()}
+    meta = {"columns": [], "kinds": {}}
+    for i, col in enumerate(df.columns):
+        key = f"c{i}"
+        series = df[col]
+        meta["columns"].append(col)
+        if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            arrays[key] = series.to_numpy()
+            meta["kinds"][key] = "numeric"
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            arrays[key] = series.to_numpy().astype('datetime64[ns]').view('int64')
+            meta["kinds"][key] = "datetime"
+        else:
+            is_cat = isinstance(series.dtype, pd.CategoricalDtype)
+            cat = series.cat if is_cat else series.astype('category').cat
+            arrays[key] = cat.codes.to_numpy()
+            arrays[key + "_categories"] = cat.categories.astype(str).to_numpy(dtype=str)
+            meta["kinds"][key] = "category" if is_cat else "object"
+            meta.setdefault("ordered", {})[key] = bool(cat.ordered)
+    arrays["__meta__"] = np.array(json.dumps(meta))
+    np.savez(path, **arrays)
+
+
+def _read_npz(path: str) -> pd.DataFrame:
+    with np.load(path, allow_pickle=False) as data:
+        meta = json.loads(str(data["__meta__"]))
+        columns = {}
+        for i, col in enumerate(meta["columns"]):
+            key = f"c{i}"
+            kind = meta["kinds"][key]
+            if kind == "numeric":
+                columns[col] = data[key]
+            elif kind == "datetime":
+                columns[col] = data[key].view('datetime64[ns]')
+            else:
+                values = pd.Categorical.from_codes(data[key], data[key + "_categories"],
+                                                   ordered=meta["ordered"][key])
+                columns[col] = values if kind == "category" else np.asarray(values.astype(object))
+        return pd.DataFrame(columns, index=data["__index__"])
+
+
+class DatasetCache:
+    """
+    Stores a parsed DataFrame once in a columnar binary file and reloads it on later runs.
+
+    Entries are keyed by the source file's size, mtime and content hash plus a
+    caller-supplied `variant` (e.g. the loader schema version). When size and
+    mtime are unchanged the stored hash is trusted; otherwise the file is
+    re-hashed, so a touched-but-identical file is still a cache hit.
+    Feather (memory-mapped on read) is used when pyarrow is installed, NPZ otherwise.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.cache_dir, MANIFEST_FILE)
+
+    def _read_manifest(self) -> dict:
+        if not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            logger.warning(f"Ignoring unreadable cache manifest {self.manifest_path}")
+            return {}
+
+    def _write_manifest(self, manifest: dict) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp, self.manifest_path)
+
+    @staticmethod
+    def _entry_key(source: str, variant: str) -> str:
+        return f"{os.path.abspath(source)}::{variant}"
+
+    def _fingerprint(self, source: str, entry: Optional[dict]) -> dict:
+        stat = os.stat(source)
+        fingerprint = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            fingerprint["hash"] = entry["hash"]
+        else:
+            fingerprint["hash"] = content_hash(source)
+        return fingerprint
+
+    def load(self, source: str, variant: str = "") -> Optional[pd.DataFrame]:
+        """Return the cached frame for `source`, or None if there is no valid entry."""
+        manifest = self._read_manifest()
+        key = self._entry_key(source, variant)
+        entry = manifest.get(key)
+        if entry is None:
+            return None
+        fingerprint = self._fingerprint(source, entry)
+        if fingerprint["size"] != entry["size"] or fingerprint["hash"] != entry["hash"]:
+            logger.info(f"Cache entry for {source} is stale")
+            return None
+        path = os.path.join(self.cache_dir, entry["file"])
+        if not os.path.exists(path):
+            return None
+        if fingerprint["mtime_ns"] != entry["mtime_ns"]:
+            # same content, new mtime: refresh so the next run skips hashing
+            entry["mtime_ns"] = fingerprint["mtime_ns"]
+            self._write_manifest(manifest)
+
+        start = time.perf_counter()
+        if entry["format"] == "feather":
+            import pyarrow.feather as feather
+            df = feather.read_table(path, memory_map=True).to_pandas()
+        else:
+            df = _read_npz(path)
+        logger.info(f"Warm load from cache {path} in {time.perf_counter() - start:.3f}s "
+                    f"(CSV parse took {entry['parse_seconds']:.3f}s)")
+        return df
+
+    def save(self, source: str, df: pd.DataFrame, variant: str = "", parse_seconds: float = 0.0) -> str:
+        """Write `df` to the cache as the parsed form of `source`."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        manifest = self._read_manifest()
+        key = self._entry_key(source, variant)
+        fingerprint = self._fingerprint(source, None)
+        stem = f"{os.path.splitext(os.path.basename(source))[0]}-{fingerprint['hash'][:12]}"
+        if variant:
+            stem += f"-{variant}"
+
+        start = time.perf_counter()
+        if _has_pyarrow():
+            import pyarrow.feather as feather
+            filename, fmt = stem + ".feather", "feather"
+            feather.write_feather(df, os.path.join(self.cache_dir, filename), compression='uncompressed')
+        else:
+            filename, fmt = stem + ".npz", "npz"
+            _write_npz(df, os.path.join(self.cache_dir, filename))
+
+        old = manifest.get(key)
+        if old and old["file"] != filename:
+            self._remove_file(old["file"])
+        manifest[key] = dict(fingerprint, file=filename, format=fmt, variant=variant,
+                             parse_seconds=parse_seconds, rows=len(df))
+        self._write_manifest(manifest)
+        logger.info(f"Cold load: parsed CSV in {parse_seconds:.3f}s, wrote {fmt} cache "
+                    f"{filename} in {time.perf_counter() - start:.3f}s")
+        return os.path.join(self.cache_dir, filename)
+
+    def _remove_file(self, filename: str) -> None:
+        path = os.path.join(self.cache_dir, filename)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def clear(self) -> None:
+        """Remove every cached dataset."""
+        if os.path.isdir(self.cache_dir):
+            shutil.rmtree(self.cache_dir)
+            logger.info(f"Cleared dataset cache at {self.cache_dir}")
+        else:
+            logger.info(f"No dataset cache at {self.cache_dir}")
@@ -1,21 +1,42 @@
+import glob
 import os
-import joblib
-import pandas as pd
-from typing import Any
+from typing import Any, List, Optional
+
+# joblib and pandas are imported where used, so importing the helpers (e.g. via
+# the model registry in a scoring process) does not load them
 
 
 def ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
-def read_csv(path: str) -> pd.DataFrame:
+def read_csv(path: str):
+    import pandas as pd
+
     return pd.read_csv(path)
 
 
 def save_model(obj: Any, path: str) -> None:
+    import joblib
+
     ensure_dir(os.path.dirname(path))
     joblib.dump(obj, path)
 
 
-def load_model(path: str) -> Any:
-    return joblib.load(path)
+def load_model(path: str, mmap_mode: Optional[str] = None) -> Any:
+    """Load a joblib artifact; with `mmap_mode` (e.g. 'r') its large numpy arrays are memory-mapped, not read."""
+    import joblib
+
+    return joblib.load(path, mmap_mode=mmap_mode)
+
+
+def list_inputs(path: str) -> List[str]:
+    """A CSV file, or every *.csv file in a directory (sorted)."""
+    if os.path.isdir(path):
+        files = sorted(glob.glob(os.path.join(path, "*.csv")))
+        if not files:
+            raise FileNotFoundError(f"No CSV files found in {path}")
+        return files
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Input not found at {path}")
+    return [path]
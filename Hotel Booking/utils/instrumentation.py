@@ -0,0 +1,258 @@
+"""Per-call timing, CPU, memory and row-count instrumentation, plus optional whole-run profiling."""
+import contextlib
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Callable, List, Optional
+
+from logger.log_config import get_logger
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+logger = get_logger("instrumentation")
+
+_records: List[dict] = []
+_records_lock = threading.Lock()
+_local = threading.local()
+_t0 = time.perf_counter()
+
+
+def _rows(obj: Any) -> Optional[int]:
+    """Row count of a DataFrame/Series/ndarray (or the first one in a tuple), else None."""
+    if isinstance(obj, tuple) and obj:
+        return _rows(obj[0])
+    shape = getattr(obj, "shape", None)
+    if isinstance(shape, tuple) and shape:
+        return int(shape[0])
+    return None
+
+
+def _first_rows(args: tuple, kwargs: dict) -> Optional[int]:
+    for value in list(args) + list(kwargs.values()):
+        rows = _rows(value)
+        if rows is not None:
+            return rows
+    return None
+
+
+def _rss_high_water_mb() -> float:
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+class _Frame:
+    def __init__(self):
+        self.mem_start = 0
+        self.mem_max = 0
+
+
+@contextlib.contextmanager
+def measure(name: str, rows_in: Optional[int] = None):
+    """
+    Time the enclosed block and add a record for it.
+
+    Yields a dict; set `rows_out` on it to report output rows. Peak memory is
+    the rise in traced allocations while tracemalloc is on (see `profiled`),
+    otherwise the rise in the process's RSS high-water mark. Both are
+    process-wide, so concurrent blocks share each other's peaks. CPU time
+    is that of the calling thread.
+    """
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    tracing = tracemalloc.is_tracing()
+    frame = _Frame()
+    if tracing:
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            stack[-1].mem_max = max(stack[-1].mem_max, peak)
+        tracemalloc.reset_peak()
+        frame.mem_start = frame.mem_max = current
+    else:
+        frame.mem_start = _rss_high_water_mb()
+    stack.append(frame)
+
+    record = {"name": name, "thread": threading.current_thread().name, "depth": len(stack) - 1,
+              "rows_in": rows_in, "rows_out": None}
+    start, cpu_start = time.perf_counter(), time.thread_time()
+    try:
+        yield record
+    except BaseException as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        record["start_seconds"] = round(start - _t0, 6)
+        record["wall_seconds"] = round(time.perf_counter() - start, 6)
+        record["cpu_seconds"] = round(time.thread_time() - cpu_start, 6)
+        stack.pop()
+        if tracing and tracemalloc.is_tracing():
+            _, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, frame.mem_max)
+            record["peak_memory_delta_mb"] = round((peak - frame.mem_start) / 2 ** 20, 3)
+            record["memory_source"] = "tracemalloc"
+            if stack:
+                stack[-1].mem_max = max(stack[-1].mem_max, peak)
+        else:
+            record["peak_memory_delta_mb"] = round(_rss_high_water_mb() - frame.mem_start, 3)
+            record["memory_source"] = "rss_high_water"
+        with _records_lock:
+            _records.append(record)
+
+
+def instrument(name: Optional[str] = None) -> Callable:
+    """Decorator recording each call with `measure`; rows in/out come from the first frame-like argument and the result."""
+    def decorator(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with measure(label, rows_in=_first_rows(args, kwargs)) as record:
+                result = func(*args, **kwargs)
+                record["rows_out"] = _rows(result)
+                return result
+        return wrapper
+    return decorator
+
+
+def get_records() -> List[dict]:
+    with _records_lock:
+        return list(_records)
+
+
+def drain_records() -> List[dict]:
+    """Return and clear the records of this process (used to ship them back from worker processes)."""
+    with _records_lock:
+        records = list(_records)
+        _records.clear()
+        return records
+
+
+def add_records(records: List[dict]) -> None:
+    with _records_lock:
+        _records.extend(records)
+
+
+def reset() -> None:
+    global _t0
+    with _records_lock:
+        _records.clear()
+    _t0 = time.perf_counter()
+
+
+def summarize(records: List[dict]) -> List[dict]:
+    """Totals per instrumented name, slowest first."""
+    totals = {}
+    for r in records:
+        t = totals.setdefault(r["name"], {"name": r["name"], "calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0,
+                                          "max_peak_memory_delta_mb": 0.0})
+        t["calls"] += 1
+        t["wall_seconds"] = round(t["wall_seconds"] + r["wall_seconds"], 6)
+        t["cpu_seconds"] = round(t["cpu_seconds"] + r["cpu_seconds"], 6)
+        t["max_peak_memory_delta_mb"] = max(t["max_peak_memory_delta_mb"], r["peak_memory_delta_mb"])
+    return sorted(totals.values(), key=lambda t: t["wall_seconds"], reverse=True)
+
+
+def write_run_report(path: str, **sections) -> str:
+    """Write the recorded calls (plus any extra `sections`) as a JSON run report."""
+    records = get_records()
+    report = dict(sections)
+    report["summary"] = summarize(records)
+    report["calls"] = records
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2, default=str)
+    logger.info(f"Run report with {len(records)} instrumented calls saved to {path}")
+    return path
+
+
+class StackSampler:
+    """
+    Samples the Python stacks of every thread at a fixed interval and counts
+    them in the folded format ("a;b;c count") read by flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.counts = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            if len(names) != threading.active_count():
+                names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.counts[";".join(reversed(stack))] += 1
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._sample, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def write_folded(self, path: str) -> None:
+        with open(path, 'w') as f:
+            for stack, count in self.counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+@contextlib.contextmanager
+def profiled(output_dir: str, name: str = "run"):
+    """
+    Profile the enclosed block: cProfile of the calling thread (`<name>.prof`
+    and a text summary), folded stacks of all threads for a flame graph
+    (`<name>.folded`), and tracemalloc-based peak memory in the instrumentation
+    records.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    profiler = cProfile.Profile()
+    sampler = StackSampler()
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    sampler.start()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        sampler.stop()
+        if started_tracing:
+            tracemalloc.stop()
+        prof_path = os.path.join(output_dir, f"{name}.prof")
+        profiler.dump_stats(prof_path)
+        text = io.StringIO()
+        pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(40)
+        with open(os.path.join(output_dir, f"{name}_pstats.txt"), 'w') as f:
+            f.write(text.getvalue())
+        folded_path = os.path.join(output_dir, f"{name}.folded")
+        sampler.write_folded(folded_path)
+        logger.info(f"Profile saved to {prof_path} (cProfile) and {folded_path} "
+                    f"(folded stacks for flamegraph.pl / speedscope)")
@@ -1,17 +1,19 @@
 """Model inspection and verification utility."""
 import os
 from utils.helpers import load_model
+from utils.model_registry import ModelRegistry
 from logger.log_config import get_logger
 
 logger = get_logger("model_inspector")
 
 
-def inspect_model(model_path: str) -> None:
+def inspect_model(model_path: str, mmap_mode: str = None) -> None:
     """
     Load and inspect a saved scikit-learn model.
     
     Args:
         model_path: Path to the .joblib model file
+        mmap_mode: Memory-map the model's arrays instead of reading them (e.g. 'r')
         
     Raises:
         FileNotFoundError: If model file does not exist
@@ -22,7 +24,7 @@ def inspect_model(model_path: str) -> None:
             raise FileNotFoundError(f"Model file not found at {model_path}")
         
         logger.info(f"Loading model from: {model_path}")
-        model = load_model(model_path)
+        model = load_model(model_path, mmap_mode=mmap_mode)
         
         logger.info(f"Model type: {type(model).__name__}")
         logger.info(f"Model class: {model.__class__.__module__}.{model.__class__.__name__}")
@@ -49,6 +51,54 @@ def inspect_model(model_path: str) -> None:
         raise
 
 
+
+def describe_version(registry: ModelRegistry, version: str = None) -> str:
+    """Text report of one registered version: metadata and coefficients (read from the native export)."""
+    meta = registry.metadata(version)
+    preprocessor, coef, intercept = registry.load_native(meta["version"])
+    output = []
+    output.append(f"Version: {meta['version']}{'  (current)' if meta['version'] == registry.current_version() else ''}")
+    for key in ("created_at", "parent", "kind", "model_class", "data_path", "data_fingerprint", "rows",
+                "train_rows", "fit_seconds", "hyperparameters"):
+        if meta.get(key) is not None:
+            output.append(f"{key + ':':<18} {meta[key]}")
+    for name, value in meta.get("metrics", {}).items():
+        output.append(f"{'metric ' + name + ':':<18} {value}")
+    output.append("")
+    output.append(f"{'feature':<34} {'coefficient':>12}")
+    for feature, weight in zip(preprocessor.output_columns, coef):
+        output.append(f"{feature:<34} {weight:>12.5f}")
+    output.append(f"{'(intercept)':<34} {intercept:>12.5f}")
+    output.append(f"Encoded columns: {', '.join(sorted(preprocessor.encodings))}")
+    return "\n".join(output)
+
+
+def describe_diff(diff: dict) -> str:
+    """Text report of `ModelRegistry.diff`."""
+    output = []
+    output.append(f"{diff['a']} -> {diff['b']}")
+    output.append("")
+    output.append("Metadata changes:")
+    for key, (a, b) in diff["metadata"].items():
+        output.append(f"  {key}: {a} -> {b}")
+    if diff["features_added"] or diff["features_removed"]:
+        output.append(f"Features added: {diff['features_added']}  removed: {diff['features_removed']}")
+    output.append("")
+    output.append(f"{'feature':<34} {diff['a']:>10} {diff['b']:>10} {'delta':>10}")
+    for feature, (a, b) in diff["coefficients"].items():
+        delta = f"{b - a:>10.5f}" if a is not None and b is not None else f"{'-':>10}"
+        fmt = lambda v: f"{v:>10.5f}" if v is not None else f"{'-':>10}"
+        output.append(f"{feature:<34} {fmt(a)} {fmt(b)} {delta}")
+    a, b = diff["intercept"]
+    output.append(f"{'(intercept)':<34} {a:>10.5f} {b:>10.5f} {b - a:>10.5f}")
+    output.append("")
+    output.append(f"Prior: {diff['prior'][0]:.5f} -> {diff['prior'][1]:.5f}")
+    output.append(f"{'encoded column':<24} {'max |delta|':>12}  categories added / removed")
+    for col, enc in diff["encodings"].items():
+        output.append(f"{col:<24} {enc['max_abs_diff']:>12.6f}  {enc['added'] or '-'} / {enc['removed'] or '-'}")
+    return "\n".join(output)
+
+
 if __name__ == '__main__':
     # Standalone verification script
     model_path = os.path.join(os.getcwd(), 'artifacts', 'models', 'logistic_model.joblib')
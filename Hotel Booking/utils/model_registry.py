@@ -0,0 +1,232 @@
+"""
+Versioned model registry: immutable model versions with metadata and a "current" pointer.
+
+Layout under the registry root:
+    CURRENT                      id of the current version
+    versions/v0001/
+        logistic_model.joblib    fitted model (pickled)
+        preprocessor.joblib      fitted BookingPreprocessor (pickled)
+        coefficients.npz         native export: coef, intercept, feature names
+        preprocessing.json       native export: BookingPreprocessor.to_dict()
+        reference_sketch.json    sketch of the training data, for drift monitoring (optional)
+        metadata.json            data fingerprint, metrics, features, training time, ...
+
+A version directory is assembled under a temporary name and renamed into
+place, and its files are made read-only, so a version never changes once
+registered. Each version directory can also be passed anywhere a model
+directory is expected. Scoring loads the native export (`load_native`) in
+milliseconds without unpickling sklearn objects.
+"""
+import json
+import os
+import shutil
+import stat
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+from components.native_scoring import NATIVE_COEF_FILE, NATIVE_PREPROCESSING_FILE
+from utils.helpers import load_model, save_model
+from logger.log_config import get_logger
+from exception.custom_exception import CustomException
+
+logger = get_logger("model_registry")
+
+CURRENT_FILE = "CURRENT"
+VERSIONS_DIR = "versions"
+METADATA_FILE = "metadata.json"
+MODEL_FILE = "logistic_model.joblib"
+PREPROCESSOR_FILE = "preprocessor.joblib"
+REFERENCE_SKETCH_FILE = "reference_sketch.json"
+
+
+def export_native(version_dir: str, model, preprocessor) -> None:
+    """Write the coefficients (NPZ) and the preprocessing maps (JSON) of a fitted model."""
+    np.savez(os.path.join(version_dir, NATIVE_COEF_FILE),
+             coef=np.ravel(model.coef_).astype(np.float64),
+             intercept=np.asarray(model.intercept_, dtype=np.float64).ravel()[:1],
+             features=np.array(preprocessor.output_columns, dtype=str))
+    with open(os.path.join(version_dir, NATIVE_PREPROCESSING_FILE), 'w') as f:
+        json.dump(preprocessor.to_dict(), f, indent=1)
+
+
+def load_native(model_dir: str):
+    """(preprocessor, coef, intercept) from a native export, without unpickling anything."""
+    from components.preprocessor import BookingPreprocessor
+
+    with np.load(os.path.join(model_dir, NATIVE_COEF_FILE)) as data:
+        coef, intercept = data["coef"], float(data["intercept"][0])
+    with open(os.path.join(model_dir, NATIVE_PREPROCESSING_FILE)) as f:
+        preprocessor = BookingPreprocessor.from_dict(json.load(f))
+    return preprocessor, coef, intercept
+
+
+def has_native_export(model_dir: str) -> bool:
+    return all(os.path.exists(os.path.join(model_dir, name))
+               for name in (NATIVE_COEF_FILE, NATIVE_PREPROCESSING_FILE))
+
+
+class ModelRegistry:
+    """Immutable model versions under `root`, numbered v0001, v0002, ... in registration order."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    @property
+    def versions_dir(self) -> str:
+        return os.path.join(self.root, VERSIONS_DIR)
+
+    def version_dir(self, version: Optional[str] = None) -> str:
+        """Directory of `version` (the current version if None)."""
+        version = version or self.current_version()
+        if version is None:
+            raise CustomException(f"Model registry at {self.root} has no current version")
+        path = os.path.join(self.versions_dir, version)
+        if not os.path.isdir(path):
+            raise CustomException(f"Model version {version} not found in {self.root}")
+        return path
+
+    def list_versions(self) -> List[str]:
+        if not os.path.isdir(self.versions_dir):
+            return []
+        return sorted(v for v in os.listdir(self.versions_dir)
+                      if v.startswith("v") and os.path.exists(os.path.join(self.versions_dir, v, METADATA_FILE)))
+
+    def current_version(self) -> Optional[str]:
+        try:
+            with open(os.path.join(self.root, CURRENT_FILE)) as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def set_current(self, version: str) -> None:
+        self.version_dir(version)  # must exist
+        tmp = os.path.join(self.root, f"{CURRENT_FILE}.{os.getpid()}.tmp")
+        with open(tmp, 'w') as f:
+            f.write(version + "\n")
+        os.replace(tmp, os.path.join(self.root, CURRENT_FILE))
+        logger.info(f"Current model version is now {version}")
+
+    def _next_version(self) -> str:
+        existing = [int(v[1:]) for v in os.listdir(self.versions_dir) if v[1:].isdigit()]
+        return f"v{max(existing, default=0) + 1:04d}"
+
+    def register(self, model, preprocessor, metadata: Optional[dict] = None, make_current: bool = True,
+                 reference=None) -> str:
+        """
+        Store `model` and `preprocessor` as a new immutable version and return its id.
+
+        `metadata` (data fingerprint, metrics, ...) is stored alongside the
+        registry's own fields: version, created_at, parent (the version that
+        was current), features and model class. `reference`, a
+        components.monitoring.DataSketch of the training data, is stored for
+        drift checks on incoming batches.
+        """
+        try:
+            os.makedirs(self.versions_dir, exist_ok=True)
+            tmp_dir = os.path.join(self.versions_dir, f".tmp-{os.getpid()}-{time.time_ns()}")
+            os.makedirs(tmp_dir)
+            save_model(model, os.path.join(tmp_dir, MODEL_FILE))
+            save_model(preprocessor, os.path.join(tmp_dir, PREPROCESSOR_FILE))
+            export_native(tmp_dir, model, preprocessor)
+            if reference is not None:
+                reference.save(os.path.join(tmp_dir, REFERENCE_SKETCH_FILE))
+
+            while True:
+                version = self._next_version()
+                record = dict(metadata or {})
+                record.update({
+                    "version": version,
+                    "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "parent": self.current_version(),
+                    "features": list(preprocessor.output_columns),
+                    "model_class": type(model).__name__,
+                })
+                with open(os.path.join(tmp_dir, METADATA_FILE), 'w') as f:
+                    json.dump(record, f, indent=2, default=str)
+                try:
+                    # rename fails if a concurrent registration took this number first
+                    os.rename(tmp_dir, os.path.join(self.versions_dir, version))
+                    break
+                except OSError:
+                    if not os.path.isdir(os.path.join(self.versions_dir, version)):
+                        raise
+            final_dir = os.path.join(self.versions_dir, version)
+            for name in os.listdir(final_dir):
+                os.chmod(os.path.join(final_dir, name), stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+            logger.info(f"Registered model version {version} at {final_dir}")
+            if make_current:
+                self.set_current(version)
+            return version
+        except CustomException:
+            raise
+        except Exception as e:
+            raise CustomException("Error registering model version", e)
+
+    def metadata(self, version: Optional[str] = None) -> dict:
+        with open(os.path.join(self.version_dir(version), METADATA_FILE)) as f:
+            return json.load(f)
+
+    def load(self, version: Optional[str] = None, mmap_mode: Optional[str] = 'r') -> Tuple[object, object]:
+        """(model, preprocessor) of `version`; large arrays are memory-mapped rather than read."""
+        path = self.version_dir(version)
+        return (load_model(os.path.join(path, MODEL_FILE), mmap_mode=mmap_mode),
+                load_model(os.path.join(path, PREPROCESSOR_FILE), mmap_mode=mmap_mode))
+
+    def load_native(self, version: Optional[str] = None):
+        """(preprocessor, coef, intercept) of `version` from its native export."""
+        return load_native(self.version_dir(version))
+
+    def reference_sketch(self, version: Optional[str] = None):
+        """The training-data DataSketch stored with `version`, or None if it has none (or an outdated one)."""
+        from components.monitoring import DataSketch
+
+        path = os.path.join(self.version_dir(version), REFERENCE_SKETCH_FILE)
+        if not os.path.exists(path):
+            return None
+        try:
+            return DataSketch.load(path)
+        except CustomException as e:
+            logger.warning(f"Ignoring the reference sketch of {version or 'the current version'}: {e}")
+            return None
+
+    def remove(self, version: str) -> None:
+        """Delete a version that is not current (versions are otherwise never modified)."""
+        if version == self.current_version():
+            raise CustomException(f"Cannot remove the current model version {version}")
+        path = self.version_dir(version)
+        for name in os.listdir(path):
+            os.chmod(os.path.join(path, name), stat.S_IRUSR | stat.S_IWUSR)
+        shutil.rmtree(path)
+        logger.info(f"Removed model version {version}")
+
+    def diff(self, a: str, b: str) -> dict:
+        """Differences between two versions: metadata, features, coefficients and encodings."""
+        meta_a, meta_b = self.metadata(a), self.metadata(b)
+        pre_a, coef_a, intercept_a = self.load_native(a)
+        pre_b, coef_b, intercept_b = self.load_native(b)
+        weights_a = dict(zip(pre_a.output_columns, coef_a))
+        weights_b = dict(zip(pre_b.output_columns, coef_b))
+        skip = {"version", "created_at", "features"}
+        encodings = {}
+        for col in sorted(set(pre_a.encodings) | set(pre_b.encodings)):
+            enc_a, enc_b = pre_a.encodings.get(col, {}), pre_b.encodings.get(col, {})
+            common = set(enc_a) & set(enc_b)
+            encodings[col] = {
+                "max_abs_diff": max((abs(enc_a[k] - enc_b[k]) for k in common), default=0.0),
+                "added": sorted(map(str, set(enc_b) - set(enc_a))),
+                "removed": sorted(map(str, set(enc_a) - set(enc_b))),
+            }
+        return {
+            "a": a, "b": b,
+            "metadata": {k: (meta_a.get(k), meta_b.get(k)) for k in sorted(set(meta_a) | set(meta_b))
+                         if k not in skip and meta_a.get(k) != meta_b.get(k)},
+            "features_added": [f for f in weights_b if f not in weights_a],
+            "features_removed": [f for f in weights_a if f not in weights_b],
+            "coefficients": {f: (weights_a.get(f), weights_b.get(f)) for f in list(dict.fromkeys(
+                list(weights_a) + list(weights_b)))},
+            "intercept": (intercept_a, intercept_b),
+            "encodings": encodings,
+            "prior": (pre_a.prior, pre_b.prior),
+            "log_shifts": (pre_a.log_shifts, pre_b.log_shifts),
+        }
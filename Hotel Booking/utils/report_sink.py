@@ -0,0 +1,318 @@
+"""
+Structured, buffered sink for reports, metrics, stage summaries and logs.
+
+Report functions (components.output_reports) emit records instead of
+printing. A record is a kind ("report", "metrics", "stage", "log"), a name,
+plain-JSON data, and optionally a title and the text file it renders to.
+Rendering a record to text is left to the renderer registered for its name.
+
+Inside a `session`, records go on a queue drained by one background thread.
+The thread appends every record to a JSON-lines file, or to a Parquet file
+when pyarrow is installed. Unless the session is quiet, it also renders
+reports and prints them and their text files as the pipeline always did.
+While the session runs, log lines go through the same queue, so the console
+keeps its order and the pipeline threads never block on console I/O.
+A quiet session prints only warnings and errors and writes no text files;
+render_reports.py renders the stored records on demand.
+
+Outside a session (library use, scripts, benchmarks) records are rendered
+and printed synchronously, exactly as before.
+"""
+import contextlib
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from logger.log_config import console_handler, get_logger
+
+logger = get_logger("report_sink")
+
+RECORDS_FORMATS = ("jsonl", "parquet")
+TEXT_BANNER = "=" * 80
+
+_renderers: Dict[str, Callable[[dict], str]] = {}
+_active: Optional["ReportSink"] = None
+_sequence = 0
+_sequence_lock = threading.Lock()
+
+
+def renderer(name: str) -> Callable:
+    """Register the function that renders records called `name` (data dict -> text)."""
+    def decorator(func):
+        _renderers[name] = func
+        return func
+    return decorator
+
+
+def render(record: dict) -> Tuple[str, str]:
+    """(console text, file text) of a record."""
+    if record["kind"] == "log":
+        line = record["data"]["line"]
+        return line, line
+    func = _renderers.get(record["name"])
+    content = func(record["data"]) if func else json.dumps(record["data"], indent=2, default=str)
+    title = record.get("title")
+    if not title:
+        return content, content
+    return (f"\n{TEXT_BANNER}\n  {title}\n{TEXT_BANNER}\n{content}",
+            f"{title}\n{TEXT_BANNER}\n{content}")
+
+
+def _write_text(path: str, text: str) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(text)
+
+
+def _echo(record: dict) -> None:
+    """Print a rendered record (unless it is file-only) and write its text file."""
+    console, text = render(record)
+    if record.get("console", True):
+        print(console)
+    if record.get("file"):
+        _write_text(record["file"], text)
+        logger.info(f"Saved report to {record['file']}")
+
+
+def _make_record(kind: str, name: str, data: dict, title: Optional[str], file: Optional[str],
+                 console: bool = True) -> dict:
+    global _sequence
+    with _sequence_lock:
+        _sequence += 1
+        seq = _sequence
+    return {"seq": seq, "time": time.time(), "pid": os.getpid(), "thread": threading.current_thread().name,
+            "kind": kind, "name": name, "title": title, "file": file, "console": console, "data": data}
+
+
+def emit(kind: str, name: str, data: dict, title: Optional[str] = None, file: Optional[str] = None,
+         console: bool = True) -> None:
+    """
+    Hand a record to the active sink, or render it right away if there is none.
+
+    `data` must be plain JSON (numbers, strings, lists, dicts) and must not be
+    modified afterwards. `file` is the text file the rendered report is saved to;
+    with `console=False` the report only goes to that file. Records of kind
+    "stage" are only stored, never printed.
+    """
+    record = _make_record(kind, name, data, title, file, console)
+    sink = _active
+    if sink is not None:
+        sink.put(record)
+    elif kind != "stage":
+        _echo(record)
+
+
+class _LogHandler(logging.Handler):
+    """Routes log records into the sink (installed on the root logger during a session)."""
+
+    def __init__(self, sink: "ReportSink"):
+        super().__init__(logging.INFO)
+        self.sink = sink
+        self.setFormatter(console_handler().formatter)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.sink.put(_make_record("log", record.name, {
+                "level": record.levelname, "levelno": record.levelno, "logger": record.name,
+                "message": record.getMessage(), "line": self.format(record),
+            }, None, None))
+        except Exception:
+            self.handleError(record)
+
+
+class ReportSink:
+    """
+    Background writer for records: `put` never blocks on I/O.
+
+    Records are buffered and written every `flush_records` records or
+    `flush_seconds` seconds, whichever comes first, and on `close`. A record
+    put from a forked worker process (which has no writer thread) is handled
+    synchronously in that process; in Parquet mode such records are printed
+    but not stored.
+    """
+
+    def __init__(self, path: str, fmt: str = "jsonl", quiet: bool = False,
+                 flush_records: int = 1000, flush_seconds: float = 1.0):
+        if fmt not in RECORDS_FORMATS:
+            raise ValueError(f"Unknown records format {fmt!r}; expected one of {RECORDS_FORMATS}")
+        if fmt == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ValueError("Parquet records need pyarrow; install it or use the jsonl format") from None
+        self.path = path
+        self.fmt = fmt
+        self.quiet = quiet
+        self.flush_records = flush_records
+        self.flush_seconds = flush_seconds
+        self.records_written = 0
+        self._pid = os.getpid()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._parquet_writer = None
+        self._file = None
+
+    def start(self) -> "ReportSink":
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        if self.fmt == "jsonl":
+            # truncate, then append: forked workers append their own lines to the same file
+            open(self.path, 'w').close()
+            self._file = open(self.path, 'a', buffering=1 << 20)
+        self._thread = threading.Thread(target=self._run, name="report-sink", daemon=True)
+        self._thread.start()
+        return self
+
+    def put(self, record: dict) -> None:
+        if os.getpid() != self._pid:
+            self._handle_in_child(record)
+        else:
+            self._queue.put(record)
+
+    def close(self) -> None:
+        """Write everything still queued and stop the writer thread."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _handle_in_child(self, record: dict) -> None:
+        if self._should_echo(record):
+            _echo(record)
+        if self.fmt == "jsonl":
+            # one write per line with O_APPEND, so lines from several processes don't interleave
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(record, default=str) + "\n")
+
+    def _should_echo(self, record: dict) -> bool:
+        if record["kind"] == "stage":
+            return False
+        if record["kind"] == "log":
+            return not self.quiet or record["data"]["levelno"] >= logging.WARNING
+        return not self.quiet
+
+    def _run(self) -> None:
+        batch: List[dict] = []
+        last_flush = time.monotonic()
+        stopping = False
+        while True:
+            try:
+                # after the sentinel, drain what is left (e.g. "Saved report" lines logged by this thread)
+                record = self._queue.get_nowait() if stopping else self._queue.get(timeout=self.flush_seconds)
+            except queue.Empty:
+                if stopping:
+                    break
+                record = ...
+            if record is None:
+                stopping = True
+                continue
+            if record is not ...:
+                try:
+                    if self._should_echo(record):
+                        _echo(record)
+                except Exception as e:  # a broken renderer must not stop the writer
+                    print(f"report sink: could not render {record.get('name')}: {e}", file=sys.stderr)
+                batch.append(record)
+            if batch and (len(batch) >= self.flush_records or time.monotonic() - last_flush >= self.flush_seconds):
+                self._write(batch)
+                batch, last_flush = [], time.monotonic()
+        self._write(batch)
+        if self._file is not None:
+            self._file.close()
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+        sys.stdout.flush()
+
+    def _write(self, batch: List[dict]) -> None:
+        if not batch:
+            return
+        if self.fmt == "jsonl":
+            self._file.write("".join(json.dumps(record, default=str) + "\n" for record in batch))
+            self._file.flush()
+        else:
+            self._write_parquet(batch)
+        self.records_written += len(batch)
+
+    def _write_parquet(self, batch: List[dict]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        columns = {
+            "seq": [r["seq"] for r in batch], "time": [r["time"] for r in batch],
+            "pid": [r["pid"] for r in batch], "thread": [r["thread"] for r in batch],
+            "kind": [r["kind"] for r in batch], "name": [r["name"] for r in batch],
+            "title": [r["title"] for r in batch], "file": [r["file"] for r in batch],
+            "console": [r["console"] for r in batch],
+            # data is free-form per record name, so it is stored as a JSON string
+            "data": [json.dumps(r["data"], default=str) for r in batch],
+        }
+        table = pa.table(columns, schema=_parquet_schema())
+        if self._parquet_writer is None:
+            self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+        self._parquet_writer.write_table(table)
+
+
+def _parquet_schema():
+    import pyarrow as pa
+
+    return pa.schema([("seq", pa.int64()), ("time", pa.float64()), ("pid", pa.int64()), ("thread", pa.string()),
+                      ("kind", pa.string()), ("name", pa.string()), ("title", pa.string()),
+                      ("file", pa.string()), ("console", pa.bool_()), ("data", pa.string())])
+
+
+@contextlib.contextmanager
+def session(records_dir: str, fmt: str = "jsonl", quiet: bool = False, run_id: Optional[str] = None):
+    """
+    Route reports and logs through a background `ReportSink` for the enclosed block.
+
+    Records are written to `records_dir/<run_id>.<fmt>`; yields the sink.
+    """
+    global _active
+    if _active is not None:
+        yield _active
+        return
+    run_id = run_id or time.strftime("%Y%m%d-%H%M%S")
+    sink = ReportSink(os.path.join(records_dir, f"{run_id}.{fmt}"), fmt=fmt, quiet=quiet).start()
+    handler = _LogHandler(sink)
+    console = console_handler()
+    console_level = console.level
+    root = logging.getLogger()
+    root.addHandler(handler)
+    # the writer thread prints log lines from now on, in order with the reports
+    console.setLevel(logging.CRITICAL + 1)
+    _active = sink
+    try:
+        yield sink
+    finally:
+        _active = None
+        root.removeHandler(handler)
+        console.setLevel(console_level)
+        sink.close()
+
+
+def read_records(path: str) -> Iterator[dict]:
+    """Records stored by a session, in the order they were emitted."""
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        rows = pq.read_table(path).to_pylist()
+        for row in rows:
+            row["data"] = json.loads(row["data"])
+    else:
+        with open(path) as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+    # sequence numbers are per process, so order by time first
+    yield from sorted(rows, key=lambda r: (r["time"], r["seq"]))
+
+
+def latest_records_file(records_dir: str) -> Optional[str]:
+    """Most recently written records file in `records_dir`, if any."""
+    if not os.path.isdir(records_dir):
+        return None
+    files = [os.path.join(records_dir, name) for name in os.listdir(records_dir)
+             if name.endswith(tuple(f".{fmt}" for fmt in RECORDS_FORMATS))]
+    return max(files, key=os.path.getmtime, default=None)
@@ -0,0 +1,190 @@
+"""Content-addressed, size-capped on-disk memoization of pipeline stage outputs."""
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Any, Callable, Iterable, Optional
+
+import joblib
+from utils.data_cache import content_hash
+from logger.log_config import get_logger
+
+logger = get_logger("stage_cache")
+
+MANIFEST_FILE = "manifest.json"
+DEFAULT_MAX_BYTES = 2 * 2 ** 30
+
+
+def _digest(*parts: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _module_source(name: str) -> str:
+    """Source of module `name`, read from its file without importing it."""
+    spec = importlib.util.find_spec(name)
+    if spec is None or not spec.origin or not os.path.isfile(spec.origin):
+        return name
+    with open(spec.origin, encoding="utf-8") as f:
+        return f.read()
+
+
+def code_version(*objects) -> str:
+    """
+    Hash of the source of the given modules/functions/classes; changes whenever their code does.
+
+    Modules may also be given by dotted name, which hashes their source file
+    without importing them (e.g. modules whose imports are deferred until a
+    stage runs).
+    """
+    sources = []
+    for obj in objects:
+        if isinstance(obj, str):
+            sources.append(_module_source(obj))
+            continue
+        try:
+            sources.append(inspect.getsource(obj))
+        except (OSError, TypeError):
+            sources.append(getattr(obj, "__qualname__", getattr(obj, "__name__", repr(obj))))
+    return _digest(*sources)
+
+
+class StageCache:
+    """
+    Stores stage outputs under `key(stage, inputs, version, config)` and evicts
+    least-recently-used entries once the cache grows past `max_bytes`.
+
+    Keys are content-addressed: a stage's inputs are the fingerprints of the
+    source files it reads or the keys of the stages it consumes, so a key
+    identifies the output it names without hashing that output. Changing a
+    stage's code or config changes its key and the keys of every stage downstream.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.cache_dir, MANIFEST_FILE)
+
+    def _read_manifest(self) -> dict:
+        if not os.path.exists(self.manifest_path):
+            return {"entries": {}, "files": {}}
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+            manifest.setdefault("entries", {})
+            manifest.setdefault("files", {})
+            return manifest
+        except (OSError, ValueError):
+            logger.warning(f"Ignoring unreadable stage cache manifest {self.manifest_path}")
+            return {"entries": {}, "files": {}}
+
+    def _write_manifest(self, manifest: dict) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = self.manifest_path + f".{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp, self.manifest_path)
+
+    def file_fingerprint(self, path: str) -> str:
+        """Content hash of `path`, re-hashed only when its size or mtime changes."""
+        stat = os.stat(path)
+        with self._lock:
+            manifest = self._read_manifest()
+            entry = manifest["files"].get(os.path.abspath(path))
+            if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                return entry["hash"]
+            digest = content_hash(path)
+            manifest["files"][os.path.abspath(path)] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                                                        "hash": digest}
+            self._write_manifest(manifest)
+            return digest
+
+    @staticmethod
+    def key(stage: str, inputs: Iterable[str], version: str = "", config: Optional[dict] = None) -> str:
+        return _digest(stage, *inputs, version, json.dumps(config or {}, sort_keys=True, default=str))
+
+    def get(self, key: str):
+        """(True, value) for a cached key, (False, None) otherwise."""
+        with self._lock:
+            manifest = self._read_manifest()
+            entry = manifest["entries"].get(key)
+            if entry is None:
+                return False, None
+            path = os.path.join(self.cache_dir, entry["file"])
+            if not os.path.exists(path):
+                del manifest["entries"][key]
+                self._write_manifest(manifest)
+                return False, None
+            entry["last_used"] = time.time()
+            self._write_manifest(manifest)
+        return True, joblib.load(path)
+
+    def put(self, key: str, value: Any, stage: str = "", seconds: float = 0.0) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        filename = f"{stage or 'stage'}-{key[:16]}.joblib"
+        path = os.path.join(self.cache_dir, filename)
+        tmp = path + f".{os.getpid()}.{threading.get_ident()}.tmp"
+        joblib.dump(value, tmp)
+        os.replace(tmp, path)
+        with self._lock:
+            manifest = self._read_manifest()
+            manifest["entries"][key] = {"file": filename, "stage": stage, "bytes": os.path.getsize(path),
+                                        "seconds": seconds, "last_used": time.time()}
+            self._evict(manifest, keep=key)
+            self._write_manifest(manifest)
+
+    def _evict(self, manifest: dict, keep: str) -> None:
+        entries = manifest["entries"]
+        total = sum(e["bytes"] for e in entries.values())
+        for key in sorted(entries, key=lambda k: entries[k]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            entry = entries.pop(key)
+            total -= entry["bytes"]
+            path = os.path.join(self.cache_dir, entry["file"])
+            if os.path.exists(path):
+                os.remove(path)
+            logger.info(f"Evicted stage cache entry {entry['file']} ({entry['bytes'] / 2 ** 20:.1f} MB)")
+
+    def memoize(self, stage: str, key: str, compute: Callable[[], Any]) -> Any:
+        """Load `stage`'s output for `key` from the cache, or compute and store it (None is not stored)."""
+        try:
+            hit, value = self.get(key)
+        except Exception as e:
+            logger.warning(f"Could not read stage cache for {stage}, recomputing: {e}")
+            hit, value = False, None
+        if hit:
+            logger.info(f"Stage '{stage}' loaded from cache ({key[:12]})")
+            return value
+        start = time.perf_counter()
+        value = compute()
+        seconds = time.perf_counter() - start
+        if value is None:
+            return value
+        try:
+            self.put(key, value, stage, seconds)
+        except Exception as e:
+            logger.warning(f"Could not write stage cache for {stage}: {e}")
+        logger.info(f"Stage '{stage}' computed in {seconds:.2f}s and cached ({key[:12]})")
+        return value
+
+    def clear(self) -> None:
+        """Remove every cached stage output."""
+        if os.path.isdir(self.cache_dir):
+            shutil.rmtree(self.cache_dir)
+            logger.info(f"Cleared stage cache at {self.cache_dir}")
+        else:
+            logger.info(f"No stage cache at {self.cache_dir}")
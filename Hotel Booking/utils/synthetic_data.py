@@ -0,0 +1,282 @@
+"""
+Synthetic bookings with the hotel_bookings.csv schema, for benchmarks at any size.
+
+Marginal distributions, null rates (`agent`, `company`, `country`, `children`)
+and the share of zero-guest bookings follow the published 119k-row dataset.
+The main dependencies are modelled too, so the pipeline has real work to do:
+- stay lengths split into weekend/week nights by the arrival weekday;
+- cancellations driven by lead time, deposit, segment, requests and parking;
+- reservation status and status date consistent with the cancellation.
+Rows are generated in independently seeded chunks, so 50M rows can be written
+without holding them in memory and any size is reproducible from its seed.
+"""
+import os
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+from constants.schema import MONTHS
+from logger.log_config import get_logger
+from exception.custom_exception import CustomException
+
+logger = get_logger("synthetic_data")
+
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+COLUMNS = [
+    'hotel', 'is_canceled', 'lead_time', 'arrival_date_year', 'arrival_date_month',
+    'arrival_date_week_number', 'arrival_date_day_of_month', 'stays_in_weekend_nights',
+    'stays_in_week_nights', 'adults', 'children', 'babies', 'meal', 'country', 'market_segment',
+    'distribution_channel', 'is_repeated_guest', 'previous_cancellations',
+    'previous_bookings_not_canceled', 'reserved_room_type', 'assigned_room_type', 'booking_changes',
+    'deposit_type', 'agent', 'company', 'days_in_waiting_list', 'customer_type', 'adr',
+    'required_car_parking_spaces', 'total_of_special_requests', 'reservation_status',
+    'reservation_status_date',
+]
+
+# arrival dates of the published dataset, with its seasonal profile (bookings per day, relative)
+FIRST_ARRIVAL = np.datetime64('2015-07-01')
+LAST_ARRIVAL = np.datetime64('2017-08-31')
+MONTH_WEIGHTS = np.array([0.65, 0.85, 0.9, 1.0, 1.05, 1.05, 1.0, 1.1, 1.05, 1.0, 0.75, 0.65])
+
+# null rates of the published dataset
+NULL_RATES = {'agent': 0.137, 'company': 0.943, 'country': 0.0041, 'children': 0.00004}
+ZERO_GUEST_RATE = 0.0015
+
+COUNTRIES = {
+    'PRT': 40.9, 'GBR': 10.2, 'FRA': 8.8, 'ESP': 7.2, 'DEU': 6.1, 'ITA': 3.2, 'IRL': 2.8, 'BEL': 2.0,
+    'BRA': 1.9, 'NLD': 1.8, 'USA': 1.8, 'CHE': 1.5, 'CN': 1.1, 'AUT': 1.1, 'SWE': 0.9, 'CHN': 0.8,
+    'POL': 0.8, 'ISR': 0.6, 'RUS': 0.5, 'NOR': 0.5, 'ROU': 0.4, 'FIN': 0.4, 'DNK': 0.4, 'AUS': 0.4,
+    'AGO': 0.3, 'LUX': 0.2, 'MAR': 0.2, 'TUR': 0.2, 'HUN': 0.2, 'ARG': 0.2, 'JPN': 0.2, 'CZE': 0.15,
+    'IND': 0.1, 'KOR': 0.1, 'GRC': 0.1, 'DZA': 0.1, 'SRB': 0.1, 'HRV': 0.1, 'MEX': 0.07, 'IRN': 0.07,
+    'EST': 0.07, 'LTU': 0.07, 'BGR': 0.06, 'NZL': 0.06, 'COL': 0.06, 'UKR': 0.06, 'MOZ': 0.06,
+    'CHL': 0.05, 'SVK': 0.05, 'THA': 0.05, 'ISL': 0.05, 'SVN': 0.05, 'LVA': 0.05, 'CYP': 0.04,
+    'ZAF': 0.07, 'CPV': 0.02, 'ARE': 0.04, 'SAU': 0.04, 'NGA': 0.03, 'TWN': 0.03, 'PER': 0.02,
+    'SGP': 0.03, 'MYS': 0.02, 'EGY': 0.03, 'LBN': 0.03, 'TUN': 0.03, 'VEN': 0.02, 'GEO': 0.02,
+}
+MEALS = {'BB': 77.3, 'HB': 12.1, 'SC': 8.9, 'Undefined': 1.0, 'FB': 0.7}
+MARKET_SEGMENTS = {'Online TA': 47.3, 'Offline TA/TO': 20.3, 'Groups': 16.6, 'Direct': 10.6,
+                   'Corporate': 4.4, 'Complementary': 0.6, 'Aviation': 0.2}
+# distribution channel given the market segment
+CHANNELS = ['TA/TO', 'Direct', 'Corporate', 'GDS']
+CHANNEL_BY_SEGMENT = {
+    'Online TA': [0.985, 0.01, 0.0, 0.005], 'Offline TA/TO': [0.97, 0.01, 0.02, 0.0],
+    'Groups': [0.85, 0.08, 0.07, 0.0], 'Direct': [0.02, 0.97, 0.01, 0.0],
+    'Corporate': [0.04, 0.03, 0.93, 0.0], 'Complementary': [0.1, 0.8, 0.1, 0.0],
+    'Aviation': [0.0, 0.0, 1.0, 0.0],
+}
+ROOM_TYPES = {'A': 72.0, 'D': 16.1, 'E': 5.5, 'F': 2.4, 'G': 1.8, 'B': 0.9, 'C': 0.8, 'H': 0.5}
+DEPOSIT_TYPES = {'No Deposit': 87.6, 'Non Refund': 12.2, 'Refundable': 0.2}
+CUSTOMER_TYPES = {'Transient': 75.1, 'Transient-Party': 21.0, 'Contract': 3.4, 'Group': 0.5}
+
+
+def _choice(rng: np.random.Generator, weights: dict, n: int) -> np.ndarray:
+    labels = np.array(list(weights), dtype=object)
+    p = np.fromiter(weights.values(), dtype=np.float64)
+    return labels[rng.choice(len(labels), size=n, p=p / p.sum())]
+
+
+def _counts(rng: np.random.Generator, probabilities, n: int, tail_max: int = 0) -> np.ndarray:
+    """Small non-negative integers 0..len(probabilities)-1; the leftover mass goes to a uniform tail up to `tail_max`."""
+    p = np.asarray(probabilities, dtype=np.float64)
+    values = rng.choice(len(p) + 1, size=n, p=np.append(p, max(0.0, 1.0 - p.sum())))
+    tail = values == len(p)
+    values[tail] = rng.integers(len(p), max(tail_max, len(p)) + 1, size=int(tail.sum()))
+    return values
+
+
+def _with_nulls(rng: np.random.Generator, values: np.ndarray, rate: float) -> np.ndarray:
+    values = values.astype(np.float64)
+    values[rng.random(len(values)) < rate] = np.nan
+    return values
+
+
+def _zipf_ids(rng: np.random.Generator, n: int, n_ids: int, exponent: float) -> np.ndarray:
+    """IDs 1..n_ids with a Zipf-like popularity (a few agents/companies take most bookings)."""
+    ranks = np.arange(1, n_ids + 1, dtype=np.float64)
+    p = ranks ** -exponent
+    ids = np.random.default_rng(7).permutation(n_ids) + 1  # fixed ID per rank across chunks
+    return ids[rng.choice(n_ids, size=n, p=p / p.sum())]
+
+
+def _weekend_nights(weekday: np.ndarray, nights: np.ndarray) -> np.ndarray:
+    """Nights falling on Saturday or Sunday for stays starting on `weekday` (Monday=0)."""
+    # weekend nights in the first r nights after each weekday, r = 0..6
+    partial = np.array([[sum((w + k) % 7 >= 5 for k in range(r)) for r in range(7)] for w in range(7)])
+    return (nights // 7) * 2 + partial[weekday, nights % 7]
+
+
+def _arrival_dates(rng: np.random.Generator, n: int) -> np.ndarray:
+    days = np.arange(FIRST_ARRIVAL, LAST_ARRIVAL + 1)
+    month = days.astype('datetime64[M]').astype(np.int64) % 12
+    p = MONTH_WEIGHTS[month]
+    return days[rng.choice(len(days), size=n, p=p / p.sum())]
+
+
+def generate_chunk(n_rows: int, rng: np.random.Generator) -> pd.DataFrame:
+    """`n_rows` synthetic bookings drawn from `rng`, in the raw CSV column order."""
+    n = n_rows
+    is_city = rng.random(n) < 0.664
+    hotel = np.where(is_city, 'City Hotel', 'Resort Hotel').astype(object)
+
+    arrival = _arrival_dates(rng, n)
+    arrival_index = pd.DatetimeIndex(arrival)
+    lead_time = np.minimum(rng.gamma(0.85, 120.0, n).astype(np.int64), 737)
+
+    # stay length: resort stays are longer; a few day-use bookings have zero nights
+    nights = rng.poisson(np.where(is_city, 2.0, 3.3)) + 1
+    nights[rng.random(n) < 0.006] = 0
+    nights = np.minimum(nights, 69)
+    weekend = _weekend_nights(arrival_index.dayofweek.to_numpy(), nights)
+
+    adults = _counts(rng, [0.0035, 0.193, 0.751, 0.0518], n, tail_max=4).astype(np.int64)
+    children = _counts(rng, [0.928, 0.0408, 0.0306], n, tail_max=3).astype(np.int64)
+    babies = _counts(rng, [0.992, 0.0077], n, tail_max=2).astype(np.int64)
+    # adults == 0 means children-only bookings; zero-guest rows are added separately
+    lone = adults == 0
+    children[lone] = np.maximum(children[lone], 1)
+    zero_guests = rng.random(n) < ZERO_GUEST_RATE
+    adults[zero_guests] = children[zero_guests] = babies[zero_guests] = 0
+
+    segment = _choice(rng, MARKET_SEGMENTS, n)
+    channel = np.empty(n, dtype=object)
+    for name, p in CHANNEL_BY_SEGMENT.items():
+        rows = np.flatnonzero(segment == name)
+        channel[rows] = np.array(CHANNELS, dtype=object)[rng.choice(len(CHANNELS), size=len(rows), p=p)]
+    deposit = _choice(rng, DEPOSIT_TYPES, n)
+    customer = _choice(rng, CUSTOMER_TYPES, n)
+    reserved = _choice(rng, ROOM_TYPES, n)
+    assigned = reserved.copy()
+    upgraded = rng.random(n) < 0.125
+    assigned[upgraded] = _choice(rng, ROOM_TYPES, int(upgraded.sum()))
+
+    is_repeated = (rng.random(n) < np.where(segment == 'Corporate', 0.25, 0.025)).astype(np.int64)
+    previous_cancellations = _counts(rng, [0.946, 0.051], n, tail_max=26)
+    previous_not_canceled = np.where(is_repeated == 1, _counts(rng, [0.3, 0.3, 0.15], n, tail_max=72),
+                                     _counts(rng, [0.985, 0.01], n, tail_max=5))
+    booking_changes = _counts(rng, [0.849, 0.106, 0.032, 0.008], n, tail_max=21)
+    waiting = np.where(rng.random(n) < 0.031, rng.gamma(1.2, 60.0, n).astype(np.int64) + 1, 0)
+    parking = _counts(rng, [0.938, 0.0615], n, tail_max=3)
+    requests = _counts(rng, [0.589, 0.278, 0.109, 0.021], n, tail_max=5)
+
+    # cancellation: logistic in the main drivers, ~37% overall
+    logit = (-1.75 + 0.0045 * lead_time + 0.55 * is_city
+             + 6.0 * (deposit == 'Non Refund') + 1.6 * (previous_cancellations > 0)
+             + 0.45 * (segment == 'Groups') + 0.35 * (segment == 'Online TA') - 0.9 * (segment == 'Direct')
+             + 0.3 * (customer == 'Transient') - 1.2 * is_repeated
+             - 0.45 * requests - 0.35 * np.minimum(booking_changes, 3) - 0.9 * (assigned != reserved))
+    is_canceled = (rng.random(n) < 1.0 / (1.0 + np.exp(-logit))).astype(np.int64)
+    is_canceled[parking > 0] = 0
+
+    # average daily rate: by hotel, season and room; zero for complementary stays, 1.5% free
+    month = arrival_index.month.to_numpy()
+    season = np.where(is_city, 1.0 + 0.15 * np.isin(month, [4, 5, 6, 9, 10]),
+                      0.7 + 0.9 * np.isin(month, [7, 8]))
+    room_premium = 1.0 + 0.25 * np.isin(reserved, ['F', 'G', 'H']) + 0.1 * np.isin(reserved, ['D', 'E'])
+    adr = np.round(rng.gamma(9.0, 11.5, n) * season * room_premium, 2)
+    adr[(segment == 'Complementary') | (rng.random(n) < 0.012)] = 0.0
+
+    status = np.where(is_canceled == 1, np.where(rng.random(n) < 0.03, 'No-Show', 'Canceled'),
+                      'Check-Out').astype(object)
+    cancelled_before = (rng.random(n) * (lead_time + 1)).astype('timedelta64[D]')
+    status_date = np.where(status == 'Check-Out', arrival + nights.astype('timedelta64[D]'),
+                           np.where(status == 'No-Show', arrival, arrival - cancelled_before))
+
+    week_numbers = arrival_index.isocalendar().week.to_numpy().astype(np.int64)
+    df = pd.DataFrame({
+        'hotel': hotel,
+        'is_canceled': is_canceled,
+        'lead_time': lead_time,
+        'arrival_date_year': arrival_index.year.to_numpy(),
+        'arrival_date_month': np.array(MONTHS, dtype=object)[month - 1],
+        'arrival_date_week_number': week_numbers,
+        'arrival_date_day_of_month': arrival_index.day.to_numpy(),
+        'stays_in_weekend_nights': weekend,
+        'stays_in_week_nights': nights - weekend,
+        'adults': adults,
+        'children': _with_nulls(rng, children, NULL_RATES['children']),
+        'babies': babies,
+        'meal': _choice(rng, MEALS, n),
+        'country': np.where(rng.random(n) < NULL_RATES['country'], None, _choice(rng, COUNTRIES, n)),
+        'market_segment': segment,
+        'distribution_channel': channel,
+        'is_repeated_guest': is_repeated,
+        'previous_cancellations': previous_cancellations,
+        'previous_bookings_not_canceled': previous_not_canceled,
+        'reserved_room_type': reserved,
+        'assigned_room_type': assigned,
+        'booking_changes': booking_changes,
+        'deposit_type': deposit,
+        'agent': _with_nulls(rng, _zipf_ids(rng, n, 333, 1.3), NULL_RATES['agent']),
+        'company': _with_nulls(rng, _zipf_ids(rng, n, 352, 0.9), NULL_RATES['company']),
+        'days_in_waiting_list': waiting,
+        'customer_type': customer,
+        'adr': adr,
+        'required_car_parking_spaces': parking,
+        'total_of_special_requests': requests,
+        'reservation_status': status,
+        'reservation_status_date': pd.DatetimeIndex(status_date).strftime('%Y-%m-%d'),
+    })
+    return df[COLUMNS]
+
+
+def iter_bookings(n_rows: int, seed: int = 0, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Yield `n_rows` synthetic bookings in chunks of at most `chunk_rows`, each from its own seeded stream."""
+    chunk_seeds = np.random.SeedSequence(seed).spawn(-(-n_rows // chunk_rows))
+    start = 0
+    for chunk_seed in chunk_seeds:
+        size = min(chunk_rows, n_rows - start)
+        chunk = generate_chunk(size, np.random.default_rng(chunk_seed))
+        chunk.index = pd.RangeIndex(start, start + size)
+        start += size
+        yield chunk
+
+
+def generate_bookings(n_rows: int, seed: int = 0, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> pd.DataFrame:
+    """`n_rows` synthetic bookings as one DataFrame (same rows as `write_bookings_csv` with the same seed)."""
+    try:
+        return pd.concat(iter_bookings(n_rows, seed, chunk_rows), ignore_index=True)
+    except Exception as e:
+        raise CustomException("Error generating synthetic bookings", e)
+
+
+def write_bookings_csv(path: str, n_rows: int, seed: int = 0, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                       overwrite: bool = False) -> str:
+    """
+    Write `n_rows` synthetic bookings to `path` chunk by chunk. An existing
+    file is reused unless `overwrite` is set; the file is only moved into
+    place once complete, so an interrupted run never leaves a partial dataset.
+    """
+    try:
+        if os.path.exists(path) and not overwrite:
+            logger.info(f"Reusing synthetic dataset {path}")
+            return path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w', newline='') as f:
+            for i, chunk in enumerate(iter_bookings(n_rows, seed, chunk_rows)):
+                chunk.to_csv(f, header=i == 0, index=False)
+        os.replace(tmp, path)
+        logger.info(f"Wrote {n_rows:,} synthetic bookings to {path}")
+        return path
+    except Exception as e:
+        raise CustomException(f"Error writing synthetic bookings to {path}", e)
+
+
+def dataset_path(data_dir: str, n_rows: int, seed: int = 0) -> str:
+    return os.path.join(data_dir, f"synthetic_{n_rows}_seed{seed}.csv")
+
+
+def describe_rates(df: pd.DataFrame) -> dict:
+    """Headline rates to compare a synthetic sample with the published dataset."""
+    guests = df[['adults', 'children', 'babies']].fillna(0).to_numpy()
+    return {
+        'rows': len(df),
+        'cancel_rate': round(float(df['is_canceled'].mean()), 4),
+        'city_share': round(float((df['hotel'] == 'City Hotel').mean()), 4),
+        'null_rates': {col: round(float(df[col].isna().mean()), 5) for col in NULL_RATES},
+        'zero_guest_rate': round(float((guests == 0).all(axis=1).mean()), 5),
+        'mean_lead_time': round(float(df['lead_time'].mean()), 1),
+        'mean_adr': round(float(df['adr'].mean()), 1),
+    }
+
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+"""
+Benchmark for the 10-fold cross-validation in Trainer.
+Compares the original serial cross_val_score on the globally encoded and
+Lasso-selected matrix with the leakage-free fold engine at each worker count.
+
+Usage:
+    python benchmarks/bench_cross_validation.py --data "Hotel Booking_DATA/hotel_bookings.csv"
+    python benchmarks/bench_cross_validation.py --data big.csv --workers 1 2 4 8
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import cross_val_score
+
+# Add the inner package to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Hotel Booking'))
+
+from components.cross_validation import build_base_matrix, cross_validate
+from components.data_profile import set_report_level
+from components.preprocessor import BookingPreprocessor
+from components.trainer import lasso_feature_selection
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data', required=True, help='hotel_bookings CSV')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--folds', type=int, default=10)
+    args = parser.parse_args()
+    set_report_level("off")
+
+    df = pd.read_csv(args.data)
+    preprocessor = BookingPreprocessor().fit(df)
+    processed = preprocessor.training_frame(df)
+    X, y = processed.drop('is_canceled', axis=1), processed['is_canceled']
+    selected = lasso_feature_selection(X, y)
+    start = time.perf_counter()
+    legacy = cross_val_score(LogisticRegression(max_iter=1000), X[selected], y, cv=args.folds)
+    legacy_time = time.perf_counter() - start
+    print(f"rows: {len(df):,}  cpus: {os.cpu_count()}")
+    print(f"{'run':>26} {'wall (s)':>10} {'mean acc':>10} {'vs legacy':>10}")
+    print(f"{'legacy (leaky, serial)':>26} {legacy_time:>10.2f} {legacy.mean():>10.4f} {'1.0x':>10}")
+
+    base = build_base_matrix(df, preprocessor)
+    for workers in args.workers:
+        result = cross_validate(base, n_splits=args.folds, workers=workers)
+        print(f"{f'per-fold, {workers} worker(s)':>26} {result.wall_seconds:>10.2f} "
+              f"{result.scores.mean():>10.4f} {legacy_time / result.wall_seconds:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
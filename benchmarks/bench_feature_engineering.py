@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark for basic_cleaning + feature_engineering.
+Compares the original row-wise implementation (df.apply(axis=1)) with the
+current columnar implementation and prints rows/sec at each size.
+
+Usage:
+    python benchmarks/bench_feature_engineering.py
+    python benchmarks/bench_feature_engineering.py --sizes 100000 1000000 --legacy-max-rows 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add the inner package to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Hotel Booking'))
+
+from components.preprocessing import basic_cleaning, feature_engineering
+
+
+def legacy_basic_cleaning(df: pd.DataFrame) -> pd.DataFrame:
+    """basic_cleaning as it was before vectorization (kept for comparison)."""
+    df = df.copy()
+    if 'agent' in df.columns and 'company' in df.columns:
+        df.drop(['agent', 'company'], axis=1, inplace=True)
+    if 'country' in df.columns:
+        df['country'] = df['country'].fillna(df['country'].mode().iloc[0])
+    df.fillna(0, inplace=True)
+    if set(['adults', 'children', 'babies']).issubset(df.columns):
+        filt = (df['adults'] == 0) & (df['children'] == 0) & (df['babies'] == 0)
+        df = df[~filt]
+    return df
+
+
+def legacy_feature_engineering(df: pd.DataFrame) -> pd.DataFrame:
+    """feature_engineering as it was before vectorization (kept for comparison)."""
+    df = df.copy()
+    if set(['adults', 'children', 'babies']).issubset(df.columns):
+        df['is_family'] = df.apply(lambda r: 1 if (r['adults'] > 0 and (r['children'] > 0 or r['babies'] > 0)) else 0, axis=1)
+        df['total_customer'] = df['adults'] + df['children'] + df['babies']
+        df['total_nights'] = df.get('stays_in_week_nights', 0) + df.get('stays_in_weekend_nights', 0)
+    if 'deposit_type' in df.columns:
+        mapping = {'No Deposit': 0, 'Non Refund': 1, 'Refundable': 0}
+        df['deposit_given'] = df['deposit_type'].map(mapping).fillna(0)
+    drop_cols = [c for c in ['adults', 'children', 'babies', 'deposit_type'] if c in df.columns]
+    if drop_cols:
+        df.drop(columns=drop_cols, inplace=True)
+    return df
+
+
+def make_frame(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    """Build a frame with the columns these two stages touch."""
+    rng = np.random.default_rng(seed)
+    children = rng.choice([0.0, 1.0, 2.0], n_rows, p=[0.92, 0.05, 0.03])
+    children[rng.random(n_rows) < 0.0001] = np.nan
+    country = rng.choice(np.array(['PRT', 'GBR', 'FRA', 'ESP', 'DEU'], dtype=object), n_rows)
+    country[rng.random(n_rows) < 0.004] = None
+    return pd.DataFrame({
+        'is_canceled': rng.integers(0, 2, n_rows),
+        'lead_time': rng.integers(0, 700, n_rows),
+        'stays_in_weekend_nights': rng.integers(0, 5, n_rows),
+        'stays_in_week_nights': rng.integers(0, 10, n_rows),
+        'adults': rng.choice([0, 1, 2, 3], n_rows, p=[0.0035, 0.19, 0.75, 0.0565]),
+        'children': children,
+        'babies': rng.choice([0, 1], n_rows, p=[0.992, 0.008]),
+        'country': country,
+        'deposit_type': rng.choice(np.array(['No Deposit', 'Non Refund', 'Refundable'], dtype=object), n_rows,
+                                   p=[0.87, 0.12, 0.01]),
+        'agent': np.where(rng.random(n_rows) < 0.14, np.nan, rng.integers(1, 500, n_rows)),
+        'company': np.where(rng.random(n_rows) < 0.94, np.nan, rng.integers(1, 500, n_rows)),
+        'adr': rng.gamma(4.0, 25.0, n_rows),
+    })
+
+
+def time_stages(clean_fn, fe_fn, df: pd.DataFrame):
+    start = time.perf_counter()
+    out = fe_fn(clean_fn(df))
+    return time.perf_counter() - start, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument('--legacy-max-rows', type=int, default=None,
+                        help='Skip the row-wise implementation above this size (it is slow)')
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} {'before (rows/s)':>18} {'after (rows/s)':>18} {'speedup':>10}")
+    for n_rows in args.sizes:
+        df = make_frame(n_rows)
+        new_time, new_out = time_stages(basic_cleaning, feature_engineering, df)
+        new_rate = n_rows / new_time
+
+        if args.legacy_max_rows is not None and n_rows > args.legacy_max_rows:
+            print(f"{n_rows:>12,} {'skipped':>18} {new_rate:>18,.0f} {'-':>10}")
+            continue
+
+        old_time, old_out = time_stages(legacy_basic_cleaning, legacy_feature_engineering, df)
+        pd.testing.assert_frame_equal(old_out, new_out)
+        old_rate = n_rows / old_time
+        print(f"{n_rows:>12,} {old_rate:>18,.0f} {new_rate:>18,.0f} {old_time / new_time:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+"""
+Scaling benchmark for the whole pipeline on synthetic bookings.
+For each size, generates (or reuses) a synthetic hotel_bookings CSV and times
+loading, every preprocessing stage, the Trainer.train steps and batch
+scoring. Results are written as JSON (one file per run, tagged with the git
+commit) so runs can be compared across commits with --compare.
+
+Usage:
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --sizes 10000 1000000 10000000 --skip-cv
+    python benchmarks/bench_pipeline.py --compare benchmarks/results/old.json benchmarks/results/new.json
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import sklearn
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+
+# Add the inner package to path
+sys.path.insert(0, os.path.join(REPO_ROOT, 'Hotel Booking'))
+
+from components.data_ingestion import DataIngestion
+from components.data_profile import set_report_level
+from components.preprocessor import BookingPreprocessor
+from components.scoring import Scorer
+from components.trainer import Trainer
+from entity.config_entity import DataIngestionConfig, TrainingConfig
+from utils import instrumentation
+from utils.synthetic_data import dataset_path, write_bookings_csv
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+def _git(*args) -> str:
+    try:
+        return subprocess.run(['git', *args], cwd=REPO_ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run_metadata(args) -> dict:
+    return {
+        'commit': _git('rev-parse', '--short', 'HEAD'),
+        'dirty': bool(_git('status', '--porcelain', '--untracked-files=no')),
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'seed': args.seed,
+        'cv_folds': None if args.skip_cv else args.cv_folds,
+        'cv_workers': args.cv_workers,
+    }
+
+
+def bench_size(n_rows: int, args) -> dict:
+    """Time every stage on `n_rows` synthetic bookings; returns {stage: timings}."""
+    start = time.perf_counter()
+    path = write_bookings_csv(dataset_path(args.data_dir, n_rows, args.seed), n_rows, args.seed)
+    generate_seconds = time.perf_counter() - start
+
+    instrumentation.reset()
+    with tempfile.TemporaryDirectory() as model_dir, contextlib.redirect_stdout(io.StringIO()):
+        config = DataIngestionConfig(data_dir=os.path.dirname(path), data_file=os.path.basename(path))
+        df = DataIngestion(config).load_data()
+
+        with instrumentation.measure("BookingPreprocessor.fit", rows_in=len(df)):
+            preprocessor = BookingPreprocessor().fit(df, report=True)
+        with instrumentation.measure("BookingPreprocessor.training_frame", rows_in=len(df)):
+            processed = preprocessor.training_frame(df)
+        X, y = processed.drop('is_canceled', axis=1), processed['is_canceled']
+
+        trainer = Trainer(TrainingConfig(model_dir=model_dir, cv_folds=args.cv_folds, cv_workers=args.cv_workers))
+        selected = trainer.select_features(X, y)
+        fitted = trainer.fit(X, y, selected)
+        if not args.skip_cv:
+            trainer.cross_validate(X, y, selected, preprocessor=preprocessor, df_raw=df)
+        trainer.save(fitted["model"], preprocessor, selected)
+
+        scorer = Scorer(preprocessor, fitted["model"].coef_, fitted["model"].intercept_[0])
+        with instrumentation.measure("Scorer.predict_proba", rows_in=len(df)) as record:
+            record["rows_out"] = len(scorer.predict_proba(df))
+
+    stages = {'generate': {'calls': 1, 'wall_seconds': round(generate_seconds, 6), 'rows_out': n_rows}}
+    for record in instrumentation.get_records():
+        stage = stages.setdefault(record['name'], {'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0,
+                                                   'peak_memory_delta_mb': 0.0})
+        stage['calls'] += 1
+        stage['wall_seconds'] = round(stage['wall_seconds'] + record['wall_seconds'], 6)
+        stage['cpu_seconds'] = round(stage['cpu_seconds'] + record['cpu_seconds'], 6)
+        stage['peak_memory_delta_mb'] = max(stage['peak_memory_delta_mb'], record['peak_memory_delta_mb'])
+        stage['rows_in'], stage['rows_out'] = record['rows_in'], record['rows_out']
+    for stage in stages.values():
+        rows = stage.get('rows_in') or stage.get('rows_out')
+        if rows and stage['wall_seconds'] > 0:
+            stage['rows_per_second'] = round(rows * stage['calls'] / stage['wall_seconds'])
+    return {'rows': n_rows, 'stages': stages}
+
+
+def print_results(results: list) -> None:
+    names = list(dict.fromkeys(name for r in results for name in r['stages']))
+    print(f"{'stage':<38}" + "".join(f"{r['rows']:>14,}" for r in results))
+    for name in names:
+        cells = [r['stages'].get(name, {}).get('wall_seconds') for r in results]
+        print(f"{name:<38}" + "".join(f"{c:>13.3f}s" if c is not None else f"{'-':>14}" for c in cells))
+
+
+def compare(base_path: str, new_path: str) -> None:
+    """Per-stage wall time of `new_path` relative to `base_path`, for the sizes both runs cover."""
+    with open(base_path) as f:
+        base = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    print(f"base: {base['meta']['commit']} ({base['meta']['timestamp']})  "
+          f"new: {new['meta']['commit']} ({new['meta']['timestamp']})")
+    base_by_rows = {r['rows']: r['stages'] for r in base['results']}
+    print(f"{'rows':>12} {'stage':<38} {'base (s)':>10} {'new (s)':>10} {'new/base':>9}")
+    for result in new['results']:
+        old = base_by_rows.get(result['rows'])
+        if old is None:
+            continue
+        for name, stage in result['stages'].items():
+            if name not in old:
+                continue
+            before, after = old[name]['wall_seconds'], stage['wall_seconds']
+            ratio = f"{after / before:.2f}x" if before > 0 else "-"
+            print(f"{result['rows']:>12,} {name:<38} {before:>10.3f} {after:>10.3f} {ratio:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='row counts to benchmark (10k to 50M)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', default=os.path.join(BENCH_DIR, 'data'),
+                        help='where generated datasets are kept and reused')
+    parser.add_argument('--output-dir', default=os.path.join(BENCH_DIR, 'results'))
+    parser.add_argument('--cv-folds', type=int, default=10)
+    parser.add_argument('--cv-workers', type=int, default=1)
+    parser.add_argument('--skip-cv', action='store_true', help='leave out cross-validation (slowest stage)')
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'NEW'), help='compare two result files and exit')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    set_report_level("off")
+    meta = run_metadata(args)
+    results = []
+    for n_rows in args.sizes:
+        start = time.perf_counter()
+        results.append(bench_size(n_rows, args))
+        print(f"{n_rows:,} rows benchmarked in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+    print_results(results)
+    os.makedirs(args.output_dir, exist_ok=True)
+    stamp = meta['timestamp'].replace(':', '').replace('-', '')
+    out_path = os.path.join(args.output_dir, f"{stamp}_{meta['commit'] or 'nogit'}.json")
+    with open(out_path, 'w') as f:
+        json.dump({'meta': meta, 'results': results}, f, indent=2)
+    print(f"\nResults saved to {out_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""
+Benchmark for the plot reductions (components.plot_reduction).
+On synthetic bookings of growing size, times building the EDA and
+preprocessed-data plot jobs (histograms, box statistics and densities of
+stratified samples, missing matrix, correlations) and rendering them. Both
+should stay roughly flat as the number of rows grows; the rows column of
+the table shows how much larger each dataset is.
+
+Usage:
+    python benchmarks/bench_plot_reduction.py
+    python benchmarks/bench_plot_reduction.py --rows 20000 1000000 --dpi 300
+    python benchmarks/bench_plot_reduction.py --data "Hotel Booking_DATA/hotel_bookings.csv"
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import pandas as pd
+
+# Add the inner package to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Hotel Booking'))
+
+from components import output_reports, visualizations
+from components.data_ingestion import DataIngestion
+from components.data_profile import set_report_level
+from components.preprocessing import enable_copy_on_write, preprocess_pipeline
+from entity.config_entity import DataIngestionConfig
+from utils.synthetic_data import dataset_path, write_bookings_csv
+
+
+def bench_plots(path: str) -> dict:
+    """Seconds to build and to render the plot jobs of the bookings CSV at `path`."""
+    df = DataIngestion(DataIngestionConfig(data_dir=os.path.dirname(path),
+                                           data_file=os.path.basename(path))).read_typed(path)
+    df_processed = preprocess_pipeline(df, generate_plots=False, low_memory=True)
+
+    start = time.perf_counter()
+    eda_jobs = visualizations.build_eda_jobs(df, pd.DataFrame(), pd.DataFrame())
+    eda_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    processed_jobs = visualizations.build_processed_jobs(df_processed)
+    processed_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    timings = visualizations.render_plot_jobs(eda_jobs + processed_jobs)
+    render_seconds = time.perf_counter() - start
+    return {"rows": len(df), "plots": len(timings), "eda_s": eda_seconds, "processed_s": processed_seconds,
+            "render_s": render_seconds}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[20_000, 200_000, 1_000_000],
+                        help='Synthetic bookings to generate (or reuse), one run per size')
+    parser.add_argument('--data', help='Use this bookings CSV instead of synthetic data')
+    parser.add_argument('--data-dir', default=os.path.join('benchmarks', 'data'),
+                        help='Where synthetic datasets are written and reused')
+    parser.add_argument('--dpi', type=int, default=100, help='Rendering DPI')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    paths = [args.data] if args.data else [
+        write_bookings_csv(dataset_path(args.data_dir, rows, args.seed), rows, args.seed) for rows in args.rows]
+    set_report_level("off")
+    enable_copy_on_write()
+    visualizations.PLOTS_DIR = output_reports.PLOTS_DIR = tempfile.mkdtemp(prefix="bench_plots_")
+    visualizations.configure_rendering(dpi=args.dpi)
+
+    print(f"{'rows':>11} {'plots':>6} {'eda jobs s':>11} {'processed jobs s':>17} {'render s':>9} {'total s':>8}")
+    for path in paths:
+        r = bench_plots(path)
+        total = r['eda_s'] + r['processed_s'] + r['render_s']
+        print(f"{r['rows']:>11,} {r['plots']:>6} {r['eda_s']:>11.2f} {r['processed_s']:>17.2f} "
+              f"{r['render_s']:>9.2f} {total:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
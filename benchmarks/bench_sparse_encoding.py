@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""
+Benchmark for the sparse categorical encodings (components.sparse_encoding).
+On synthetic bookings, compares the dense mean-encoded matrix of
+BookingPreprocessor with the one-hot and hashed CSR matrices of SparseEncoder
+(which also encode country, agent and company per value): matrix memory (and
+what a dense matrix of the same width would take), encoding time, Lasso
+selection time, logistic fit time on a 75% split and held-out accuracy.
+
+Usage:
+    python benchmarks/bench_sparse_encoding.py
+    python benchmarks/bench_sparse_encoding.py --rows 1000000 --hash-width 1024 4096
+    python benchmarks/bench_sparse_encoding.py --data "Hotel Booking_DATA/hotel_bookings.csv"
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+# Add the inner package to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Hotel Booking'))
+
+from components.data_ingestion import DataIngestion
+from components.preprocessor import BookingPreprocessor
+from components.sparse_encoding import SparseEncoder, matrix_nbytes
+from components.trainer import lasso_feature_selection, make_classifier, select_columns
+from entity.config_entity import DataIngestionConfig
+from utils.synthetic_data import dataset_path, write_bookings_csv
+
+
+def bench_encoding(name: str, encode, df, y, alpha: float, random_state: int) -> dict:
+    """Encode `df` with `encode() -> (matrix, columns or None)`, then select features and fit the model."""
+    start = time.perf_counter()
+    X, columns = encode()
+    encode_seconds = time.perf_counter() - start
+    n_columns = X.shape[1]
+
+    start = time.perf_counter()
+    selected = lasso_feature_selection(X, y, alpha=alpha, columns=columns) or list(
+        X.columns if columns is None else columns)
+    lasso_seconds = time.perf_counter() - start
+
+    X_sel = select_columns(X, selected, columns)
+    X_train, X_test, y_train, y_test = train_test_split(X_sel, y, test_size=0.25, random_state=random_state)
+    model = make_classifier()
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+    accuracy = float((model.predict(X_test) == y_test).mean())
+    return {
+        "encoding": name, "columns": n_columns, "selected": len(selected),
+        "mb": matrix_nbytes(X) / 2 ** 20, "dense_mb": len(df) * n_columns * 8 / 2 ** 20,
+        "encode_s": encode_seconds, "lasso_s": lasso_seconds, "fit_s": fit_seconds, "accuracy": accuracy,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Synthetic bookings to generate (or reuse)')
+    parser.add_argument('--data', help='Use this bookings CSV instead of synthetic data')
+    parser.add_argument('--data-dir', default=os.path.join('benchmarks', 'data'),
+                        help='Where synthetic datasets are written and reused')
+    parser.add_argument('--hash-width', type=int, nargs='+', default=[1024],
+                        help='Hashed widths (columns) to compare')
+    parser.add_argument('--min-count', type=int, default=1, help='One-hot: minimum training count per category')
+    parser.add_argument('--alpha', type=float, default=0.005, help='Lasso alpha')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    path = args.data or write_bookings_csv(dataset_path(args.data_dir, args.rows, args.seed), args.rows, args.seed)
+    df = DataIngestion(DataIngestionConfig(data_dir=os.path.dirname(path),
+                                           data_file=os.path.basename(path))).read_typed(path)
+    y = df['is_canceled'].to_numpy(dtype=np.float64)
+
+    start = time.perf_counter()
+    preprocessor = BookingPreprocessor().fit(df)
+    preprocessor_seconds = time.perf_counter() - start
+    print(f"rows: {len(df):,}  cpus: {os.cpu_count()}  BookingPreprocessor.fit: {preprocessor_seconds:.2f}s "
+          f"(shared by every encoding, not included below)")
+
+    runs = [("dense mean", lambda: (preprocessor.transform(df), None))]
+    onehot = SparseEncoder("onehot", min_count=args.min_count)
+    runs.append(("sparse one-hot", lambda: (onehot.fit_transform(df, preprocessor), onehot.feature_names)))
+    for width in args.hash_width:
+        hashed = SparseEncoder("hash", n_features=width)
+        runs.append((f"sparse hash {width}",
+                     lambda hashed=hashed: (hashed.fit_transform(df, preprocessor), hashed.feature_names)))
+
+    print(f"{'encoding':<18} {'columns':>8} {'selected':>8} {'matrix MB':>10} {'as dense MB':>12} "
+          f"{'encode s':>9} {'lasso s':>8} {'fit s':>7} {'accuracy':>9}")
+    for name, encode in runs:
+        r = bench_encoding(name, encode, df, y, args.alpha, args.seed)
+        print(f"{r['encoding']:<18} {r['columns']:>8,} {r['selected']:>8,} {r['mb']:>10.1f} {r['dense_mb']:>12.1f} "
+              f"{r['encode_s']:>9.2f} {r['lasso_s']:>8.2f} {r['fit_s']:>7.2f} {r['accuracy']:>9.4f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""
+Check the startup import cost of each entry point against a budget.
+
+Every entry point is started in a fresh interpreter under `python -X importtime`
+(scripts with --help, so they stop right after their top-level imports), and
+two things are checked:
+- the import time, best of --repeat runs, is within the entry point's budget;
+- none of the libraries it must not load at startup were imported (e.g.
+  matplotlib/sklearn before a plotting or training stage runs, pandas in the
+  numpy-only scorer).
+Exits with status 1 if any check fails. tests/test_import_time.py runs the
+same checks under pytest (budgets scaled by IMPORT_TIME_SCALE); this script
+prints them as a table.
+
+Usage:
+    python benchmarks/check_import_time.py
+    python benchmarks/check_import_time.py --repeat 5 --scale 1.5   # slower machine
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE_DIR = os.path.join(REPO_ROOT, 'Hotel Booking')
+
+PLOTTING = ("matplotlib", "seaborn")
+TRAINING = ("sklearn", "scipy")
+FRAMES = ("pandas", "joblib")
+
+# (label, command after `python -X importtime`, budget in seconds, libraries that must not be imported)
+ENTRY_POINTS = [
+    ("main.py --help", ["main.py", "--help"], 0.15, PLOTTING + TRAINING + FRAMES),
+    ("import pipeline.run_pipeline", ["-c", "import pipeline.run_pipeline"], 0.9, PLOTTING + TRAINING),
+    ("score_native.py --help", ["score_native.py", "--help"], 0.3, PLOTTING + TRAINING + FRAMES),
+    ("score_batch.py --help", ["score_batch.py", "--help"], 0.9, PLOTTING + TRAINING),
+    ("serve.py --help", ["serve.py", "--help"], 0.9, PLOTTING + TRAINING),
+    ("verify_model.py --help", ["verify_model.py", "--help"], 0.3, PLOTTING + TRAINING + FRAMES),
+    ("update_model.py --help", ["update_model.py", "--help"], 1.0, PLOTTING + TRAINING),
+]
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure(command: list) -> tuple:
+    """(total import seconds, imported top-level packages) of one fresh interpreter."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [PACKAGE_DIR, os.environ.get('PYTHONPATH')])))
+    proc = subprocess.run([sys.executable, "-X", "importtime", *command], cwd=REPO_ROOT, env=env,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(command)} exited with {proc.returncode}:\n{proc.stderr[-2000:]}")
+    total_us, packages = 0, set()
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, module = int(match.group(2)), match.group(3), match.group(4)
+        packages.add(module.split(".")[0])
+        if len(indent) == 1:  # top-level import; its cumulative time includes everything below it
+            total_us += cumulative
+    return total_us / 1e6, packages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per entry point; the fastest counts')
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiply every budget (for slower machines)')
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'entry point':<32} {'import s':>9} {'budget s':>9}  status")
+    for label, command, budget, forbidden in ENTRY_POINTS:
+        budget *= args.scale
+        runs = [measure(command) for _ in range(args.repeat)]
+        seconds = min(total for total, _ in runs)
+        loaded = sorted(set(forbidden) & set.union(*(packages for _, packages in runs)))
+        problems = []
+        if seconds > budget:
+            problems.append("over budget")
+        if loaded:
+            problems.append("imports " + ", ".join(loaded))
+        print(f"{label:<32} {seconds:>9.3f} {budget:>9.3f}  {'; '.join(problems) or 'ok'}")
+        failures.extend(f"{label}: {problem}" for problem in problems)
+
+    if failures:
+        print("\nFAILED:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+    print("\nAll entry points within their import budgets")
+
+
+if __name__ == '__main__':
+    main()
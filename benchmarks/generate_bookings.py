@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+"""
+Write a synthetic hotel_bookings.csv of any size (see utils/synthetic_data.py).
+
+Usage:
+    python benchmarks/generate_bookings.py --rows 119390 --output "Hotel Booking_DATA/hotel_bookings.csv"
+    python benchmarks/generate_bookings.py --rows 50000000 --output big.csv --seed 1
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add the inner package to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Hotel Booking'))
+
+from utils.synthetic_data import DEFAULT_CHUNK_ROWS, describe_rates, iter_bookings, write_bookings_csv
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=119_390)
+    parser.add_argument('--output', required=True)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    write_bookings_csv(args.output, args.rows, args.seed, args.chunk_rows, overwrite=True)
+    print(f"{args.rows:,} rows written to {args.output} in {time.perf_counter() - start:.1f}s")
+    first_chunk = next(iter_bookings(args.rows, args.seed, args.chunk_rows))
+    print(f"rates in the first chunk: {describe_rates(first_chunk)}")
+
+
+if __name__ == '__main__':
+    main()
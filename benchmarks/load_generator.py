@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""
+Load generator for the scoring service (serve.py) on localhost.
+Sends single-booking POST /score requests from concurrent keep-alive
+connections and reports client-side latency and throughput, followed by
+the service's own /metrics.
+
+Usage:
+    python benchmarks/load_generator.py --bookings Hotel\ Booking_DATA/hotel_bookings.csv --requests 5000 --concurrency 64
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+SAMPLE_BOOKING = {
+    "hotel": "Resort Hotel", "lead_time": 85, "arrival_date_year": 2016, "arrival_date_month": "July",
+    "arrival_date_week_number": 27, "arrival_date_day_of_month": 1, "stays_in_weekend_nights": 2,
+    "stays_in_week_nights": 3, "adults": 2, "children": 0, "babies": 0, "meal": "BB", "country": "PRT",
+    "market_segment": "Online TA", "distribution_channel": "TA/TO", "is_repeated_guest": 0,
+    "previous_cancellations": 0, "previous_bookings_not_canceled": 0, "reserved_room_type": "A",
+    "assigned_room_type": "A", "booking_changes": 0, "deposit_type": "No Deposit",
+    "days_in_waiting_list": 0, "customer_type": "Transient", "adr": 98.0,
+    "required_car_parking_spaces": 0, "total_of_special_requests": 1,
+}
+
+
+async def request(reader, writer, host, method, path, body=b""):
+    head = (f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n").encode()
+    writer.write(head + body)
+    await writer.drain()
+    response_head = await reader.readuntil(b"\r\n\r\n")
+    length = 0
+    for line in response_head.decode("latin-1").split("\r\n"):
+        if line.lower().startswith("content-length:"):
+            length = int(line.split(":", 1)[1])
+    return json.loads(await reader.readexactly(length))
+
+
+async def client(host, port, bodies, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for body in bodies:
+            start = time.perf_counter()
+            await request(reader, writer, host, "POST", "/score", body)
+            latencies.append((time.perf_counter() - start) * 1000.0)
+    finally:
+        writer.close()
+
+
+async def main(args):
+    if args.bookings:
+        frame = pd.read_csv(args.bookings, nrows=args.requests).drop(columns=['is_canceled'], errors='ignore')
+        records = json.loads(frame.to_json(orient='records'))
+    else:
+        records = [SAMPLE_BOOKING]
+    bodies = [json.dumps(records[i % len(records)]).encode() for i in range(args.requests)]
+
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(args.host, args.port, bodies[i::args.concurrency], latencies)
+                           for i in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+
+    lat = np.asarray(latencies)
+    print(f"requests: {len(lat)}  concurrency: {args.concurrency}  elapsed: {elapsed:.2f}s")
+    print(f"throughput: {len(lat) / elapsed:,.0f} req/s")
+    print(f"client latency ms  p50: {np.percentile(lat, 50):.2f}  p99: {np.percentile(lat, 99):.2f}  max: {lat.max():.2f}")
+
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    metrics = await request(reader, writer, args.host, "GET", "/metrics")
+    writer.close()
+    print("service metrics:", json.dumps(metrics, indent=2))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--bookings', default=None, help='CSV to draw request payloads from')
+    asyncio.run(main(parser.parse_args()))
@@ -1,5 +1,6 @@
 #!/usr/bin/env python
 """Main entry point to run the hotel booking prediction pipeline."""
+import argparse
 import sys
 import os
 
@@ -8,8 +9,81 @@ inner_pkg = os.path.join(os.getcwd(), 'Hotel Booking')
 if inner_pkg not in sys.path:
     sys.path.insert(0, inner_pkg)
 
-# Now import from the inner package
-from pipeline.run_pipeline import run
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the hotel booking prediction pipeline.")
+    parser.add_argument('--low-memory', action='store_true',
+                        help='Run preprocessing without per-stage copies (copy-on-write)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Bypass the parsed-dataset cache and always read the CSV')
+    parser.add_argument('--no-stage-cache', action='store_true',
+                        help='Recompute every pipeline stage instead of loading unchanged ones from the stage cache')
+    parser.add_argument('--clear-cache', action='store_true',
+                        help='Delete the parsed-dataset and stage caches and exit')
+    parser.add_argument('--report-level', choices=['off', 'summary', 'full'], default='full',
+                        help='Detail of the data reports printed and saved for each stage')
+    parser.add_argument('--plot-workers', type=int, default=1,
+                        help='Processes used to render plots (1 renders them in-process)')
+    parser.add_argument('--plot-dpi', type=int, default=300, help='Resolution of saved plots')
+    parser.add_argument('--plot-format', choices=['png', 'svg', 'webp'], default='png',
+                        help='File format of saved plots')
+    parser.add_argument('--cv-workers', type=int, default=1,
+                        help='Processes used to run the cross-validation folds')
+    parser.add_argument('--stage-workers', type=int, default=4,
+                        help='Threads used to run independent pipeline stages concurrently')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue a failed run from its checkpoint instead of starting over')
+    parser.add_argument('--profile', action='store_true',
+                        help='Run stages serially under cProfile and write .prof, pstats and '
+                             'flame-graph (folded stacks) files to artifacts/profile')
+    parser.add_argument('--out-of-core', action='store_true',
+                        help='Stream the data in chunks instead of loading it (for files larger than memory); '
+                             'trains an SGD logistic model and skips the EDA plots and cross-validation')
+    parser.add_argument('--chunk-rows', type=int, default=200_000,
+                        help='Rows per chunk in --out-of-core mode')
+    parser.add_argument('--search', action='store_true',
+                        help='Tune the Lasso alpha, C, penalty and class weights by successive halving, then '
+                             'train and register the best configuration')
+    parser.add_argument('--search-workers', type=int, default=1,
+                        help='Processes used to score search candidates in --search mode')
+    parser.add_argument('--search-folds', type=int, default=5,
+                        help='Cross-validation folds every candidate is scored on in --search mode')
+    parser.add_argument('--quiet', action='store_true',
+                        help='Print only warnings and errors; reports are still stored as records '
+                             '(render them with render_reports.py)')
+    parser.add_argument('--records-format', choices=['jsonl', 'parquet'], default='jsonl',
+                        help='Format of the run\'s report and log records in artifacts/reports')
+    return parser.parse_args()
+
 
 if __name__ == '__main__':
-    run()
+    args = parse_args()
+    if args.clear_cache:
+        from constants import paths
+        from utils.data_cache import DatasetCache
+        from utils.stage_cache import StageCache
+        DatasetCache(paths.DATA_CACHE_DIR).clear()
+        StageCache(paths.STAGE_CACHE_DIR).clear()
+        sys.exit(0)
+    options = dict(low_memory=args.low_memory, use_cache=not args.no_cache, report_level=args.report_level,
+                   plot_workers=args.plot_workers, plot_dpi=args.plot_dpi, plot_format=args.plot_format,
+                   cv_workers=args.cv_workers, use_stage_cache=not args.no_stage_cache,
+                   stage_workers=args.stage_workers, resume=args.resume)
+    # imported after argument parsing so --help and --clear-cache don't load pandas
+    from constants import paths
+    from pipeline.run_pipeline import run, run_out_of_core, run_search
+    from utils import report_sink
+    with report_sink.session(paths.REPORTS_DIR, fmt=args.records_format, quiet=args.quiet):
+        if args.search:
+            run_search(workers=args.search_workers, n_splits=args.search_folds, use_cache=not args.no_cache,
+                       report_level=args.report_level, plot_dpi=args.plot_dpi, plot_format=args.plot_format)
+        elif args.out_of_core:
+            run_out_of_core(chunk_rows=args.chunk_rows, report_level=args.report_level,
+                            plot_dpi=args.plot_dpi, plot_format=args.plot_format)
+        elif args.profile:
+            from utils.instrumentation import profiled
+            # cProfile only sees the thread it runs in, so stages run serially here
+            with profiled(paths.PROFILE_DIR):
+                run(**dict(options, stage_workers=1))
+        else:
+            run(**options)
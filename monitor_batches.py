@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""
+Batch Monitoring Script
+Checks incoming booking batches for drift against the training data of a
+registered model. Each batch is streamed in chunks into constant-size
+sketches (quantile digests, count-min/heavy-hitter summaries, distinct
+counts) and compared with the reference sketch stored with the model version:
+PSI and Kolmogorov-Smirnov distance per numeric column, PSI over the frequent
+categories per categorical column.
+
+Example:
+    python monitor_batches.py exports/2024-06-01.csv
+    python monitor_batches.py exports/ --model-version v0003 --fail-on-alert
+    python monitor_batches.py exports/ --save-sketches artifacts/sketches
+"""
+import argparse
+import sys
+import os
+
+# Add the inner package to path
+sys.path.insert(0, os.path.join(os.getcwd(), 'Hotel Booking'))
+
+from constants import paths
+from components.data_ingestion import DataIngestion
+from components.monitoring import DataSketch, drift_scores
+from components.output_reports import print_drift_report
+from entity.config_entity import DataIngestionConfig
+from utils.helpers import list_inputs
+from utils.model_registry import ModelRegistry
+from logger.log_config import get_logger
+
+logger = get_logger("monitor_batches")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Check booking batches for drift against the training data.")
+    parser.add_argument('input', help='CSV file or directory of CSV files (one batch per file)')
+    parser.add_argument('--registry', default=paths.REGISTRY_DIR, help='Model registry')
+    parser.add_argument('--model-version', help='Compare with this registered version instead of the current one')
+    parser.add_argument('--reference', help='Reference sketch JSON to use instead of the registry\'s')
+    parser.add_argument('--chunk-rows', type=int, default=200_000, help='Rows per chunk when reading a batch')
+    parser.add_argument('--save-sketches', help='Also save each batch\'s sketch (JSON) in this directory, '
+                                                'so batches can later be merged without rereading them')
+    parser.add_argument('--fail-on-alert', action='store_true',
+                        help='Exit with status 1 if any column of any batch is in alert')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    if args.reference:
+        reference = DataSketch.load(args.reference)
+    else:
+        reference = ModelRegistry(args.registry).reference_sketch(args.model_version)
+        if reference is None:
+            sys.exit("The model version has no reference sketch; retrain it, or pass --reference")
+    alerts = 0
+    for path in list_inputs(args.input):
+        ingestion = DataIngestion(DataIngestionConfig(data_dir=os.path.dirname(os.path.abspath(path)),
+                                                      data_file=os.path.basename(path)))
+        batch = DataSketch.from_chunks(ingestion.iter_chunks(args.chunk_rows))
+        name = os.path.splitext(os.path.basename(path))[0]
+        scores = drift_scores(reference, batch)
+        print_drift_report(name, batch.rows, scores, f"95_data_drift_{name}.txt")
+        flagged = sorted(col for col, s in scores.items() if s["status"] == "alert")
+        alerts += len(flagged)
+        if flagged:
+            logger.warning(f"{name}: drift alert on {', '.join(flagged)}")
+        if args.save_sketches:
+            os.makedirs(args.save_sketches, exist_ok=True)
+            batch.save(os.path.join(args.save_sketches, f"{name}.json"))
+    if args.fail_on_alert and alerts:
+        sys.exit(1)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""
+Occupancy Query Script
+Answers nightly occupancy questions from the occupancy index the pipeline
+saves (artifacts/occupancy.npz): in-house guests or occupied rooms per night
+for a hotel, room types and date window, with or without the nights of
+cancelled bookings, or the booked/cancelled breakdown and demand index.
+
+Example:
+    python query_occupancy.py --hotel "City Hotel" --start 2016-07-01 --end 2016-07-31
+    python query_occupancy.py --hotel "Resort Hotel" --room-type A --room-type D --include-cancelled
+    python query_occupancy.py --breakdown --measure rooms --output artifacts/occupancy_2017.csv --start 2017-01-01
+    python query_occupancy.py --data exports/bookings.csv --save artifacts/occupancy.npz
+"""
+import argparse
+import sys
+import os
+import time
+
+# Add the inner package to path
+sys.path.insert(0, os.path.join(os.getcwd(), 'Hotel Booking'))
+
+from constants import paths
+from components.data_ingestion import DataIngestion
+from components.occupancy import MEASURES, OccupancyIndex
+from entity.config_entity import DataIngestionConfig
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Query nightly occupancy per hotel and room type.")
+    parser.add_argument('--index', default=paths.OCCUPANCY_FILE, help='Occupancy index saved by the pipeline')
+    parser.add_argument('--data', help='Build the index from this bookings CSV instead of loading --index')
+    parser.add_argument('--room-column', default='assigned_room_type',
+                        help='Room type column stays are counted under (with --data)')
+    parser.add_argument('--save', help='Save the index built from --data here')
+    parser.add_argument('--hotel', action='append', help='Only this hotel (repeatable; default: all)')
+    parser.add_argument('--room-type', action='append', help='Only this room type (repeatable; default: all)')
+    parser.add_argument('--start', help='First night, YYYY-MM-DD (default: first indexed night)')
+    parser.add_argument('--end', help='Last night, inclusive (default: last indexed night)')
+    parser.add_argument('--measure', choices=MEASURES, default='guests', help='Count guests or occupied rooms')
+    parser.add_argument('--include-cancelled', action='store_true',
+                        help='Add the nights cancelled bookings would have occupied')
+    parser.add_argument('--breakdown', action='store_true',
+                        help='Booked and cancelled per night, plus the demand index')
+    parser.add_argument('--output', help='Also write the nightly table to this CSV')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    if args.data:
+        ingestion = DataIngestion(DataIngestionConfig(data_dir=os.path.dirname(os.path.abspath(args.data)),
+                                                      data_file=os.path.basename(args.data)))
+        index = OccupancyIndex.from_frame(ingestion.read_typed(args.data), room_column=args.room_column)
+        if args.save:
+            index.save(args.save)
+    elif os.path.exists(args.index):
+        index = OccupancyIndex.load(args.index)
+    else:
+        sys.exit(f"No occupancy index at {args.index}; run the pipeline first, or pass --data")
+
+    query = dict(hotel=args.hotel, room_type=args.room_type, start=args.start, end=args.end, measure=args.measure)
+    start = time.perf_counter()
+    try:
+        if args.breakdown:
+            table = index.breakdown(**query)
+            table['demand_index'] = index.demand_index(**query)
+            total = table['booked']
+        else:
+            table = index.nightly(include_cancelled=args.include_cancelled, **query)
+            total = table
+    except ValueError as e:
+        sys.exit(str(e))
+    seconds = time.perf_counter() - start
+
+    print(table.to_string())
+    print(f"\n{len(table):,} nights, {int(total.sum()):,} {args.measure}-nights, "
+          f"peak {int(total.max()):,} on {total.idxmax().date()} (query {seconds * 1000:.2f} ms)")
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        table.to_csv(args.output)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+"""
+Report Rendering Script
+Renders the report, metrics and log records stored by a pipeline run
+(artifacts/reports/<run id>.jsonl or .parquet) back into the console text and
+report files the run would have printed. Useful after a --quiet run, or to
+look at one report of an older run.
+
+Example:
+    python render_reports.py                                  # latest run
+    python render_reports.py --list
+    python render_reports.py artifacts/reports/20240601-0930.jsonl --name cross_validation
+    python render_reports.py --write --output-dir /tmp/reports
+"""
+import argparse
+import sys
+import os
+
+# Add the inner package to path
+sys.path.insert(0, os.path.join(os.getcwd(), 'Hotel Booking'))
+
+from constants import paths
+from utils import report_sink
+import components.output_reports  # noqa: F401  (registers the report renderers)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Render the stored report records of a pipeline run.")
+    parser.add_argument('records', nargs='?', help='Records file (default: the latest in artifacts/reports)')
+    parser.add_argument('--name', action='append', help='Only records with this name (repeatable)')
+    parser.add_argument('--kind', action='append', choices=['report', 'metrics', 'stage', 'log'],
+                        help='Only records of this kind (repeatable; default: everything but stage records)')
+    parser.add_argument('--list', action='store_true', help='List the records instead of rendering them')
+    parser.add_argument('--write', action='store_true', help='Also write each report to its text file')
+    parser.add_argument('--output-dir', help='Write report files here instead of their original location')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    path = args.records or report_sink.latest_records_file(paths.REPORTS_DIR)
+    if path is None:
+        sys.exit(f"No records found in {paths.REPORTS_DIR}")
+    kinds = set(args.kind or ['report', 'metrics', 'log'])
+    for record in report_sink.read_records(path):
+        if record["kind"] not in kinds or (args.name and record["name"] not in args.name):
+            continue
+        if args.list:
+            print(f"{record['seq']:>6} {record['kind']:<8} {record['name']:<24} {record.get('title') or ''}")
+            continue
+        console, text = report_sink.render(record)
+        if record.get("console", True) or not args.write:
+            print(console)
+        if args.write and record.get("file"):
+            target = record["file"]
+            if args.output_dir:
+                target = os.path.join(args.output_dir, os.path.basename(target))
+            os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+            with open(target, 'w') as f:
+                f.write(text)
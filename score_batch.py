@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+"""
+Batch Scoring Script
+Scores a bookings CSV (or a directory of CSVs) with the trained model and
+writes cancellation probabilities to an output CSV, streaming in fixed-size chunks.
+
+Example:
+    python score_batch.py exports/2024-06-01.csv --output artifacts/scores/2024-06-01.csv --workers 4
+"""
+import argparse
+import sys
+import os
+
+# Add the inner package to path
+sys.path.insert(0, os.path.join(os.getcwd(), 'Hotel Booking'))
+
+from constants import paths
+from components.scoring import score_files
+from utils.model_registry import ModelRegistry
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Score booking files for cancellation risk.")
+    parser.add_argument('input', help='CSV file or directory of CSV files')
+    parser.add_argument('--output', default=os.path.join(paths.ARTIFACTS_DIR, 'scores', 'scores.csv'),
+                        help='Output CSV path')
+    parser.add_argument('--model-dir', default=paths.MODEL_DIR, help='Directory with the model and preprocessor')
+    parser.add_argument('--model-version', help='Use this registered model version ("current" for the '
+                                                'current one) instead of --model-dir')
+    parser.add_argument('--chunk-size', type=int, default=100_000, help='Rows per chunk')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Worker processes')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    if args.model_version:
+        args.model_dir = ModelRegistry(paths.REGISTRY_DIR).version_dir(
+            None if args.model_version == 'current' else args.model_version)
+    stats = score_files(args.input, args.output, args.model_dir,
+                        chunk_rows=args.chunk_size, workers=args.workers,
+                        model_name=paths.MODEL_FILE, preprocessor_name=paths.PREPROCESSOR_FILE)
+    print(f"Scored {stats['rows']:,} rows in {stats['seconds']:.2f}s ({stats['rows_per_sec']:,.0f} rows/sec)")
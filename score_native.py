@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+"""
+Lightweight Scoring Script
+Scores a bookings CSV (or a directory of CSVs) from a model's native export
+(coefficients.npz + preprocessing.json) using numpy and the standard library
+only: pandas and sklearn are never imported, so it starts in a fraction of
+the time score_batch.py takes. Output is laid out like score_batch.py's.
+
+Example:
+    python score_native.py exports/2024-06-01.csv --output artifacts/scores/2024-06-01.csv
+    python score_native.py exports/ --model-version v0003
+"""
+import argparse
+import sys
+import os
+
+# Add the inner package to path
+sys.path.insert(0, os.path.join(os.getcwd(), 'Hotel Booking'))
+
+from constants import paths
+from components.native_scoring import NativeScorer, score_csv_files
+from utils.helpers import list_inputs
+from utils.model_registry import ModelRegistry, has_native_export
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Score booking files without pandas or sklearn.")
+    parser.add_argument('input', help='CSV file or directory of CSV files')
+    parser.add_argument('--output', default=os.path.join(paths.ARTIFACTS_DIR, 'scores', 'scores.csv'),
+                        help='Output CSV path')
+    parser.add_argument('--model-dir', help='Directory with a native export (default: the current '
+                                            'registered version)')
+    parser.add_argument('--model-version', help='Use this registered model version instead of the current one')
+    parser.add_argument('--chunk-size', type=int, default=100_000, help='Rows per chunk')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    model_dir = args.model_dir or ModelRegistry(paths.REGISTRY_DIR).version_dir(args.model_version)
+    if not has_native_export(model_dir):
+        sys.exit(f"No native export in {model_dir}; register the model (or use score_batch.py)")
+    scorer = NativeScorer.from_model_dir(model_dir)
+    stats = score_csv_files(list_inputs(args.input), args.output, scorer, chunk_rows=args.chunk_size)
+    print(f"Scored {stats['rows']:,} rows in {stats['seconds']:.2f}s ({stats['rows_per_sec']:,.0f} rows/sec)")
@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+"""
+Scoring Service
+Starts a local HTTP service that returns cancellation probabilities for bookings.
+The model and preprocessor are loaded once at startup.
+
+Endpoints:
+    POST /score    a booking object, a list of bookings, or {"bookings": [...]}
+    GET  /metrics  latency percentiles and throughput counters
+    GET  /health
+"""
+import argparse
+import asyncio
+import sys
+import os
+
+# Add the inner package to path
+sys.path.insert(0, os.path.join(os.getcwd(), 'Hotel Booking'))
+
+from constants import paths
+from components.scoring import Scorer
+from components.scoring_service import ScoringService
+from utils.model_registry import ModelRegistry
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Serve cancellation-risk scores over HTTP.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--model-dir', default=paths.MODEL_DIR, help='Directory with the model and preprocessor')
+    parser.add_argument('--model-version', help='Use this registered model version ("current" for the '
+                                                'current one) instead of --model-dir')
+    parser.add_argument('--max-batch-size', type=int, default=64, help='Rows per model evaluation')
+    parser.add_argument('--max-wait-ms', type=float, default=5.0, help='Longest a request waits for a batch to fill')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    if args.model_version:
+        args.model_dir = ModelRegistry(paths.REGISTRY_DIR).version_dir(
+            None if args.model_version == 'current' else args.model_version)
+    scorer = Scorer.from_model_dir(args.model_dir, paths.MODEL_FILE, paths.PREPROCESSOR_FILE)
+    service = ScoringService(scorer, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
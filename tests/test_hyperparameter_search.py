@@ -0,0 +1,47 @@
+"""
+Hyperparameter search: the surviving candidates and the leaderboard must
+not depend on timings, so repeated and pooled runs agree exactly.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+import os
+import sys
+
+import pytest
+
+# Add the inner package to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Hotel Booking'))
+
+from components.cross_validation import build_base_matrix
+from components.hyperparameter_search import SearchSpace, successive_halving
+from components.preprocessor import BookingPreprocessor
+from utils.synthetic_data import generate_bookings
+
+# small grid whose candidates tie often: identical C values under l1 on few rows
+SPACE = SearchSpace(lasso_alphas=(0.005, 0.02), Cs=(0.01, 0.1, 1.0), penalties=("l2", "l1"),
+                    class_weights=(None, "balanced"))
+
+
+@pytest.fixture(scope="module")
+def base():
+    df = generate_bookings(1_500, seed=5)
+    return build_base_matrix(df, BookingPreprocessor().fit(df))
+
+
+def leaderboard(result) -> list:
+    """The leaderboard without the timings."""
+    return [{k: v for k, v in row.items() if k != "fit_seconds"} for row in result.leaderboard]
+
+
+def test_search_is_repeatable(base):
+    kwargs = dict(space=SPACE, n_splits=3, eta=3, min_rows=100)
+    first = successive_halving(base, **kwargs)
+    assert [r["rows"] for r in first.rungs][0] < [r["rows"] for r in first.rungs][-1]
+    scores = [(row["rung"], row["score"]) for row in first.leaderboard]
+    assert len(set(scores)) < len(scores), "the grid should produce ties for the test to be meaningful"
+
+    assert leaderboard(successive_halving(base, **kwargs)) == leaderboard(first)
+    pooled = successive_halving(base, workers=2, **kwargs)
+    assert leaderboard(pooled) == leaderboard(first)
+    assert pooled.best == first.best
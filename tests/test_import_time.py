@@ -0,0 +1,30 @@
+"""
+Startup import budgets: every entry point must import within its budget and
+without the heavy libraries it only needs later (see
+benchmarks/check_import_time.py for the entry points and a readable report).
+
+Run from the repository root:
+    python -m pytest tests
+    IMPORT_TIME_SCALE=1.5 python -m pytest tests   # slower machine
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from check_import_time import ENTRY_POINTS, measure
+
+# multiplies every budget; IMPORT_TIME_REPEAT runs per entry point, the fastest counts
+SCALE = float(os.environ.get("IMPORT_TIME_SCALE", "1.0"))
+REPEAT = int(os.environ.get("IMPORT_TIME_REPEAT", "3"))
+
+
+@pytest.mark.parametrize("label, command, budget, forbidden", ENTRY_POINTS, ids=[e[0] for e in ENTRY_POINTS])
+def test_import_budget(label, command, budget, forbidden):
+    runs = [measure(command) for _ in range(REPEAT)]
+    seconds = min(total for total, _ in runs)
+    loaded = sorted(set(forbidden) & set.union(*(packages for _, packages in runs)))
+    assert not loaded, f"{label} imports {', '.join(loaded)} at startup"
+    assert seconds <= budget * SCALE, f"{label} imports in {seconds:.3f}s, budget {budget * SCALE:.3f}s"
@@ -0,0 +1,43 @@
+"""
+Count-min sketch: the rows of the table must hash keys independently, or
+extra rows do not tighten the estimates (and unseen categories go unnoticed).
+
+Run from the repository root:
+    python -m pytest tests
+"""
+import itertools
+import os
+import string
+import sys
+
+import numpy as np
+
+# Add the inner package to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Hotel Booking'))
+
+from components.monitoring import CountMinSketch
+
+# every three-letter code, the shape of the country column
+CODES = ["".join(letters) for letters in itertools.product(string.ascii_uppercase, repeat=3)]
+
+
+def test_collisions_are_independent_across_rows():
+    sketch = CountMinSketch(width=1024, depth=4)
+    indices = sketch._indices(CODES)
+    order = np.argsort(indices[0], kind="stable")
+    first, rest = indices[0][order], indices[1:, order]
+    # pairs of neighbours (in row-0 bucket order) that share a row-0 bucket
+    same_bucket = first[1:] == first[:-1]
+    assert same_bucket.sum() > 1000
+    also_collide = (rest[:, 1:] == rest[:, :-1])[:, same_bucket].mean(axis=1)
+    # independent rows collide again about 1/width of the time
+    assert np.all(also_collide < 5 / sketch.width), also_collide
+
+
+def test_unseen_keys_estimate_zero():
+    sketch = CountMinSketch(width=1024, depth=4)
+    seen, unseen = CODES[::88], [code for i, code in enumerate(CODES) if i % 88]
+    sketch.add(seen, np.full(len(seen), 10))
+    assert np.all(sketch.estimate(seen) >= 10)
+    # a row-0 bucket is shared with a seen code ~18% of the time, all four rows ~0.1% of the time
+    assert np.mean(sketch.estimate(unseen) > 0) < 0.01
@@ -0,0 +1,41 @@
+"""
+Occupancy index: one mistyped arrival year or stay length must not stretch
+the dense night axis over centuries.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+import os
+import sys
+
+import numpy as np
+
+# Add the inner package to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Hotel Booking'))
+
+from components.occupancy import OccupancyIndex
+from utils.synthetic_data import generate_bookings
+
+
+def test_implausible_bookings_do_not_stretch_the_index():
+    df = generate_bookings(50, seed=0)
+    clean = OccupancyIndex.from_frame(df)
+
+    typos = df.copy()
+    typos.loc[3, 'arrival_date_year'] = 9000
+    typos.loc[7, 'stays_in_week_nights'] = 100_000
+    index = OccupancyIndex.from_frame(typos)
+
+    assert index.n_nights <= clean.n_nights
+    without = OccupancyIndex.from_frame(df.drop(index=[3, 7]))
+    for measure in ("rooms", "guests"):
+        assert np.array_equal(index.nightly(measure=measure, include_cancelled=True),
+                              without.nightly(measure=measure, include_cancelled=True, start=index.dates[0],
+                                              end=index.dates[-1]))
+
+
+def test_real_date_range_is_kept():
+    df = generate_bookings(5_000, seed=1)
+    index = OccupancyIndex.from_frame(df)
+    nights = df['stays_in_weekend_nights'] + df['stays_in_week_nights']
+    assert index.counts["rooms"].sum() == nights.sum()
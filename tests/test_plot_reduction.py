@@ -0,0 +1,67 @@
+"""
+Plot reductions: rows with a missing group key are left out of the plot, as
+seaborn leaves them out, instead of failing the reduction.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add the inner package to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Hotel Booking'))
+
+from components.plot_reduction import box_stats, grouped_histograms, grouped_mean_ci
+from components.visualizations import build_eda_jobs
+from utils.synthetic_data import generate_bookings
+
+KEYS = ['arrival_date_month', 'hotel', 'reserved_room_type']
+
+
+def bookings_with_null_keys(dtype: str) -> pd.DataFrame:
+    df = generate_bookings(3_000, seed=0)
+    for col in KEYS:
+        df[col] = df[col].astype(dtype)
+        df.loc[[5, 17], col] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("dtype", ["object", "category"])
+def test_box_stats_drops_null_keys(dtype):
+    df = bookings_with_null_keys(dtype)
+    box = box_stats(df, 'adr', 'arrival_date_month', hue='is_canceled')
+    expected = box_stats(df.dropna(subset=['arrival_date_month']), 'adr', 'arrival_date_month', hue='is_canceled')
+    assert box.groups == expected.groups and 'nan' not in box.groups
+    for got, want in zip(box.stats, expected.stats):
+        assert got['med'] == want['med'] and got['whislo'] == want['whislo'] and got['whishi'] == want['whishi']
+
+    # a null hue is dropped the same way
+    hotel = box_stats(df, 'adr', 'reserved_room_type', hue='hotel')
+    assert 'nan' not in hotel.hues and any(s is not None for s in hotel.stats)
+
+
+@pytest.mark.parametrize("dtype", ["object", "category"])
+def test_eda_jobs_build_with_null_keys(dtype):
+    df = bookings_with_null_keys(dtype)
+    jobs = build_eda_jobs(df, pd.DataFrame(), pd.DataFrame())
+    assert [description for description, _, _ in jobs] == [
+        "missing values heatmap", "room pricing plot", "ADR by month barplot", "ADR by month boxplot",
+        "lead time distribution", "lead time by cancellation", "ADR distribution before"]
+    assert not grouped_mean_ci(df, 'adr', 'arrival_date_month', 'is_canceled')['arrival_date_month'].isna().any()
+    assert set(grouped_histograms(df, 'lead_time', 'is_canceled')) == {0, 1}
+
+
+def test_failed_reduction_skips_only_its_plot(monkeypatch):
+    from components import visualizations
+
+    def broken(*args, **kwargs):
+        raise ValueError("broken reduction")
+
+    monkeypatch.setattr(visualizations, "box_stats", broken)
+    jobs = build_eda_jobs(generate_bookings(1_000, seed=0), pd.DataFrame(), pd.DataFrame())
+    descriptions = [description for description, _, _ in jobs]
+    assert "ADR by month boxplot" not in descriptions and "ADR by month barplot" in descriptions
@@ -0,0 +1,71 @@
+"""
+Train/serve parity: the fitted preprocessor's transform, which scores new
+bookings, must reproduce the frame the preprocessing stages build for
+training.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add the inner package to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Hotel Booking'))
+
+from components.data_ingestion import DataIngestion
+from components.data_profile import get_report_level, set_report_level
+from components.preprocessing import preprocess_pipeline, run_stages
+from components.preprocessor import BookingPreprocessor
+from entity.config_entity import DataIngestionConfig
+from utils.synthetic_data import generate_bookings, write_bookings_csv
+
+
+@pytest.fixture(autouse=True)
+def no_reports():
+    """preprocess_pipeline writes data reports under artifacts/ at the default level."""
+    level = get_report_level()
+    set_report_level("off")
+    yield
+    set_report_level(level)
+
+
+@pytest.fixture(scope="module", params=["typed", "raw"])
+def bookings(request, tmp_path_factory):
+    """Bookings with missing countries and zero-guest rows, as ingestion types them (categoricals) or as read raw."""
+    df = generate_bookings(5_000, seed=3)
+    if request.param == "raw":
+        df.loc[df.index[:40], 'country'] = None
+        df.loc[df.index[40:45], ['adults', 'children', 'babies']] = 0
+        return df
+    path = write_bookings_csv(str(tmp_path_factory.mktemp("data") / "bookings.csv"), 5_000, seed=3)
+    return DataIngestion(DataIngestionConfig(data_dir=os.path.dirname(path),
+                                             data_file=os.path.basename(path))).read_typed(path)
+
+
+@pytest.mark.parametrize("low_memory", [False, True])
+def test_transform_equals_training_matrix(bookings, low_memory):
+    original = bookings.copy()
+    # low_memory relies on copy-on-write, which the pipeline enables once at startup
+    with pd.option_context("mode.copy_on_write", low_memory):
+        preprocessor = BookingPreprocessor().fit(bookings, low_memory=low_memory)
+        stages = run_stages(bookings, low_memory=low_memory, report=False)
+    training = preprocessor.training_frame(bookings)
+    pd.testing.assert_frame_equal(bookings, original)
+
+    assert list(training.index) == list(stages.index)
+    assert sorted(training.columns) == sorted(stages.columns)
+    assert list(training.columns[:-1]) == preprocessor.feature_columns
+    np.testing.assert_array_equal(training[stages.columns].to_numpy(dtype=np.float64),
+                                  stages.to_numpy(dtype=np.float64))
+    # scoring the training rows goes through the same transform
+    np.testing.assert_array_equal(preprocessor.transform_array(bookings.loc[stages.index]),
+                                  stages[preprocessor.feature_columns].to_numpy(dtype=np.float64))
+
+
+def test_preprocess_pipeline_is_the_fitted_transform(bookings):
+    pd.testing.assert_frame_equal(preprocess_pipeline(bookings),
+                                  BookingPreprocessor().fit(bookings).training_frame(bookings))
@@ -0,0 +1,88 @@
+"""
+Scoring service: a malformed request must fail on its own, with 400, even
+when the micro-batcher coalesces it with valid requests.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+import asyncio
+import json
+import os
+import sys
+
+import numpy as np
+
+# Add the inner package to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Hotel Booking'))
+
+from components.preprocessor import BookingPreprocessor
+from components.scoring import Scorer
+from components.scoring_service import ScoringService
+from utils.synthetic_data import generate_bookings
+
+VALID = {
+    "hotel": "Resort Hotel", "lead_time": 85, "arrival_date_year": 2016, "arrival_date_month": "July",
+    "arrival_date_week_number": 27, "arrival_date_day_of_month": 1, "stays_in_weekend_nights": 2,
+    "stays_in_week_nights": 3, "adults": 2, "children": 0, "babies": 0, "meal": "BB", "country": "PRT",
+    "market_segment": "Online TA", "distribution_channel": "TA/TO", "is_repeated_guest": 0,
+    "previous_cancellations": 0, "previous_bookings_not_canceled": 0, "reserved_room_type": "A",
+    "assigned_room_type": "A", "booking_changes": 0, "deposit_type": "No Deposit",
+    "days_in_waiting_list": 0, "customer_type": "Transient", "adr": 98.0,
+    "required_car_parking_spaces": 0, "total_of_special_requests": 1,
+}
+# rejected by check_records before batching
+NOT_A_NUMBER = dict(VALID, lead_time="ten")
+# passes the numeric check but fails in the preprocessor, so the whole batch fails and is rescored
+UNHASHABLE = dict(VALID, country=["PRT"])
+
+
+def make_scorer() -> Scorer:
+    preprocessor = BookingPreprocessor().fit(generate_bookings(2_000, seed=0))
+    rng = np.random.default_rng(0)
+    return Scorer(preprocessor, rng.normal(scale=0.1, size=len(preprocessor.output_columns)), -0.5)
+
+
+async def post(port: int, payload) -> tuple:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode()
+    writer.write(f"POST /score HTTP/1.1\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, content = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(content)
+
+
+async def score_concurrently(payloads: list, max_wait_ms: float = 200.0) -> tuple:
+    service = ScoringService(make_scorer(), max_batch_size=64, max_wait_ms=max_wait_ms)
+    service.batcher.start()
+    server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        responses = await asyncio.gather(*(post(port, p) for p in payloads))
+        alone = await post(port, VALID)
+    finally:
+        server.close()
+        await server.wait_closed()
+        await service.batcher.stop()
+    return responses, alone, service.stats
+
+
+def test_bad_request_does_not_fail_its_batch():
+    payloads = [VALID, NOT_A_NUMBER, VALID, UNHASHABLE, [VALID, VALID]]
+    responses, alone, stats = asyncio.run(score_concurrently(payloads))
+    assert alone[0] == 200
+    expected = alone[1]["cancel_probability"][0]
+
+    statuses = [status for status, _ in responses]
+    assert statuses == [200, 400, 200, 400, 200]
+    for status, body in responses:
+        if status == 200:
+            assert all(p == expected for p in body["cancel_probability"])
+    assert "lead_time" in responses[1][1]["error"]
+    assert stats.errors == 2
+
+
+def test_numeric_strings_are_accepted():
+    responses, alone, _ = asyncio.run(score_concurrently([dict(VALID, lead_time="85", adr="98.0")], max_wait_ms=1))
+    assert responses[0] == alone
@@ -3,24 +3,68 @@
 Model Verification Script
 Loads and inspects the trained logistic regression model.
 Run this script standalone to verify model integrity.
+
+With a model registry (artifacts/registry), any version can be inspected and
+two versions compared:
+    python verify_model.py --list
+    python verify_model.py --version v0003
+    python verify_model.py --diff v0002 v0003
 """
+import argparse
 import sys
 import os
 
 # Add the inner package to path
 sys.path.insert(0, os.path.join(os.getcwd(), 'Hotel Booking'))
 
-from utils.model_inspector import inspect_model
+from constants import paths
+from utils.model_inspector import describe_diff, describe_version, inspect_model
+from utils.model_registry import ModelRegistry
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Inspect and compare trained model versions.")
+    parser.add_argument('--registry', default=paths.REGISTRY_DIR, help='Model registry directory')
+    parser.add_argument('--list', action='store_true', help='List registered versions')
+    parser.add_argument('--version', help='Inspect this version (default: the current one)')
+    parser.add_argument('--diff', nargs=2, metavar=('A', 'B'), help='Compare two versions')
+    parser.add_argument('--set-current', metavar='VERSION', help='Point "current" at VERSION (e.g. to roll back)')
+    return parser.parse_args()
+
+
+def list_versions(registry: ModelRegistry) -> None:
+    current = registry.current_version()
+    print(f"{'version':<9} {'created':<20} {'kind':<12} {'accuracy':>9} {'features':>9}  parent")
+    for version in registry.list_versions():
+        meta = registry.metadata(version)
+        accuracy = meta.get("metrics", {}).get("accuracy")
+        print(f"{version:<9} {meta['created_at']:<20} {meta.get('kind', '-'):<12} "
+              f"{'-' if accuracy is None else f'{accuracy:.4f}':>9} {len(meta['features']):>9}  "
+              f"{meta.get('parent') or '-'}{'  <- current' if version == current else ''}")
+
 
 if __name__ == '__main__':
-    model_path = os.path.join(os.getcwd(), 'artifacts', 'models', 'logistic_model.joblib')
-    
+    args = parse_args()
+    registry = ModelRegistry(args.registry)
+
     print("\n" + "="*60)
     print("MODEL VERIFICATION SCRIPT")
     print("="*60 + "\n")
-    
-    model = inspect_model(model_path)
-    
+
+    if args.set_current:
+        registry.set_current(args.set_current)
+    if args.list:
+        list_versions(registry)
+    elif args.diff:
+        print(describe_diff(registry.diff(*args.diff)))
+    elif args.version or registry.current_version():
+        version = args.version or registry.current_version()
+        print(describe_version(registry, version))
+        model = inspect_model(os.path.join(registry.version_dir(version), paths.MODEL_FILE), mmap_mode='r')
+    else:
+        model_path = os.path.join(os.getcwd(), 'artifacts', 'models', 'logistic_model.joblib')
+        model = inspect_model(model_path)
+
     print("\n" + "="*60)
     print("✓ Model loaded and verified successfully!")
     print("="*60 + "\n")